@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from config import *
+
+
+class CardRenderModel:
+    """Pre-formatted text of one item's card"""
+
+    __slots__ = ('item', 'primary_lines', 'secondary_lines')
+
+    def __init__(self, item, primary_lines, secondary_lines):
+        self.item = item
+        self.primary_lines = tuple(primary_lines)
+        self.secondary_lines = tuple(secondary_lines)
+
+    @property
+    def show_additional_info(self):
+        """Whether the card needs its "Additional Info" header"""
+        return bool(self.secondary_lines)
+
+
+class CardRenderCache:
+    """
+    Card Render Cache for Fishing Planet Application
+
+    This class keeps the formatted lines of recently shown cards, so
+    rebuilding a view after a resize, a view switch or a search binds cached
+    strings instead of formatting every field again. Models are keyed by item
+    identity: a catalog reload replaces changed items with new dicts, so each
+    model belongs to exactly one version of an item. A model also holds its
+    item, which keeps the id from being reused while the model is cached.
+    The cache is an LRU holding a few pages of the largest card grid, so
+    scrolling through a big catalog or swapping catalogs does not keep
+    every item ever shown alive.
+
+    Responsibilities:
+    - Build a card's render model once per item version
+    - Reuse render models across rebuilds, resizes, view switches and searches
+    - Drop the models of items replaced or removed by a catalog reload
+    - Evict the least recently shown models beyond a few grid pages
+    """
+
+    def __init__(self, capacity=CARD_RENDER_CACHE_MIN_SIZE):
+        self.models = OrderedDict()
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self.models)
+
+    def get(self, item, build_model):
+        """Return the item's render model, building it with build_model(item) on first use"""
+        model = self.models.get(id(item))
+        if model is not None and model.item is item:
+            self.models.move_to_end(id(item))
+            return model
+        model = self.models[id(item)] = build_model(item)
+        self.models.move_to_end(id(item))
+        self._evict()
+        return model
+
+    def reserve(self, card_slots):
+        """Grow the capacity to CARD_RENDER_CACHE_PAGES pages of a grid with the given number of card slots"""
+        self.capacity = max(self.capacity, card_slots * CARD_RENDER_CACHE_PAGES)
+
+    def _evict(self):
+        """Drop the least recently used models beyond the capacity"""
+        while len(self.models) > self.capacity:
+            self.models.popitem(last=False)
+
+    def discard(self, items):
+        """Drop the render models of the given items"""
+        for item in items:
+            model = self.models.get(id(item))
+            if model is not None and model.item is item:
+                del self.models[id(item)]
+
+    def discard_diff(self, diff):
+        """Drop the render models of the items a CatalogDiff replaced or removed"""
+        self.discard(old_item for _, old_item in diff.removed)
+        self.discard(old_item for _, old_item, _ in diff.changed)
+
+    def clear(self):
+        """Drop every render model"""
+        self.models.clear()
@@ -0,0 +1,115 @@
+import dearpygui.dearpygui as dpg
+from config import *
+from equipment_comparison import ComparisonSet
+
+
+class ComparisonTray:
+    """
+    Comparison Tray for Fishing Planet Application
+
+    This class compares pinned rods, reels and other gear side by side.
+    The "Compare" button on a card pins the item (or unpins it again); the
+    tray then shows a single table with one row per parsed numeric field and
+    one column per pinned item, every cell showing the value and its
+    difference to the best value in the set. All rows are recomputed in one
+    batch by the comparison set when an item is pinned, and the table is a
+    single DearPyGui table rather than a window per item, so comparing many
+    items stays cheap to render.
+
+    Responsibilities:
+    - Pin and unpin items from the card action button
+    - Keep one tray window with a status line and the comparison table
+    - Rebuild the table from the comparison set's precomputed rows
+    - Highlight the best value of every field
+    """
+
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        self.comparison = ComparisonSet(data_manager.locate_item, COMPARISON_MAX_ITEMS)
+
+    def toggle(self, sender=None, app_data=None, item=None):
+        """Card action callback: pin the card's item, or unpin it if it is already pinned"""
+        if item is None:
+            return
+        if item in self.comparison:
+            self.comparison.unpin(item)
+            self.refresh()
+            return
+        if not self.comparison.pin(item):
+            self.refresh(COMPARISON_FULL_MESSAGE.format(COMPARISON_MAX_ITEMS))
+            return
+        self.refresh()
+
+    def unpin(self, sender=None, app_data=None, item=None):
+        """Unpin button callback"""
+        if item is not None and self.comparison.unpin(item):
+            self.refresh()
+
+    def clear(self, *args):
+        """Unpin every item and close the tray"""
+        self.comparison.clear()
+        self.close()
+
+    def refresh(self, status=None):
+        """Show the tray with the current comparison, closing it when nothing is pinned"""
+        if not len(self.comparison):
+            self.close()
+            return
+        if not dpg.does_item_exist(UI_TAGS['comparison_window']):
+            self._create_window()
+
+        dpg.set_value(UI_TAGS['comparison_status'],
+                      status or COMPARISON_STATUS_FORMAT.format(len(self.comparison), COMPARISON_MAX_ITEMS))
+        self._build_table()
+
+    def _create_window(self):
+        """Create the tray window with its status line and clear button"""
+        with dpg.window(
+            label=COMPARISON_TITLE,
+            tag=UI_TAGS['comparison_window'],
+            width=COMPARISON_WINDOW_WIDTH,
+            height=COMPARISON_WINDOW_HEIGHT,
+            on_close=self.close
+        ):
+            with dpg.group(horizontal=True):
+                dpg.add_text("", tag=UI_TAGS['comparison_status'])
+                dpg.add_button(label=COMPARISON_CLEAR_LABEL, callback=self.clear)
+
+    def _build_table(self):
+        """Rebuild the table from the comparison's precomputed rows"""
+        # The table is recreated rather than emptied: cell highlights do not survive a table losing columns
+        if dpg.does_item_exist(UI_TAGS['comparison_table']):
+            dpg.delete_item(UI_TAGS['comparison_table'])
+        table = dpg.add_table(
+            tag=UI_TAGS['comparison_table'],
+            parent=UI_TAGS['comparison_window'],
+            header_row=True,
+            borders_innerV=True,
+            borders_outerH=True,
+            row_background=True,
+            scrollX=True,
+            freeze_columns=1
+        )
+        items = self.comparison.items
+
+        dpg.add_table_column(label=COMPARISON_FIELD_HEADER, parent=table)
+        for item in items:
+            dpg.add_table_column(label=self.data_manager.format_item_label(item), parent=table)
+
+        with dpg.table_row(parent=table):
+            dpg.add_text("")
+            for item in items:
+                dpg.add_button(label=COMPARISON_UNPIN_LABEL, callback=self.unpin, user_data=item)
+
+        for row_index, row in enumerate(self.comparison.ordered_rows(), start=1):
+            with dpg.table_row(parent=table):
+                dpg.add_text(row.label)
+                for cell in row.cells:
+                    dpg.add_text(cell)
+            for position in row.best_positions:
+                dpg.highlight_table_cell(table, row_index, position + 1, COMPARISON_BEST_COLOR)
+
+    def close(self, *args):
+        """Close the tray if it is open; pinned items are kept"""
+        if dpg.does_item_exist(UI_TAGS['comparison_window']):
+            dpg.delete_item(UI_TAGS['comparison_window'])
@@ -0,0 +1,51 @@
+import dearpygui.dearpygui as dpg
+from config import *
+
+
+class CompatibilityPanel:
+    """
+    Compatibility Panel for Fishing Planet Application
+
+    This class shows the gear that works with a selected rod, reel or line.
+    Compatibility comes from the data manager's precomputed join index, so
+    opening the panel is a lookup rather than a scan over every catalog.
+
+    Responsibilities:
+    - Open a popup window listing compatible gear for a card's item
+    - Group the compatible gear by kind (reels, lines, rods)
+    - Replace the previous panel when another card is selected
+    """
+
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+
+    def show(self, sender=None, app_data=None, item=None):
+        """Card action callback: open the panel for the card's item"""
+        if item is None:
+            return
+        self.close()
+
+        gear = self.data_manager.get_compatible_gear(item)
+        with dpg.window(
+            label=COMPATIBLE_GEAR_LABEL,
+            tag=UI_TAGS['compatibility_window'],
+            width=COMPATIBILITY_WINDOW_WIDTH,
+            height=COMPATIBILITY_WINDOW_HEIGHT,
+            on_close=self.close
+        ):
+            dpg.add_text(COMPATIBLE_GEAR_TITLE.format(self.data_manager.format_item_label(item)))
+            if not any(gear.values()):
+                dpg.add_text(NO_COMPATIBLE_GEAR_MESSAGE)
+                return
+
+            for kind, items in gear.items():
+                if not items:
+                    continue
+                labels = [self.data_manager.format_item_label(gear_item) for gear_item in items]
+                dpg.add_text(COMPATIBLE_GEAR_SECTION.format(kind.capitalize(), len(labels)))
+                dpg.add_listbox(items=labels, num_items=min(COMPATIBILITY_LIST_ROWS, len(labels)), width=-1)
+
+    def close(self, *args):
+        """Close the panel if it is open"""
+        if dpg.does_item_exist(UI_TAGS['compatibility_window']):
+            dpg.delete_item(UI_TAGS['compatibility_window'])
@@ -1,7 +1,9 @@
+import functools
 import dearpygui.dearpygui as dpg
 from config import *
-from UI.ui_components import UIComponents
 from UI.ui_card_layout import UICardLayout
+from UI.search_pipeline import SearchPipeline
+from profiling import timed
 
 class DisplayManager:
     """
@@ -14,90 +16,120 @@ class DisplayManager:
     Responsibilities:
     - Display fishing rods data by category
     - Handle search results display
+    - Keep every view sorted by the selected sort option
     - Manage view refreshing and updates
     - Coordinate with card layout system
+    - Patch displayed cards when a catalog is reloaded
     """
     
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, frame_scheduler=None):
         self.data_manager = data_manager
-        self.card_layout = UICardLayout(data_manager)
-        self.display_methods = {
-            'rods': self.display_rods_data,
-            'reels': self.display_reels_data
+        self.frame_scheduler = frame_scheduler
+        self.card_layout = UICardLayout(data_manager, frame_scheduler)
+        self.sort = SORT_OPTIONS[DEFAULT_SORT_OPTION]
+        self.view_groups = {
+            'rods': UI_TAGS['rods_group'],
+            'reels': UI_TAGS['reels_group']
         }
+        self.no_results_messages = {
+            'rods': NO_RODS_FOUND_MESSAGE,
+            'reels': NO_REELS_FOUND_MESSAGE
+        }
+        
+        # Run searches on a worker and stream results back from the render loop
+        self.search_pipeline = None
+        if ASYNC_SEARCH and frame_scheduler:
+            self.search_pipeline = SearchPipeline()
+            frame_scheduler.add_frame_task(SEARCH_PUMP_TASK_KEY, self.search_pipeline.pump)
     
-    def get_navigation_group(self):
-        """Get the navigation group UI element"""
-        return dpg.get_item_children(UI_TAGS['main_window'])[CHILDREN_INDEX][NAVIGATION_GROUP_INDEX]
+    @timed
+    def clear_view_group(self, group):
+        """Remove all displayed content from a view group"""
+        self.card_layout.clear(group)
     
-    def get_search_group(self):
-        """Get the search group UI element"""
-        return dpg.get_item_children(UI_TAGS['main_window'])[CHILDREN_INDEX][SEARCH_GROUP_INDEX]
+    def display_view(self, view_name):
+        """Display all of a view's equipment organized by category"""
+        self._display_by_category(self.data_manager.get_by_category(view_name, self.sort), self.view_groups[view_name])
     
     def display_rods_data(self):
         """Display all fishing rods data organized by category"""
-        self._display_rods_by_category(self.data_manager.get_rods_by_category())
+        self.display_view('rods')
     
     def display_reels_data(self):
         """Display all fishing reels data organized by category"""
-        self._display_reels_by_category(self.data_manager.get_reels_by_category())
+        self.display_view('reels')
     
-    def _display_rods_by_category(self, rods_by_category):
-        """Display rods grouped by their categories with headers"""
-        if not rods_by_category:
-            self.card_layout._show_no_data_message(UI_TAGS['rods_group'])
+    def _display_by_category(self, items_by_category, group):
+        """Display items grouped by their categories with headers"""
+        if not items_by_category:
+            self.card_layout._show_no_data_message(group)
             return
-        for category_name, rods in rods_by_category.items():
-            dpg.add_text(CATEGORY_HEADER_FORMAT.format(category_name), parent=UI_TAGS['rods_group'])
-            self.card_layout.display_cards(rods, UI_TAGS['rods_group'])
-            dpg.add_spacer(height=CATEGORY_SPACING, parent=UI_TAGS['rods_group'])
-    
-    def _display_reels_by_category(self, reels_by_category):
-        """Display reels grouped by their categories with headers"""
-        if not reels_by_category:
-            self.card_layout._show_no_data_message(UI_TAGS['reels_group'])
+        if VIRTUALIZED_CARD_GRID:
+            self.card_layout.display_virtual_grid(items_by_category, group)
             return
-        for category_name, reels in reels_by_category.items():
-            dpg.add_text(CATEGORY_HEADER_FORMAT.format(category_name), parent=UI_TAGS['reels_group'])
-            self.card_layout.display_cards(reels, UI_TAGS['reels_group'])
-            dpg.add_spacer(height=CATEGORY_SPACING, parent=UI_TAGS['reels_group'])
+        for category_name, items in items_by_category.items():
+            self.card_layout.display_category(category_name, items, group)
     
-    def display_search_results(self, search_term):
-        """Display search results for the given search term"""
-        filtered_rods = self.data_manager.search_rods(search_term)
-        dpg.delete_item(UI_TAGS['rods_group'], children_only=True)
-        processed_results = self.data_manager.process_search_results(filtered_rods)
-        if processed_results:
-            self._display_rods_by_category(processed_results)
+    @timed
+    def display_search_results(self, view_name, search_term):
+        """Display a view's search results, already grouped by category"""
+        group = self.view_groups[view_name]
+        results = self.data_manager.search(view_name, search_term, self.sort)
+        self.clear_view_group(group)
+        if results:
+            self._display_by_category(results, group)
         else:
-            dpg.add_text(NO_RODS_FOUND_MESSAGE, parent=UI_TAGS['rods_group'])
+            dpg.add_text(self.no_results_messages[view_name], parent=group)
     
-    def display_reel_search_results(self, search_term):
-        """Display search results for reels"""
-        filtered_reels = self.data_manager.search_reels(search_term)
-        dpg.delete_item(UI_TAGS['reels_group'], children_only=True)
-        processed_results = self.data_manager.process_reel_search_results(filtered_reels)
-        if processed_results:
-            self._display_reels_by_category(processed_results)
-        else:
-            dpg.add_text(NO_REELS_FOUND_MESSAGE, parent=UI_TAGS['reels_group'])
+    def search_view(self, view_name, search_term):
+        """Search a view, streaming results in category batches when a search pipeline is available"""
+        if self.search_pipeline is None:
+            self.display_search_results(view_name, search_term)
+            return
+        
+        group = self.view_groups[view_name]
+        shown_batches = []
+        
+        def start_results():
+            self.clear_view_group(group)
+        
+        def append_batch(category_name, items):
+            shown_batches.append(category_name)
+            self.append_category_results(group, category_name, items)
+        
+        def finish_results():
+            if not shown_batches:
+                dpg.add_text(self.no_results_messages[view_name], parent=group)
+        
+        self.search_pipeline.submit(
+            search_term, functools.partial(self.data_manager.iter_search_batches, view_name, sort=self.sort),
+            start_results, append_batch, finish_results)
     
-    def refresh_current_view(self):
-        """Refresh the current view by clearing and redisplaying data"""
-        dpg.delete_item(UI_TAGS['rods_group'], children_only=True)
-        self.display_rods_data()
+    def cancel_search(self):
+        """Cancel a streaming search that has not finished yet"""
+        if self.search_pipeline is not None:
+            self.search_pipeline.cancel()
     
-    def refresh_current_view_responsive(self):
-        """Refresh the current view with responsive layout recalculation"""
-        # Determine which view is currently active
-        rods_visible = dpg.is_item_visible(UI_TAGS['rods_group'])
-        reels_visible = dpg.is_item_visible(UI_TAGS['reels_group'])
-        
-        if rods_visible:
-            # Clear and redisplay rods with responsive layout
-            dpg.delete_item(UI_TAGS['rods_group'], children_only=True)
-            self.display_rods_data()
-        elif reels_visible:
-            # Clear and redisplay reels with responsive layout
-            dpg.delete_item(UI_TAGS['reels_group'], children_only=True)
-            self.display_reels_data() 
\ No newline at end of file
+    def append_category_results(self, group, category_name, items):
+        """Append one category of results below those already displayed"""
+        if VIRTUALIZED_CARD_GRID:
+            self.card_layout.append_virtual_category(category_name, items, group)
+            return
+        self.card_layout.display_category(category_name, items, group)
+    
+    @timed
+    def patch_view(self, view_name, diff):
+        """Patch a view's displayed cards for a reloaded catalog, rebuilding it only if patching is not possible"""
+        group = self.view_groups[view_name]
+        data_by_category = self.data_manager.get_by_category(view_name, self.sort)
+        # A changed value can move a card when the view is sorted
+        reorder = self.sort is not None and bool(diff.changed)
+        if not self.card_layout.patch_cards(group, diff, data_by_category, reorder):
+            self.clear_view_group(group)
+            self.display_view(view_name)
+    
+    def relayout_current_view(self):
+        """Re-flow the visible view's existing cards for the current viewport width"""
+        for group in self.view_groups.values():
+            if dpg.is_item_shown(group):
+                self.card_layout.relayout(group)
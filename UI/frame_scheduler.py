@@ -0,0 +1,49 @@
+import time
+
+
+class FrameScheduler:
+    """
+    Frame Scheduler for Fishing Planet Application
+
+    This class drives per-frame work from the application's render loop.
+    UI components register keyed tasks that run once per frame, or one-shot
+    callbacks that run after a delay, so work such as scroll tracking or
+    deferred layout never has to block a DearPyGui callback.
+
+    Responsibilities:
+    - Run registered per-frame tasks before each rendered frame
+    - Run delayed one-shot callbacks, replacing pending ones with the same key
+    - Drop tasks that report they are finished
+    """
+
+    def __init__(self):
+        self.frame_tasks = {}
+        self.delayed_calls = {}
+
+    def add_frame_task(self, key, callback):
+        """Run callback every frame until it returns False or is removed"""
+        self.frame_tasks[key] = callback
+
+    def remove_frame_task(self, key):
+        """Stop running the per-frame task registered under key"""
+        self.frame_tasks.pop(key, None)
+
+    def call_later(self, key, delay_seconds, callback):
+        """Run callback once after delay_seconds, replacing any pending call with the same key"""
+        self.delayed_calls[key] = (time.perf_counter() + delay_seconds, callback)
+
+    def cancel_call(self, key):
+        """Cancel a pending delayed call"""
+        self.delayed_calls.pop(key, None)
+
+    def run_frame(self):
+        """Run due delayed calls and every per-frame task"""
+        now = time.perf_counter()
+        for key, (due_time, callback) in list(self.delayed_calls.items()):
+            if due_time <= now and self.delayed_calls.get(key) == (due_time, callback):
+                del self.delayed_calls[key]
+                callback()
+
+        for key, callback in list(self.frame_tasks.items()):
+            if callback() is False and self.frame_tasks.get(key) is callback:
+                del self.frame_tasks[key]
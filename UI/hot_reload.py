@@ -0,0 +1,43 @@
+from config import *
+from UI.ui_components import UIComponents
+
+
+class HotReloader:
+    """
+    Hot Reloader for Fishing Planet Application
+
+    This class polls the catalog files the data manager has loaded and, when
+    one changes on disk, reloads it incrementally: the data manager diffs the
+    new file against the loaded catalog by stable item key and patches its
+    store and search index, and the view manager patches only the cards of
+    the affected view. Polling runs as a delayed call on the frame scheduler,
+    so it never blocks the render loop between polls.
+
+    Responsibilities:
+    - Poll loaded catalog files on a fixed interval
+    - Reload changed catalogs through the data manager
+    - Drop the cached card text of replaced and removed items
+    - Forward the resulting diffs to the view manager
+    """
+
+    def __init__(self, data_manager, view_manager, frame_scheduler):
+        self.data_manager = data_manager
+        self.view_manager = view_manager
+        self.frame_scheduler = frame_scheduler
+
+    def start(self):
+        """Start polling for catalog changes"""
+        self.frame_scheduler.call_later(HOT_RELOAD_TASK_KEY, HOT_RELOAD_POLL_SECONDS, self.poll)
+
+    def stop(self):
+        """Stop polling for catalog changes"""
+        self.frame_scheduler.cancel_call(HOT_RELOAD_TASK_KEY)
+
+    def poll(self):
+        """Reload the catalogs that changed since the last poll, then schedule the next poll"""
+        for catalog_name in self.data_manager.poll_catalog_changes():
+            diff = self.data_manager.reload_catalog(catalog_name)
+            if diff:
+                UIComponents.render_cache.discard_diff(diff)
+                self.view_manager.apply_catalog_diff(catalog_name, diff)
+        self.start()
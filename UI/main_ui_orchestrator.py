@@ -1,6 +1,9 @@
 import dearpygui.dearpygui as dpg
 from config import *
 from UI.ui_components import UIComponents
+from UI.compatibility_panel import CompatibilityPanel
+from UI.comparison_tray import ComparisonTray
+from profiling import timed
 
 class MainUIOrchestrator:
     """
@@ -14,6 +17,8 @@ class MainUIOrchestrator:
         self.data_manager = data_manager
         self.display_manager = display_manager
         self.view_manager = view_manager
+        self.compatibility_panel = CompatibilityPanel(data_manager)
+        self.comparison_tray = ComparisonTray(data_manager)
         
         self.setup_callbacks()
         self.setup_ui()
@@ -21,10 +26,13 @@ class MainUIOrchestrator:
     def setup_ui(self):
         """Initialize the main UI layout and components"""
         dpg.set_viewport_resize_callback(self.resize_callback)
+        UIComponents.register_card_action(COMPATIBLE_GEAR_LABEL, self.compatibility_panel.show)
+        UIComponents.register_card_action(COMPARE_LABEL, self.comparison_tray.toggle)
         
         with UIComponents.create_main_window():
             UIComponents.create_navigation_bar(self.callbacks)
-            UIComponents.create_search_bar(self.search_callback, self.on_enter)
+            UIComponents.create_search_bar(self.search_callback, self.on_enter, self.sort_callback,
+                                           self.value_weight_callback)
             UIComponents.create_content_areas()
     
     def setup_callbacks(self):
@@ -34,10 +42,30 @@ class MainUIOrchestrator:
             'show_reels': self.view_manager.show_reels,
         }
     
+    @timed
     def search_callback(self):
         """Handle search input changes"""
         search_term = dpg.get_value(UI_TAGS['search_input']).lower()
-        self.display_manager.display_search_results(search_term)
+        self.view_manager.search_current_view(search_term)
+    
+    def sort_callback(self, sender, sort_label):
+        """Handle a change of the sort option"""
+        self.view_manager.sort_views(SORT_OPTIONS[sort_label])
+    
+    def value_weight_callback(self, sender, weight):
+        """Handle a move of the value weight slider"""
+        self.data_manager.value_weight = weight
+        sort = self.display_manager.sort
+        if sort is None or sort[0] != VALUE_SORT_COLUMN:
+            return
+        
+        # Coalesce a slider drag into a single re-sort of the views
+        frame_scheduler = self.display_manager.frame_scheduler
+        if frame_scheduler:
+            frame_scheduler.call_later(VALUE_WEIGHT_TASK_KEY, VALUE_WEIGHT_DEBOUNCE_SECONDS,
+                                       lambda: self.view_manager.sort_views(self.display_manager.sort))
+        else:
+            self.view_manager.sort_views(sort)
     
     def on_enter(self):
         """Handle Enter key press in search field"""
@@ -50,9 +78,14 @@ class MainUIOrchestrator:
         
         dpg.configure_item(UI_TAGS['main_window'], width=viewport_width, height=viewport_height)
         
-        UIComponents.recenter_navigation_bar(self.callbacks, self.display_manager)
-        UIComponents.recenter_search_bar(self.search_callback, self.on_enter, self.display_manager)
+        # Re-center the nav and search bars by resizing their spacers in place
+        UIComponents.resize_navigation_bar()
+        UIComponents.resize_search_bar()
         
-        # Refresh the current view with proper responsive layout
-        self.display_manager.refresh_current_view_responsive()
+        # Coalesce bursts of resize events into a single card re-flow
+        frame_scheduler = self.display_manager.frame_scheduler
+        if frame_scheduler:
+            frame_scheduler.call_later(RESIZE_TASK_KEY, RESIZE_DEBOUNCE_SECONDS, self.display_manager.relayout_current_view)
+        else:
+            self.display_manager.relayout_current_view()
     
\ No newline at end of file
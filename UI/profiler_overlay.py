@@ -0,0 +1,63 @@
+import dearpygui.dearpygui as dpg
+from config import *
+
+
+class ProfilerOverlay:
+    """
+    Profiler Overlay for Fishing Planet Application
+
+    This class shows a small always-on-top window with the current frame time
+    and the most recent timed actions recorded by the profiler, including how
+    many DearPyGui items each action created and deleted. Text items are
+    created once and only their values are refreshed every few frames, so the
+    overlay itself barely shows up in the numbers it reports.
+
+    Responsibilities:
+    - Show frame time, frame rate and the live item count
+    - List the last N profiled actions with their item counters
+    - Dump the collected profile to disk on demand
+    """
+
+    def __init__(self, profiler, frame_scheduler):
+        self.profiler = profiler
+        self.frame_scheduler = frame_scheduler
+        self.frame_text = None
+        self.action_texts = []
+        self.frame_count = 0
+
+    def show(self):
+        """Create the overlay window and start refreshing it every few frames"""
+        with dpg.window(
+            label=PROFILER_OVERLAY_LABEL,
+            tag=UI_TAGS['profiler_window'],
+            width=PROFILER_OVERLAY_WIDTH,
+            height=PROFILER_OVERLAY_HEIGHT,
+            pos=(WINDOW_WIDTH - PROFILER_OVERLAY_WIDTH - WINDOW_PADDING, WINDOW_PADDING),
+            no_focus_on_appearing=True
+        ):
+            self.frame_text = dpg.add_text("")
+            dpg.add_separator()
+            self.action_texts = [dpg.add_text("") for _ in range(PROFILER_OVERLAY_LINES)]
+            dpg.add_button(label=PROFILER_DUMP_LABEL, callback=lambda: self.profiler.dump(PROFILE_OUTPUT_DIR))
+        self.frame_scheduler.add_frame_task(UI_TAGS['profiler_window'], self.update)
+
+    def update(self):
+        """Per-frame task: refresh the overlay text every PROFILER_OVERLAY_REFRESH_FRAMES frames"""
+        if not dpg.does_item_exist(UI_TAGS['profiler_window']):
+            return False
+        self.frame_count += 1
+        if self.frame_count % PROFILER_OVERLAY_REFRESH_FRAMES:
+            return None
+
+        frame_ms = dpg.get_delta_time() * 1000
+        fps = dpg.get_frame_rate()
+        dpg.set_value(self.frame_text, PROFILER_FRAME_FORMAT.format(frame_ms, fps, len(dpg.get_all_items())))
+
+        actions = self.profiler.recent(len(self.action_texts))
+        for i, text_item in enumerate(self.action_texts):
+            if i < len(actions):
+                name, elapsed, created, deleted = actions[i]
+                dpg.set_value(text_item, PROFILER_ACTION_FORMAT.format(elapsed * 1000, created, deleted, name))
+            else:
+                dpg.set_value(text_item, "")
+        return None
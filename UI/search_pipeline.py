@@ -0,0 +1,82 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from config import SEARCH_WORKER_THREADS
+
+SEARCH_BATCH = 'batch'
+SEARCH_DONE = 'done'
+
+
+class SearchPipeline:
+    """
+    Search Pipeline for Fishing Planet Application
+
+    This class runs searches on a worker thread and streams their results
+    back to the UI thread in category batches. Every new search supersedes
+    the previous one: stale searches stop at their next batch boundary and
+    any batches they already queued are discarded, so only the latest
+    keystroke ever reaches the display.
+
+    Responsibilities:
+    - Run search batch generators on a background worker
+    - Cancel stale searches when a newer one is submitted
+    - Deliver batches to display callbacks from the render loop
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=SEARCH_WORKER_THREADS, thread_name_prefix="search")
+        self.results = queue.Queue()
+        self.generation = 0
+        self.handlers = None
+        self.started = False
+
+    def submit(self, search_term, batch_source, on_start, on_batch, on_done):
+        """Start a search, superseding any search still in flight"""
+        self.generation += 1
+        self.handlers = (on_start, on_batch, on_done)
+        self.started = False
+        self.executor.submit(self._run, self.generation, search_term, batch_source)
+        return self.generation
+
+    def cancel(self):
+        """Cancel the search in flight, if any"""
+        self.generation += 1
+        self.handlers = None
+
+    def is_current(self, generation):
+        """Check whether a search generation is still the latest one"""
+        return generation == self.generation
+
+    def _run(self, generation, search_term, batch_source):
+        """Worker: produce result batches until done or superseded"""
+        if not self.is_current(generation):
+            return
+        for batch in batch_source(search_term, lambda: not self.is_current(generation)):
+            if not self.is_current(generation):
+                return
+            self.results.put((generation, SEARCH_BATCH, batch))
+        self.results.put((generation, SEARCH_DONE, None))
+
+    def pump(self):
+        """Deliver queued batches of the current search; called once per frame"""
+        while True:
+            try:
+                generation, kind, payload = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            if not self.is_current(generation) or self.handlers is None:
+                continue
+
+            on_start, on_batch, on_done = self.handlers
+            if not self.started:
+                self.started = True
+                on_start()
+            if kind == SEARCH_BATCH:
+                on_batch(*payload)
+            else:
+                self.handlers = None
+                on_done()
+
+    def shutdown(self):
+        """Stop the worker thread"""
+        self.cancel()
+        self.executor.shutdown(wait=False)
@@ -1,6 +1,10 @@
+import time
+from collections import deque
 import dearpygui.dearpygui as dpg
 from config import *
 from UI.ui_components import UIComponents
+from UI.virtual_card_grid import VirtualCardGrid
+from profiling import timed, profile_section
 
 class UICardLayout:
     """
@@ -16,11 +20,21 @@ class UICardLayout:
     - Display cards in organized layouts
     - Handle empty data states
     - Manage card spacing and positioning
+    - Host virtualized grids that only build visible rows
+    - Build cards progressively under a per-frame budget, paging long categories
+    - Patch displayed cards in place when a catalog is reloaded
     """
     
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, frame_scheduler=None):
         self.data_manager = data_manager
+        self.frame_scheduler = frame_scheduler
+        self.virtual_grids = {}
+        self.card_blocks = {}
+        self.layouts = {}
+        self.card_items = {}
+        self.pending_pages = {}
     
+    @timed
     def display_cards(self, data, parent_group):
         """Display cards in a responsive grid layout within the parent group"""
         if not data:
@@ -31,8 +45,175 @@ class UICardLayout:
         available_width, cards_per_row = self.calculate_layout_parameters()
         rows = self.group_data_into_rows(data, cards_per_row)
         
+        block_rows = []
+        card_items = self.card_items.setdefault(parent_group, {})
         for row in rows:
-            UIComponents.create_card_row(row, parent_group, available_width, self.data_manager)
+            block_row = UIComponents.create_card_row(row, parent_group, available_width, self.data_manager)
+            block_rows.append(block_row)
+            for item, card_id in zip(row, block_row['cards']):
+                card_items[id(item)] = card_id
+        
+        # Remember the card widgets so a resize can re-flow them instead of rebuilding
+        self.card_blocks.setdefault(parent_group, []).append(block_rows)
+        self.layouts[parent_group] = (available_width, cards_per_row)
+    
+    def display_category(self, category_name, items, parent_group):
+        """Display a category header and its cards, building them progressively when possible"""
+        dpg.add_text(CATEGORY_HEADER_FORMAT.format(category_name), parent=parent_group)
+        if PROGRESSIVE_CARD_RENDERING and self.frame_scheduler and items:
+            self.layouts[parent_group] = self.calculate_layout_parameters()
+            self._queue_page(dpg.add_group(parent=parent_group), items, 0, parent_group)
+        else:
+            self.display_cards(items, parent_group)
+        dpg.add_spacer(height=CATEGORY_SPACING, parent=parent_group)
+    
+    def _queue_page(self, container, items, start, parent_group):
+        """Queue the next page of a category's cards to be built over the coming frames"""
+        end = min(len(items), start + CARD_PAGE_SIZE) if CARD_PAGE_SIZE else len(items)
+        block_rows = []
+        self.card_blocks.setdefault(parent_group, []).append(block_rows)
+        self.pending_pages.setdefault(parent_group, deque()).append([container, items, start, end, block_rows])
+        self.frame_scheduler.add_frame_task(
+            CARD_RENDER_TASK_KEY.format(parent_group), lambda: self._build_pending_rows(parent_group))
+    
+    def _build_pending_rows(self, parent_group):
+        """Frame task: build queued card rows until the frame budget is spent"""
+        pages = self.pending_pages.get(parent_group)
+        if not pages or not dpg.does_item_exist(parent_group):
+            self.pending_pages.pop(parent_group, None)
+            return False
+        
+        with profile_section('UICardLayout.build_pending_rows'):
+            deadline = time.perf_counter() + CARD_RENDER_FRAME_BUDGET_MS / 1000
+            available_width, cards_per_row = self.layouts.get(parent_group) or self.calculate_layout_parameters()
+            card_items = self.card_items.setdefault(parent_group, {})
+            while pages:
+                page = pages[0]
+                container, items, start, end, block_rows = page
+                row = items[start:min(end, start + cards_per_row)]
+                block_row = UIComponents.create_card_row(row, container, available_width, self.data_manager)
+                block_rows.append(block_row)
+                for item, card_id in zip(row, block_row['cards']):
+                    card_items[id(item)] = card_id
+                
+                page[2] = start + len(row)
+                if page[2] >= end:
+                    pages.popleft()
+                    if end < len(items):
+                        self._add_load_more_button(container, items, end, parent_group)
+                if time.perf_counter() >= deadline:
+                    break
+        
+        if not pages:
+            self.pending_pages.pop(parent_group, None)
+            return False
+        return None
+    
+    def _add_load_more_button(self, container, items, start, parent_group):
+        """Add a button that queues the next page of a category's cards"""
+        def load_more(sender):
+            dpg.delete_item(sender)
+            self._queue_page(container, items, start, parent_group)
+        
+        dpg.add_button(label=LOAD_MORE_LABEL.format(len(items) - start), callback=load_more, parent=container)
+    
+    @timed
+    def display_virtual_grid(self, data_by_category, parent_group):
+        """Display categorized cards in a virtualized grid that only builds visible rows"""
+        available_width, cards_per_row = self.calculate_layout_parameters()
+        grid = self.virtual_grids.get(parent_group)
+        if grid is None or not dpg.does_item_exist(grid.slot_container):
+            grid = VirtualCardGrid(parent_group, self.data_manager, self.frame_scheduler)
+            self.virtual_grids[parent_group] = grid
+        grid.set_data(data_by_category, available_width, cards_per_row)
+        self.layouts[parent_group] = (available_width, cards_per_row)
+    
+    @timed
+    def append_virtual_category(self, category_name, data, parent_group):
+        """Append one category to the parent group's virtual grid, creating the grid if needed"""
+        grid = self.virtual_grids.get(parent_group)
+        if grid is None or not dpg.does_item_exist(grid.slot_container):
+            self.display_virtual_grid({}, parent_group)
+            grid = self.virtual_grids[parent_group]
+        grid.append_category(category_name, data)
+    
+    def patch_cards(self, parent_group, diff, data_by_category, reorder=False):
+        """Patch a parent group's cards for a CatalogDiff, returning False when it needs a rebuild"""
+        grid = self.virtual_grids.get(parent_group)
+        if grid is not None:
+            if diff.added or diff.removed or reorder:
+                grid.replace_data(data_by_category)
+            else:
+                grid.refresh_items(data_by_category, {index for index, _, _ in diff.changed})
+            return True
+        
+        # Plain card rows can swap changed cards in place; added or removed cards change the flow
+        if diff.added or diff.removed or reorder or parent_group not in self.card_blocks:
+            return False
+        card_items = self.card_items.get(parent_group, {})
+        replaced = {}
+        for _, old_item, item in diff.changed:
+            card_id = card_items.pop(id(old_item), None)
+            if card_id is None:
+                continue
+            new_card = UIComponents.replace_card(card_id, item, self.data_manager)
+            card_items[id(item)] = new_card
+            replaced[card_id] = new_card
+        for block_rows in self.card_blocks[parent_group]:
+            for row in block_rows:
+                row['cards'] = [replaced.get(card_id, card_id) for card_id in row['cards']]
+        return True
+    
+    @timed
+    def relayout(self, parent_group):
+        """Re-flow existing cards when the layout width changes, rebuilding rows only if cards_per_row changed"""
+        layout = self.calculate_layout_parameters()
+        if self.layouts.get(parent_group, layout) == layout:
+            return
+        available_width, cards_per_row = layout
+        previous_cards_per_row = self.layouts[parent_group][1]
+        self.layouts[parent_group] = layout
+        
+        grid = self.virtual_grids.get(parent_group)
+        if grid is not None:
+            grid.relayout(available_width, cards_per_row)
+            return
+        
+        blocks = self.card_blocks.get(parent_group, [])
+        for block_rows in blocks:
+            if not block_rows:
+                continue
+            if cards_per_row == previous_cards_per_row:
+                for row in block_rows:
+                    UIComponents.recenter_card_row(row, available_width)
+            else:
+                self._regroup_block(block_rows, available_width, cards_per_row)
+    
+    def _regroup_block(self, block_rows, available_width, cards_per_row):
+        """Move a block's card widgets into new row groups, replacing the block's rows in place"""
+        card_ids = [card_id for row in block_rows for card_id in row['cards']]
+        anchor = block_rows[0]['group']
+        # Progressively built blocks keep their rows in a category container
+        container = dpg.get_item_parent(anchor)
+        new_rows = [
+            UIComponents.arrange_card_row(row_cards, container, available_width, before=anchor)
+            for row_cards in self.group_data_into_rows(card_ids, cards_per_row)
+        ]
+        for row in block_rows:
+            dpg.delete_item(row['group'])
+        block_rows[:] = new_rows
+    
+    def clear(self, parent_group):
+        """Delete all cards in the parent group and drop its virtual grid"""
+        dpg.delete_item(parent_group, children_only=True)
+        self.card_blocks.pop(parent_group, None)
+        self.card_items.pop(parent_group, None)
+        self.layouts.pop(parent_group, None)
+        if self.pending_pages.pop(parent_group, None) is not None and self.frame_scheduler:
+            self.frame_scheduler.remove_frame_task(CARD_RENDER_TASK_KEY.format(parent_group))
+        grid = self.virtual_grids.pop(parent_group, None)
+        if grid is not None and self.frame_scheduler:
+            self.frame_scheduler.remove_frame_task(grid.frame_task_key)
     
     def calculate_layout_parameters(self):
         """Calculate responsive layout parameters based on viewport size"""
@@ -41,10 +222,6 @@ class UICardLayout:
         cards_per_row = max(1, int(available_width / (CARD_WIDTH + CARD_ROW_SPACING)))
         return available_width, cards_per_row
     
-    def recalculate_layout(self):
-        """Force recalculation of layout parameters and return new values"""
-        return self.calculate_layout_parameters()
-    
     def group_data_into_rows(self, data, cards_per_row):
         """Group data items into rows for grid layout display"""
         rows = []
@@ -1,5 +1,7 @@
 import dearpygui.dearpygui as dpg
 from config import *
+from UI.card_render_cache import CardRenderCache, CardRenderModel
+from value_scoring import VALUE_SCORING_AVAILABLE
 
 class UIComponents:
     """
@@ -15,6 +17,12 @@ class UIComponents:
     - Responsive layout adjustments
     """
     
+    # (label, callback) buttons added to every card; callbacks get the item as user_data
+    card_actions = []
+    
+    # Pre-formatted card lines, built once per item version
+    render_cache = CardRenderCache()
+    
     # ==================== MAIN WINDOW CREATION ====================
     
     @staticmethod
@@ -40,12 +48,9 @@ class UIComponents:
     @staticmethod
     def _add_centered_navigation_buttons(callbacks, parent_group=None):
         """Add navigation buttons with proper centering and spacing"""
-        viewport_width = dpg.get_viewport_width()
-        total_width = len(NAVIGATION_BUTTONS) * NAV_BUTTON_WIDTH + (len(NAVIGATION_BUTTONS) - 1) * NAV_BUTTON_SPACING
-        left_spacer_width = max(0, (viewport_width - total_width) // 2)
+        left_spacer_width = UIComponents._navigation_spacer_width()
         
-        if left_spacer_width > 0:
-            UIComponents._add_spacer(width=int(left_spacer_width), parent_group=parent_group)
+        UIComponents._add_centering_spacer(UI_TAGS['nav_left_spacer'], left_spacer_width, parent_group)
         
         for i, button_config in enumerate(NAVIGATION_BUTTONS):
             callback_method = callbacks[button_config['callback']]
@@ -70,31 +75,36 @@ class UIComponents:
             if i < len(NAVIGATION_BUTTONS) - 1:
                 UIComponents._add_spacer(width=NAV_BUTTON_SPACING, parent_group=parent_group)
         
-        if left_spacer_width > 0:
-            UIComponents._add_spacer(width=int(left_spacer_width), parent_group=parent_group)
+        UIComponents._add_centering_spacer(UI_TAGS['nav_right_spacer'], left_spacer_width, parent_group)
+    
+    @staticmethod
+    def _navigation_spacer_width():
+        """Calculate the spacer width that centers the navigation buttons"""
+        viewport_width = dpg.get_viewport_width()
+        total_width = len(NAVIGATION_BUTTONS) * NAV_BUTTON_WIDTH + (len(NAVIGATION_BUTTONS) - 1) * NAV_BUTTON_SPACING
+        return int(max(0, (viewport_width - total_width) // 2))
     
     # ==================== SEARCH BAR COMPONENTS ====================
     
     @staticmethod
-    def create_search_bar(search_callback, enter_callback):
-        """Create the search bar with input field and search button"""
+    def create_search_bar(search_callback, enter_callback, sort_callback=None, value_weight_callback=None):
+        """Create the search bar with input field, search button, sort option and value weight slider"""
         with dpg.group(horizontal=True):
-            UIComponents._add_centered_search_components(search_callback, enter_callback)
+            UIComponents._add_centered_search_components(search_callback, enter_callback, sort_callback=sort_callback,
+                                                         value_weight_callback=value_weight_callback)
     
     @staticmethod
-    def _add_centered_search_components(search_callback, enter_callback, parent_group=None):
+    def _add_centered_search_components(search_callback, enter_callback, parent_group=None, sort_callback=None,
+                                        value_weight_callback=None):
         """Add search components with proper centering and spacing"""
-        viewport_width = dpg.get_viewport_width()
-        search_area_width = SEARCH_INPUT_WIDTH + NAV_BUTTON_SPACING + SEARCH_BUTTON_WIDTH
-        left_spacer_width = max(0, (viewport_width - search_area_width) // 2)
+        left_spacer_width = UIComponents._search_spacer_width()
         
-        if left_spacer_width > 0:
-            UIComponents._add_spacer(width=int(left_spacer_width), parent_group=parent_group)
+        UIComponents._add_centering_spacer(UI_TAGS['search_left_spacer'], left_spacer_width, parent_group)
         
         if parent_group is not None:
             dpg.add_input_text(
                 tag=UI_TAGS['search_input'], 
-                on_enter=True, 
+                on_enter=not LIVE_SEARCH, 
                 callback=enter_callback, 
                 hint=SEARCH_HINT, 
                 width=SEARCH_INPUT_WIDTH, 
@@ -113,7 +123,7 @@ class UIComponents:
         else:
             dpg.add_input_text(
                 tag=UI_TAGS['search_input'], 
-                on_enter=True, 
+                on_enter=not LIVE_SEARCH, 
                 callback=enter_callback, 
                 hint=SEARCH_HINT, 
                 width=SEARCH_INPUT_WIDTH, 
@@ -128,8 +138,59 @@ class UIComponents:
                 height=SEARCH_BUTTON_HEIGHT
             )
         
-        if left_spacer_width > 0:
-            UIComponents._add_spacer(width=int(left_spacer_width), parent_group=parent_group)
+        if sort_callback is not None:
+            UIComponents._add_sort_combo(sort_callback, parent_group)
+        if value_weight_callback is not None and VALUE_SCORING_AVAILABLE:
+            UIComponents._add_value_weight_slider(value_weight_callback, parent_group)
+        
+        UIComponents._add_centering_spacer(UI_TAGS['search_right_spacer'], left_spacer_width, parent_group)
+    
+    @staticmethod
+    def _add_sort_combo(sort_callback, parent_group=None):
+        """Add the combo that picks the sort order of every view"""
+        kwargs = {'parent': parent_group} if parent_group is not None else {}
+        UIComponents._add_spacer(width=NAV_BUTTON_SPACING, parent_group=parent_group)
+        dpg.add_combo(
+            UIComponents._sort_option_labels(),
+            tag=UI_TAGS['sort_combo'],
+            default_value=DEFAULT_SORT_OPTION,
+            callback=sort_callback,
+            width=SORT_COMBO_WIDTH,
+            **kwargs
+        )
+    
+    @staticmethod
+    def _sort_option_labels():
+        """Return the sort option labels; value sorting is only offered when it can be scored"""
+        return [
+            label for label, sort in SORT_OPTIONS.items()
+            if VALUE_SCORING_AVAILABLE or sort is None or sort[0] != VALUE_SORT_COLUMN
+        ]
+    
+    @staticmethod
+    def _add_value_weight_slider(value_weight_callback, parent_group=None):
+        """Add the slider that weighs price in the best value ordering"""
+        kwargs = {'parent': parent_group} if parent_group is not None else {}
+        UIComponents._add_spacer(width=NAV_BUTTON_SPACING, parent_group=parent_group)
+        dpg.add_slider_float(
+            label=VALUE_WEIGHT_LABEL,
+            tag=UI_TAGS['value_weight_slider'],
+            default_value=DEFAULT_VALUE_WEIGHT,
+            min_value=VALUE_WEIGHT_MIN,
+            max_value=VALUE_WEIGHT_MAX,
+            callback=value_weight_callback,
+            width=VALUE_WEIGHT_SLIDER_WIDTH,
+            **kwargs
+        )
+    
+    @staticmethod
+    def _search_spacer_width():
+        """Calculate the spacer width that centers the search components"""
+        viewport_width = dpg.get_viewport_width()
+        search_area_width = SEARCH_INPUT_WIDTH + NAV_BUTTON_SPACING + SEARCH_BUTTON_WIDTH + NAV_BUTTON_SPACING + SORT_COMBO_WIDTH
+        if VALUE_SCORING_AVAILABLE:
+            search_area_width += NAV_BUTTON_SPACING + VALUE_WEIGHT_SLIDER_WIDTH
+        return int(max(0, (viewport_width - search_area_width) // 2))
     
     # ==================== CONTENT AREA CREATION ====================
     
@@ -143,76 +204,132 @@ class UIComponents:
     
     @staticmethod
     def create_card_row(cards_in_row, parent_group, available_width, data_manager=None):
-        """Create a row of cards with proper spacing and centering"""
-        with dpg.group(horizontal=True, parent=parent_group):
-            UIComponents._add_centered_cards(cards_in_row, available_width, data_manager)
+        """Create a row of cards with proper spacing and centering, returning its widget ids"""
+        with dpg.group(horizontal=True, parent=parent_group) as row_group:
+            lead_spacer, card_ids = UIComponents._add_centered_cards(cards_in_row, available_width, data_manager)
+        return {'group': row_group, 'lead_spacer': lead_spacer, 'cards': card_ids}
     
     @staticmethod
     def _add_centered_cards(cards_in_row, available_width, data_manager=None):
         """Add cards to a row with proper centering and spacing"""
-        row_width = len(cards_in_row) * CARD_WIDTH + (len(cards_in_row) - 1) * CARD_ROW_SPACING
-        spacer_width = max(0, (available_width - row_width) // 2)
-        
-        if spacer_width > 0:
-            UIComponents._add_spacer(width=spacer_width)
+        spacer_width = UIComponents.card_row_spacer_width(len(cards_in_row), available_width)
+        lead_spacer = dpg.add_spacer(width=spacer_width, show=spacer_width > 0)
         
+        card_ids = []
         for i, item in enumerate(cards_in_row):
-            UIComponents._create_card(item, data_manager)
+            card_ids.append(UIComponents._create_card(item, data_manager))
             
             if i < len(cards_in_row) - 1:
                 UIComponents._add_spacer(width=CARD_SPACING)
+        return lead_spacer, card_ids
     
     @staticmethod
-    def _create_card(item, data_manager=None):
-        """Create an individual card container"""
-        with dpg.child_window(width=CARD_WIDTH, height=CARD_HEIGHT, border=True):
-            # Determine if this is a rod or reel based on available fields
-            if 'rodtype' in item:
-                UIComponents._create_rod_card(item, data_manager)
-            elif 'reeltype' in item:
-                UIComponents._create_reel_card(item, data_manager)
-            else:
-                # Show error for unknown item type
-                dpg.add_text("Error: Unknown item type")
-                dpg.add_text(f"Item: {item.get('name', 'Unknown')}")
-                dpg.add_text("Missing 'rodtype' or 'reeltype' field")
+    def card_row_spacer_width(card_count, available_width):
+        """Calculate the leading spacer width that centers a row of cards"""
+        row_width = card_count * CARD_WIDTH + (card_count - 1) * CARD_ROW_SPACING
+        return int(max(0, (available_width - row_width) // 2))
     
     @staticmethod
-    def _create_rod_card(item, data_manager=None):
-        """Create the content for a fishing rod card"""
-        primary_fields = data_manager.get_primary_rod_fields() if data_manager else FALLBACK_PRIMARY_FIELDS
-        secondary_fields = data_manager.get_secondary_rod_fields() if data_manager else FALLBACK_SECONDARY_FIELDS
-        
-        UIComponents._display_fields(item, primary_fields, data_manager)
+    def arrange_card_row(card_ids, parent_group, available_width, before=0):
+        """Move existing card widgets into a new centered row group"""
+        row_group = dpg.add_group(horizontal=True, parent=parent_group, before=before)
+        spacer_width = UIComponents.card_row_spacer_width(len(card_ids), available_width)
+        lead_spacer = dpg.add_spacer(width=spacer_width, show=spacer_width > 0, parent=row_group)
         
-        if any(field in item for field in secondary_fields):
-            with dpg.collapsing_header(label=ADDITIONAL_INFO_LABEL, default_open=False):
-                UIComponents._display_fields(item, secondary_fields, data_manager)
+        for i, card_id in enumerate(card_ids):
+            if i > 0:
+                UIComponents._add_spacer(width=CARD_SPACING, parent_group=row_group)
+            dpg.move_item(card_id, parent=row_group)
+        return {'group': row_group, 'lead_spacer': lead_spacer, 'cards': list(card_ids)}
     
     @staticmethod
-    def _create_reel_card(item, data_manager=None):
-        """Create the content for a fishing reel card"""
-        primary_fields = data_manager.get_primary_reel_fields() if data_manager else FALLBACK_PRIMARY_REEL_FIELDS
-        secondary_fields = data_manager.get_secondary_reel_fields() if data_manager else FALLBACK_SECONDARY_REEL_FIELDS
-        
-        UIComponents._display_fields(item, primary_fields, data_manager)
+    def recenter_card_row(row, available_width):
+        """Update a card row's leading spacer for a new available width"""
+        spacer_width = UIComponents.card_row_spacer_width(len(row['cards']), available_width)
+        dpg.configure_item(row['lead_spacer'], width=spacer_width, show=spacer_width > 0)
+    
+    @staticmethod
+    def _create_card(item, data_manager=None):
+        """Create an individual card container and return its id"""
+        with dpg.child_window(width=CARD_WIDTH, height=CARD_HEIGHT, border=True) as card:
+            UIComponents._create_card_content(UIComponents.get_card_model(item, data_manager))
+            UIComponents._add_card_actions(item)
+        return card
+    
+    @staticmethod
+    def replace_card(card_id, item, data_manager=None):
+        """Rebuild a card for an updated item in the same position and return the new card id"""
+        row_group = dpg.get_item_parent(card_id)
+        dpg.push_container_stack(row_group)
+        try:
+            new_card = UIComponents._create_card(item, data_manager)
+        finally:
+            dpg.pop_container_stack()
+        dpg.move_item(new_card, parent=row_group, before=card_id)
+        dpg.delete_item(card_id)
+        return new_card
+    
+    @staticmethod
+    def register_card_action(label, callback):
+        """Add a button to every card created from now on"""
+        UIComponents.card_actions.append((label, callback))
+    
+    @staticmethod
+    def _add_card_actions(item, parent=None):
+        """Add the registered card action buttons and return their ids"""
+        kwargs = {'parent': parent} if parent is not None else {}
+        return [
+            dpg.add_button(label=label, callback=callback, user_data=item, **kwargs)
+            for label, callback in UIComponents.card_actions
+        ]
+    
+    @staticmethod
+    def _create_card_content(model):
+        """Create the text of a card from its render model"""
+        for line in model.primary_lines:
+            dpg.add_text(line)
         
-        if any(field in item for field in secondary_fields):
+        if model.show_additional_info:
             with dpg.collapsing_header(label=ADDITIONAL_INFO_LABEL, default_open=False):
-                UIComponents._display_fields(item, secondary_fields, data_manager)
+                for line in model.secondary_lines:
+                    dpg.add_text(line)
     
     @staticmethod
-    def _display_fields(item, fields, data_manager=None):
-        """Display item fields with proper formatting"""
+    def _card_fields(item, data_manager=None):
+        """Get the (primary, secondary) fields shown on an item's card, or None for unknown items"""
+        if data_manager:
+            equipment_type = data_manager.equipment_type_of(item)
+            if equipment_type is None:
+                return None
+            return equipment_type.primary_fields, equipment_type.secondary_fields
+        for type_field, card_fields in FALLBACK_CARD_FIELDS.items():
+            if type_field in item:
+                return card_fields
+        return None
+    
+    @staticmethod
+    def _unknown_item_lines(item):
+        """Get the error lines shown for an item that is neither a rod nor a reel"""
+        return [
+            "Error: Unknown item type",
+            f"Item: {item.get('name', 'Unknown')}",
+            "Missing 'rodtype' or 'reeltype' field"
+        ]
+    
+    @staticmethod
+    def _field_lines(item, fields, data_manager=None):
+        """Format the display lines for the given item fields"""
+        lines = []
         for field in fields:
             if field in item:
                 value = item[field]
                 if data_manager:
                     display_name = data_manager.format_field_display_name(field)
                     display_value = data_manager.format_field_value(field, value)
-                    dpg.add_text(f"{display_name}: {display_value}")
+                    lines.append(f"{display_name}: {display_value}")
                 else:
-                    UIComponents._format_field_display(field, value)
+                    lines.append(UIComponents._format_field_display(field, value))
+        return lines
     
     @staticmethod
     def _format_field_display(field, value):
@@ -224,43 +341,117 @@ class UIComponents:
             display_name = 'Lure Weight'
         
         if isinstance(value, list):
-            dpg.add_text(f"{display_name}: {', '.join(value)}")
+            return f"{display_name}: {', '.join(value)}"
         else:
-            dpg.add_text(f"{display_name}: {value}")
+            return f"{display_name}: {value}"
     
-    # ==================== RESPONSIVE LAYOUT UTILITIES ====================
+    @staticmethod
+    def get_card_model(item, data_manager=None):
+        """Get an item's card render model, formatting its lines only for a new item version"""
+        if data_manager is None:
+            return UIComponents._build_card_model(item)
+        return UIComponents.render_cache.get(item, lambda item: UIComponents._build_card_model(item, data_manager))
+    
+    @staticmethod
+    def _build_card_model(item, data_manager=None):
+        """Format the primary and secondary lines of an item's card"""
+        card_fields = UIComponents._card_fields(item, data_manager)
+        if not card_fields:
+            return CardRenderModel(item, UIComponents._unknown_item_lines(item), [])
+        primary_fields, secondary_fields = card_fields
+        
+        primary_lines = UIComponents._field_lines(item, primary_fields, data_manager)
+        secondary_lines = UIComponents._field_lines(item, secondary_fields, data_manager)
+        return CardRenderModel(item, primary_lines, secondary_lines)
+    
+    # ==================== RECYCLABLE CARD SLOTS ====================
     
     @staticmethod
-    def recenter_navigation_bar(callbacks, display_manager=None):
-        """Recenter the navigation bar on window resize"""
-        UIComponents._recenter_component(NAVIGATION_COMPONENT, display_manager, 
-                                       lambda: UIComponents._add_centered_navigation_buttons(callbacks, 
-                                           display_manager.get_navigation_group() if display_manager else None))
+    def create_card_slot(parent_group, add_leading_spacer=False):
+        """Create an empty, reusable card container with fixed text slots"""
+        slot = {'spacer': None, 'primary': [], 'secondary': [], 'actions': []}
+        if add_leading_spacer:
+            slot['spacer'] = dpg.add_spacer(width=CARD_SPACING, parent=parent_group)
+        
+        slot['window'] = dpg.add_child_window(width=CARD_WIDTH, height=CARD_HEIGHT, border=True, parent=parent_group)
+        for _ in range(CARD_SLOT_PRIMARY_LINES):
+            slot['primary'].append(dpg.add_text("", parent=slot['window']))
+        slot['header'] = dpg.add_collapsing_header(label=ADDITIONAL_INFO_LABEL, default_open=False, parent=slot['window'])
+        for _ in range(CARD_SLOT_SECONDARY_LINES):
+            slot['secondary'].append(dpg.add_text("", parent=slot['header']))
+        slot['actions'] = UIComponents._add_card_actions(None, parent=slot['window'])
+        return slot
     
     @staticmethod
-    def recenter_search_bar(search_callback, enter_callback, display_manager=None):
-        """Recenter the search bar on window resize"""
-        UIComponents._recenter_component(SEARCH_COMPONENT, display_manager,
-                                       lambda: UIComponents._add_centered_search_components(search_callback, enter_callback,
-                                           display_manager.get_search_group() if display_manager else None))
+    def delete_card_slot(slot):
+        """Delete a card slot together with its leading spacer"""
+        dpg.delete_item(slot['window'])
+        if slot['spacer'] is not None:
+            dpg.delete_item(slot['spacer'])
     
     @staticmethod
-    def _recenter_component(component_type, display_manager, recreate_func):
-        """Generic method to recenter UI components"""
-        try:
-            if display_manager:
-                group = getattr(display_manager, f'get_{component_type}_group')()
+    def bind_card_slot(slot, item, data_manager=None):
+        """Show an item in a recycled card slot, or hide the slot when item is None"""
+        if item is None:
+            UIComponents.show_card_slot(slot, False)
+            return
+        
+        model = UIComponents.get_card_model(item, data_manager)
+        UIComponents._bind_text_slots(slot['primary'], model.primary_lines)
+        UIComponents._bind_text_slots(slot['secondary'], model.secondary_lines)
+        dpg.configure_item(slot['header'], show=model.show_additional_info)
+        for action in slot['actions']:
+            dpg.configure_item(action, user_data=item)
+        UIComponents.show_card_slot(slot, True)
+    
+    @staticmethod
+    def show_card_slot(slot, show):
+        """Show or hide a card slot together with its leading spacer"""
+        dpg.configure_item(slot['window'], show=show)
+        if slot['spacer'] is not None:
+            dpg.configure_item(slot['spacer'], show=show)
+    
+    @staticmethod
+    def _bind_text_slots(text_items, lines):
+        """Write lines into a fixed set of text items, hiding the unused ones"""
+        for i, text_item in enumerate(text_items):
+            if i < len(lines):
+                dpg.set_value(text_item, lines[i])
+                dpg.configure_item(text_item, show=True)
             else:
-                group = dpg.get_item_children(UI_TAGS['main_window'])[CHILDREN_INDEX][NAVIGATION_GROUP_INDEX if component_type == NAVIGATION_COMPONENT else SEARCH_GROUP_INDEX]
-            
-            if group:
-                dpg.delete_item(group, children_only=True)
-                recreate_func()
-        except Exception as e:
-            print(ERROR_RECENTERING_MESSAGE.format(component_type, e))
+                dpg.configure_item(text_item, show=False)
+    
+    # ==================== RESPONSIVE LAYOUT UTILITIES ====================
+    
+    @staticmethod
+    def resize_navigation_bar():
+        """Re-center the navigation bar by resizing its spacers in place"""
+        UIComponents._resize_centering_spacers(
+            (UI_TAGS['nav_left_spacer'], UI_TAGS['nav_right_spacer']), UIComponents._navigation_spacer_width())
+    
+    @staticmethod
+    def resize_search_bar():
+        """Re-center the search bar by resizing its spacers in place"""
+        UIComponents._resize_centering_spacers(
+            (UI_TAGS['search_left_spacer'], UI_TAGS['search_right_spacer']), UIComponents._search_spacer_width())
+    
+    @staticmethod
+    def _resize_centering_spacers(spacer_tags, width):
+        """Resize centering spacers, hiding them when they collapse to zero width"""
+        for tag in spacer_tags:
+            if dpg.does_item_exist(tag):
+                dpg.configure_item(tag, width=width, show=width > 0)
     
     # ==================== UTILITY METHODS ====================
     
+    @staticmethod
+    def _add_centering_spacer(tag, width, parent_group=None):
+        """Add a tagged centering spacer that stays hidden while its width is zero"""
+        kwargs = {'tag': tag, 'width': width, 'show': width > 0}
+        if parent_group is not None:
+            kwargs['parent'] = parent_group
+        dpg.add_spacer(**kwargs)
+    
     @staticmethod
     def _add_spacer(width=None, height=None, parent_group=None):
         """Add a spacer element with optional dimensions and parent"""
@@ -1,5 +1,6 @@
 import dearpygui.dearpygui as dpg
 from config import *
+from profiling import timed
 
 class ViewManager:
     """
@@ -13,33 +14,90 @@ class ViewManager:
     - Switch between different application views
     - Manage view visibility states
     - Clear and refresh view content
+    - Keep built views alive and rebuild them only when marked dirty
+    - Apply reloaded catalog changes to the views showing them
+    - Re-sort views when the sort option changes
     - Coordinate with display manager for data presentation
     """
     
     def __init__(self, display_manager):
         self.display_manager = display_manager
+        self.current_view = None
         self.views = {
             'rods': {
                 'group': UI_TAGS['rods_group'],
-                'display_method': self.display_manager.display_rods_data
+                'display_method': self.display_manager.display_rods_data,
+                'dirty': True
             },
             'reels': {
                 'group': UI_TAGS['reels_group'],
-                'display_method': self.display_manager.display_reels_data
+                'display_method': self.display_manager.display_reels_data,
+                'dirty': True
             }
         }
     
+    @timed
     def switch_view(self, target_view):
-        """Switch to the specified view and refresh its content"""
+        """Switch to the specified view, rebuilding its content only if it is dirty"""
         for view_name, view_config in self.views.items():
             dpg.configure_item(view_config['group'], show=(view_name == target_view))
         
         target_config = self.views[target_view]
-        dpg.delete_item(target_config['group'], children_only=True)
-        target_config['display_method']()
+        self.display_manager.cancel_search()
+        if target_config['dirty']:
+            self.display_manager.clear_view_group(target_config['group'])
+            target_config['display_method']()
+            target_config['dirty'] = False
+        else:
+            # Cached widgets only need re-flowing if the layout width changed while hidden
+            self.display_manager.card_layout.relayout(target_config['group'])
         
+        self.current_view = target_view
         dpg.set_value(UI_TAGS['search_input'], "")
     
+    def search_current_view(self, search_term):
+        """Show search results in the current view"""
+        view_config = self.views[self.current_view]
+        self.display_manager.search_view(self.current_view, search_term)
+        # A filtered view no longer matches the unfiltered content shown after a switch
+        view_config['dirty'] = bool(search_term)
+    
+    def apply_catalog_diff(self, view_name, diff):
+        """Bring a view up to date after its catalog was reloaded from disk"""
+        view_config = self.views.get(view_name)
+        if view_config is None or not diff:
+            return
+        if view_config['dirty']:
+            # Dirty views rebuild from the reloaded catalog anyway; a live search is re-run
+            search_term = dpg.get_value(UI_TAGS['search_input']).lower()
+            if view_name == self.current_view and search_term:
+                self.search_current_view(search_term)
+            return
+        self.display_manager.patch_view(view_name, diff)
+    
+    def sort_views(self, sort):
+        """Sort every view; the current one is rebuilt now and the others on their next switch"""
+        self.display_manager.sort = sort
+        self.mark_dirty()
+        if self.current_view is None:
+            return
+        
+        search_term = dpg.get_value(UI_TAGS['search_input']).lower()
+        if search_term:
+            self.search_current_view(search_term)
+            return
+        view_config = self.views[self.current_view]
+        self.display_manager.cancel_search()
+        self.display_manager.clear_view_group(view_config['group'])
+        view_config['display_method']()
+        view_config['dirty'] = False
+    
+    def mark_dirty(self, view_name=None):
+        """Mark a view, or every view, as needing a rebuild on its next switch"""
+        for name, view_config in self.views.items():
+            if view_name is None or name == view_name:
+                view_config['dirty'] = True
+    
     def show_rods(self):
         """Switch to the rods view and display fishing rods data"""
         self.switch_view('rods')
@@ -0,0 +1,268 @@
+import bisect
+import dearpygui.dearpygui as dpg
+from config import *
+from UI.ui_components import UIComponents
+from profiling import profile_section
+
+HEADER_ROW = 'header'
+CARDS_ROW = 'cards'
+UNBOUND_SLOT = -1
+
+
+class VirtualCardGrid:
+    """
+    Virtualized Card Grid for Fishing Planet Application
+
+    This class displays categorized cards while only building the rows that
+    are near the current scroll position. Every category header and card row
+    is modelled with a fixed height, so the rows above and below the visible
+    window are replaced by two spacers. A small pool of row slots, each with
+    recyclable card widgets, is rebound as the user scrolls, keeping the
+    number of DearPyGui items constant regardless of catalog size.
+
+    Responsibilities:
+    - Model category headers and card rows with fixed heights
+    - Track the scroll position of the main window every frame
+    - Recycle row slots and card widgets for the visible rows
+    - Size the spacers that stand in for rows outside the visible window
+    - Patch visible cards when the underlying catalog is reloaded
+    """
+
+    def __init__(self, parent_group, data_manager, frame_scheduler=None):
+        self.parent_group = parent_group
+        self.data_manager = data_manager
+        self.frame_scheduler = frame_scheduler
+        self.items_by_category = {}
+        self.rows = []
+        self.row_offsets = []
+        self.total_height = 0
+        self.available_width = 0
+        self.cards_per_row = 0
+        self.slots = []
+        self.slot_rows = []
+        self.first_row = 0
+        self.origin = None
+        self.last_view_state = None
+        self._create_containers()
+
+    @property
+    def frame_task_key(self):
+        return f"virtual_grid:{self.parent_group}"
+
+    def _create_containers(self):
+        """Create the top spacer, the row slot container and the bottom spacer"""
+        self.top_spacer = dpg.add_spacer(height=0, parent=self.parent_group)
+        self.slot_container = dpg.add_group(parent=self.parent_group)
+        self.bottom_spacer = dpg.add_spacer(height=0, parent=self.parent_group)
+        if self.frame_scheduler:
+            self.frame_scheduler.add_frame_task(self.frame_task_key, self.update_visible_rows)
+
+    def set_data(self, items_by_category, available_width, cards_per_row):
+        """Model the categorized items as rows and show the ones in view"""
+        self.items_by_category = items_by_category
+        self.available_width = available_width
+        self._resize_card_slots(cards_per_row)
+        self.first_row = 0
+        self._build_rows()
+        self.update_visible_rows(force=True)
+
+    def append_category(self, category_name, items):
+        """Append a category below the existing rows without rebuilding them"""
+        self.items_by_category = dict(self.items_by_category)
+        self.items_by_category[category_name] = items
+        self._append_category_rows(category_name, items)
+        self._compute_row_offsets()
+        self.update_visible_rows(force=True)
+
+    def replace_data(self, items_by_category):
+        """Swap in updated categories, keeping the scroll position and the existing widgets"""
+        self.items_by_category = items_by_category
+        self._build_rows()
+        self.update_visible_rows(force=True)
+
+    def refresh_items(self, items_by_category, item_indices):
+        """Swap in reloaded categories, rebinding only the visible rows that show one of the given item indices"""
+        # Rows are rebuilt from the reloaded catalog: the old ones still hold the items it replaced
+        old_rows = self.rows
+        self.items_by_category = items_by_category
+        self._build_rows()
+        if len(self.rows) != len(old_rows):
+            self.update_visible_rows(force=True)
+            return
+
+        for position, slot in enumerate(self.slots):
+            row_index = self.slot_rows[position]
+            if row_index is None or row_index == UNBOUND_SLOT:
+                continue
+            kind, payload = self.rows[row_index]
+            old_kind, old_payload = old_rows[row_index]
+            if kind == HEADER_ROW or old_kind == HEADER_ROW:
+                changed = (kind, payload) != (old_kind, old_payload)
+            else:
+                changed = (list(payload.indices) != list(old_payload.indices)
+                           or any(index in item_indices for index in payload.indices))
+            if changed:
+                self._bind_slot(slot, row_index)
+
+    def relayout(self, available_width, cards_per_row):
+        """Re-flow the rows for a new layout width, reusing the existing card widgets"""
+        self.available_width = available_width
+        if cards_per_row != self.cards_per_row:
+            self._resize_card_slots(cards_per_row)
+            self._build_rows()
+        self.update_visible_rows(force=True)
+
+    def _build_rows(self):
+        """Split every category into a header row and rows of cards_per_row items"""
+        self.rows = []
+        for category_name, items in self.items_by_category.items():
+            self._append_category_rows(category_name, items)
+        self._compute_row_offsets()
+
+    def _append_category_rows(self, category_name, items):
+        """Append a category's header row and card rows to the row model"""
+        self.rows.append((HEADER_ROW, CATEGORY_HEADER_FORMAT.format(category_name)))
+        for start in range(0, len(items), self.cards_per_row):
+            self.rows.append((CARDS_ROW, items[start:start + self.cards_per_row]))
+
+    def _compute_row_offsets(self):
+        """Compute the top offset of every modelled row"""
+        self.row_offsets = []
+        offset = 0
+        for kind, _ in self.rows:
+            self.row_offsets.append(offset)
+            offset += VIRTUAL_HEADER_ROW_HEIGHT if kind == HEADER_ROW else VIRTUAL_CARD_ROW_HEIGHT
+        self.total_height = offset
+
+    # ==================== SCROLL TRACKING ====================
+
+    def update_visible_rows(self, force=False):
+        """Rebind row slots when the visible row window has changed"""
+        if not dpg.does_item_exist(self.slot_container):
+            return False
+        if not force and not dpg.is_item_shown(self.parent_group):
+            return None
+
+        scroll_y = dpg.get_y_scroll(UI_TAGS['main_window'])
+        view_height = dpg.get_item_height(UI_TAGS['main_window']) or dpg.get_viewport_height()
+        origin = self._grid_origin(scroll_y)
+        view_state = (scroll_y, view_height, origin)
+        if not force and view_state == self.last_view_state:
+            return None
+        self.last_view_state = view_state
+
+        first_row, last_row = self._visible_row_range(scroll_y - origin, view_height)
+        with profile_section('VirtualCardGrid.show_rows'):
+            self._show_rows(first_row, last_row, force)
+        return None
+
+    def _grid_origin(self, scroll_y):
+        """Get the grid's top offset inside the scrolled main window"""
+        if dpg.is_item_visible(self.parent_group):
+            group_y = dpg.get_item_rect_min(self.parent_group)[1]
+            window_y = dpg.get_item_rect_min(UI_TAGS['main_window'])[1]
+            self.origin = group_y - window_y + scroll_y
+        return self.origin or 0
+
+    def _visible_row_range(self, top, view_height):
+        """Get the [first, last) rows overlapping the view, including overscan"""
+        if not self.rows:
+            return 0, 0
+        first_row = max(0, bisect.bisect_right(self.row_offsets, top) - 1 - VIRTUAL_GRID_OVERSCAN_ROWS)
+        last_row = bisect.bisect_left(self.row_offsets, top + view_height) + VIRTUAL_GRID_OVERSCAN_ROWS
+        return first_row, min(len(self.rows), last_row)
+
+    # ==================== ROW SLOT RECYCLING ====================
+
+    def _show_rows(self, first_row, last_row, force=False):
+        """Bind rows [first_row, last_row) to slots and resize the spacers"""
+        row_count = last_row - first_row
+        if len(self.slots) < row_count:
+            while len(self.slots) < row_count:
+                self._add_slot()
+            UIComponents.render_cache.reserve(len(self.slots) * self.cards_per_row)
+
+        if not force:
+            self._recycle_slots(first_row)
+        for position, slot in enumerate(self.slots):
+            row_index = first_row + position
+            if position >= row_count:
+                row_index = None
+            if force or self.slot_rows[position] != row_index:
+                self._bind_slot(slot, row_index)
+                self.slot_rows[position] = row_index
+
+        self.first_row = first_row
+        top_height = self.row_offsets[first_row] if first_row < len(self.rows) else self.total_height
+        bottom_height = self.total_height - (self.row_offsets[last_row] if last_row < len(self.rows) else self.total_height)
+        dpg.configure_item(self.top_spacer, height=int(top_height))
+        dpg.configure_item(self.bottom_spacer, height=int(bottom_height))
+
+    def _recycle_slots(self, first_row):
+        """Move slots that scrolled out of view to the other end of the pool"""
+        shift = first_row - self.first_row
+        if shift == 0 or abs(shift) >= len(self.slots):
+            return
+        if shift > 0:
+            for _ in range(shift):
+                slot = self.slots.pop(0)
+                self.slot_rows.pop(0)
+                dpg.move_item(slot['group'], parent=self.slot_container)
+                self.slots.append(slot)
+                self.slot_rows.append(UNBOUND_SLOT)
+        else:
+            for _ in range(-shift):
+                slot = self.slots.pop()
+                self.slot_rows.pop()
+                dpg.move_item(slot['group'], parent=self.slot_container, before=self.slots[0]['group'])
+                self.slots.insert(0, slot)
+                self.slot_rows.insert(0, UNBOUND_SLOT)
+
+    def _resize_card_slots(self, cards_per_row):
+        """Add or remove card widgets in every row slot to match cards_per_row"""
+        for slot in self.slots:
+            cards = slot['cards']
+            while len(cards) < cards_per_row:
+                cards.append(UIComponents.create_card_slot(slot['row_group'], add_leading_spacer=bool(cards)))
+            while len(cards) > cards_per_row:
+                UIComponents.delete_card_slot(cards.pop())
+        self.cards_per_row = cards_per_row
+        UIComponents.render_cache.reserve(len(self.slots) * cards_per_row)
+
+    def _add_slot(self):
+        """Create a row slot able to show either a category header or a card row"""
+        slot_group = dpg.add_group(parent=self.slot_container)
+        slot = {
+            'group': slot_group,
+            'header_spacer': dpg.add_spacer(height=CATEGORY_SPACING, parent=slot_group),
+            'header_text': dpg.add_text("", parent=slot_group),
+            'row_group': dpg.add_group(horizontal=True, parent=slot_group)
+        }
+        slot['lead_spacer'] = dpg.add_spacer(width=0, parent=slot['row_group'])
+        slot['cards'] = [
+            UIComponents.create_card_slot(slot['row_group'], add_leading_spacer=(i > 0))
+            for i in range(self.cards_per_row)
+        ]
+        self.slots.append(slot)
+        self.slot_rows.append(UNBOUND_SLOT)
+
+    def _bind_slot(self, slot, row_index):
+        """Show the given row in a slot, or hide the slot when row_index is None"""
+        if row_index is None:
+            dpg.configure_item(slot['group'], show=False)
+            return
+
+        kind, payload = self.rows[row_index]
+        dpg.configure_item(slot['group'], show=True)
+        is_header = kind == HEADER_ROW
+        dpg.configure_item(slot['header_spacer'], show=is_header)
+        dpg.configure_item(slot['header_text'], show=is_header)
+        dpg.configure_item(slot['row_group'], show=not is_header)
+        if is_header:
+            dpg.set_value(slot['header_text'], payload)
+            return
+
+        row_width = len(payload) * CARD_WIDTH + (len(payload) - 1) * CARD_ROW_SPACING
+        dpg.configure_item(slot['lead_spacer'], width=int(max(0, (self.available_width - row_width) // 2)))
+        for i, card_slot in enumerate(slot['cards']):
+            UIComponents.bind_card_slot(card_slot, payload[i] if i < len(payload) else None, self.data_manager)
@@ -0,0 +1,71 @@
+"""
+Loadout optimizer scaling benchmark.
+
+Grows the real catalogs into synthetic ones (see synthetic.py), then times LoadoutOptimizer.optimize on a few
+level / budget / score scenarios. The "combinations" column is the size of
+the cross product a brute-force search would have to walk.
+
+Run from the repository root:
+    python benchmarks/loadout_benchmark.py [scale ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import *
+from compatibility import CompatibilityIndex
+from data_manager import DataManager
+from equipment_store import EquipmentStore
+from loadout_optimizer import LoadoutOptimizer
+from synthetic import synthetic_items
+
+DEFAULT_SCALES = [1, 2, 4, 8, 16]
+SCENARIOS = [
+    (20, {'CC': 5000}, 'max_drag'),
+    (40, {'CC': 30000, 'BC': 100}, 'balanced'),
+    (80, {'CC': 1000000, 'BC': 10000, 'CT': 10000}, 'lure_range'),
+]
+
+
+def build_stores(data_manager, scale):
+    """Build synthetic stores `scale` times the size of the real catalogs"""
+    sources = {
+        'rod': (data_manager.rod_store, ROD_GROUP_FIELDS),
+        'reel': (data_manager.reel_store, REEL_GROUP_FIELDS),
+        'line': (data_manager.line_store, LINE_GROUP_FIELDS),
+        'leader': (data_manager.leader_store, LEADER_GROUP_FIELDS),
+        'hook': (data_manager.hook_store, HOOK_GROUP_FIELDS),
+    }
+    return {
+        slot: EquipmentStore(synthetic_items(store.items, len(store) * scale, seed=scale), group_fields)
+        for slot, (store, group_fields) in sources.items()
+    }
+
+
+def main(scales):
+    data_manager = DataManager()
+    print(f"{'scale':>5} {'items':>7} {'index ms':>9} {'scenario':>10} {'combinations':>14} {'optimize ms':>12} {'score':>8}")
+
+    for scale in scales:
+        stores = build_stores(data_manager, scale)
+        start = time.perf_counter()
+        compatibility = CompatibilityIndex(stores['rod'], stores['reel'], stores['line'])
+        index_ms = (time.perf_counter() - start) * 1000
+        optimizer = LoadoutOptimizer(stores, compatibility)
+        item_count = sum(len(store) for store in stores.values())
+
+        for level, budgets, score in SCENARIOS:
+            combinations = 1
+            for slot in LOADOUT_SLOTS:
+                combinations *= len(optimizer._candidates(slot, level, budgets, {}))
+            start = time.perf_counter()
+            loadout = optimizer.optimize(level, budgets, score)
+            optimize_ms = (time.perf_counter() - start) * 1000
+            best = f"{loadout['score']:.2f}" if loadout else '-'
+            print(f"{scale:>5} {item_count:>7} {index_ms:>9.1f} {score:>10} {combinations:>14.2e} {optimize_ms:>12.1f} {best:>8}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SCALES)
@@ -0,0 +1,187 @@
+"""
+Headless benchmark suite for the data and layout hot paths.
+
+Generates synthetic rod and reel catalogs in the processed JSON schema (see
+synthetic.py) and times, for every catalog size:
+
+- load_json / load_snapshot: DataManager loading from JSON and from a snapshot
+- search_rods / search_reels: cold searches (result cache cleared) for SEARCH_QUERIES,
+  filtered and grouped by category
+- value_sort_rods / value_sort_reels: the "Best value" ordering re-scored for a new
+  slider weight over the whole catalog, then grouped by category
+- group_data_into_rows: UICardLayout row grouping over every rod
+- create_cards / bind_card_slots: CARD_COUNT cards against DearPyGui's headless context
+
+Results are compared with the baseline file and timings that regressed by
+more than REGRESSION_RATIO are reported.
+
+Run from the repository root:
+    python benchmarks/run_benchmarks.py [--sizes 1000 1000000] [--save-baseline] [--check]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import *
+from data_manager import DataManager
+from synthetic import write_synthetic_catalog
+from value_scoring import VALUE_SCORING_AVAILABLE
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_REPEAT = 3
+SEARCH_QUERIES = ['magfin', 'spin', 'club-series 280', 'level<=20 price<5000cc']
+CARD_COUNT = 200
+CARDS_PER_ROW = 3
+REGRESSION_RATIO = 1.3
+REGRESSION_FLOOR_MS = 1.0
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def best_time(func, repeat):
+    """Return the best wall time of func over `repeat` runs, in milliseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load_catalogs(rods_path, reels_path, snapshot_dir):
+    """Build a DataManager and force both catalogs to load"""
+    data_manager = DataManager(rods_path, reels_path, snapshot_dir)
+    data_manager.rod_store
+    data_manager.reel_store
+    return data_manager
+
+
+def cold_search(data_manager, name):
+    """Run every benchmark query on a catalog with the search caches cleared"""
+    catalog = data_manager.catalogs.get(name)
+    for query in SEARCH_QUERIES:
+        catalog['search_index'].result_cache.clear()
+        catalog['fuzzy_index'].term_cache.clear()
+        data_manager.search(name, query)
+
+
+def value_resort(data_manager, name):
+    """Re-score the best value ordering for a new slider weight and group it by category"""
+    data_manager.value_weight = VALUE_WEIGHT_MAX - data_manager.value_weight
+    data_manager.get_by_category(name, (VALUE_SORT_COLUMN, True))
+
+
+def bench_data(size, work_dir, repeat):
+    """Time loading and searching for a catalog of `size` rods and reels"""
+    rods_path = write_synthetic_catalog(PROCESSED_RODS_PATH, os.path.join(work_dir, 'rods.json'), size)
+    reels_path = write_synthetic_catalog(PROCESSED_REELS_PATH, os.path.join(work_dir, 'reels.json'), size)
+    results = {}
+
+    def load_json():
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            load_catalogs(rods_path, reels_path, snapshot_dir)
+    results['load_json'] = best_time(load_json, repeat)
+
+    snapshot_dir = os.path.join(work_dir, 'snapshots')
+    load_catalogs(rods_path, reels_path, snapshot_dir)
+    results['load_snapshot'] = best_time(lambda: load_catalogs(rods_path, reels_path, snapshot_dir), repeat)
+
+    data_manager = load_catalogs(rods_path, reels_path, snapshot_dir)
+    results['search_rods'] = best_time(lambda: cold_search(data_manager, 'rods'), repeat)
+    results['search_reels'] = best_time(lambda: cold_search(data_manager, 'reels'), repeat)
+    if VALUE_SCORING_AVAILABLE:
+        results['value_sort_rods'] = best_time(lambda: value_resort(data_manager, 'rods'), repeat)
+        results['value_sort_reels'] = best_time(lambda: value_resort(data_manager, 'reels'), repeat)
+    return data_manager, results
+
+
+def bench_layout(data_manager, repeat):
+    """Time row grouping and card construction in a headless DearPyGui context"""
+    try:
+        import dearpygui.dearpygui as dpg
+        from UI.ui_card_layout import UICardLayout
+        from UI.ui_components import UIComponents
+    except ImportError:
+        return {}
+
+    results = {}
+    rods = list(data_manager.rod_store.items)
+    card_layout = UICardLayout(data_manager)
+    results['group_data_into_rows'] = best_time(lambda: card_layout.group_data_into_rows(rods, CARDS_PER_ROW), repeat)
+
+    cards = rods[:CARD_COUNT]
+    dpg.create_context()
+    try:
+        def create_cards():
+            with dpg.window() as window:
+                for item in cards:
+                    UIComponents._create_card(item, data_manager)
+            dpg.delete_item(window)
+        results['create_cards'] = best_time(create_cards, repeat)
+
+        with dpg.window():
+            slots = [UIComponents.create_card_slot(dpg.last_container()) for _ in range(CARDS_PER_ROW)]
+
+        def bind_card_slots():
+            for index, item in enumerate(cards):
+                UIComponents.bind_card_slot(slots[index % len(slots)], item, data_manager)
+        results['bind_card_slots'] = best_time(bind_card_slots, repeat)
+    finally:
+        dpg.destroy_context()
+    return results
+
+
+def compare(results, baseline):
+    """Return (key, baseline ms, current ms) for every timing that regressed"""
+    regressions = []
+    for size, timings in results.items():
+        for name, current in timings.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous is None:
+                continue
+            if current > previous * REGRESSION_RATIO and current - previous > REGRESSION_FLOOR_MS:
+                regressions.append((f"{size}/{name}", previous, current))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the data and layout hot paths")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="catalog sizes (rods and reels each)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="runs per timing; the best is kept")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline file to compare with or save to")
+    parser.add_argument('--save-baseline', action='store_true', help="save these results as the new baseline")
+    parser.add_argument('--check', action='store_true', help="exit with status 1 when a timing regressed")
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as work_dir:
+            data_manager, timings = bench_data(size, work_dir, args.repeat)
+            timings.update(bench_layout(data_manager, args.repeat))
+        results[str(size)] = timings
+        for name, elapsed in timings.items():
+            print(f"{size:>8} {name:<24} {elapsed:>10.2f} ms")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file).get('results', {})
+    regressions = compare(results, baseline)
+    for key, previous, current in regressions:
+        print(f"REGRESSION {key}: {previous:.2f} ms -> {current:.2f} ms")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump({'python': sys.version.split()[0], 'results': results}, file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Synthetic catalogs for the benchmarks.
+
+Items are copies of real catalog items used as templates, with a unique
+name and a jittered price and level, so they keep the processed JSON schema
+and realistic field values at any size.
+"""
+import json
+import random
+
+from equipment_store import parse_price
+
+
+def synthetic_items(templates, count, seed=0):
+    """Return `count` items cycled from the templates with unique names and jittered price and level"""
+    rng = random.Random(seed)
+    items = []
+    for index in range(count):
+        template = templates[index % len(templates)]
+        item = dict(template)
+        if 'name' in template:
+            item['name'] = f"{template['name']} #{index}"
+        amount, currency = parse_price(template.get('price', ''))
+        if currency is not None and amount == amount:
+            item['price'] = f"{int(amount * rng.uniform(0.8, 1.2))} {currency}"
+        if isinstance(template.get('level'), (int, float)):
+            item['level'] = max(1, template['level'] + rng.randint(-2, 2))
+        items.append(item)
+    return items
+
+
+def write_synthetic_catalog(template_path, output_path, count, seed=0):
+    """Write a synthetic catalog of `count` items built from the catalog at template_path"""
+    with open(template_path, 'r') as file:
+        templates = json.load(file)
+    with open(output_path, 'w') as file:
+        json.dump(synthetic_items(templates, count, seed), file)
+    return output_path
@@ -0,0 +1,73 @@
+import threading
+import time
+
+
+class CatalogRegistry:
+    """
+    Registry of lazily loaded equipment catalogs.
+
+    Each catalog is registered with a loader and is only loaded the first
+    time it is requested. Loading is guarded per catalog, so a catalog that
+    is being prefetched on a background thread is simply waited for when the
+    UI asks for it, and is never loaded twice.
+    """
+
+    def __init__(self):
+        self.loaders = {}
+        self.catalogs = {}
+        self.load_times = {}
+        self.locks = {}
+        self.prefetch_thread = None
+
+    def register(self, name, loader):
+        """Register a catalog loader under the given name"""
+        self.loaders[name] = loader
+        self.locks[name] = threading.Lock()
+        self.catalogs.pop(name, None)
+
+    def names(self):
+        """Return the names of every registered catalog"""
+        return list(self.loaders)
+
+    def is_loaded(self, name):
+        """Check whether a catalog has already been loaded"""
+        return name in self.catalogs
+
+    def get(self, name):
+        """Return a catalog, loading it first if needed"""
+        catalog = self.catalogs.get(name)
+        if catalog is not None:
+            return catalog
+
+        with self.locks[name]:
+            if name not in self.catalogs:
+                load_start = time.perf_counter()
+                self.catalogs[name] = self.loaders[name]()
+                self.load_times[name] = time.perf_counter() - load_start
+        return self.catalogs[name]
+
+    def replace(self, name, catalog):
+        """Swap in a rebuilt catalog; callers still holding the old one keep a consistent copy"""
+        with self.locks[name]:
+            self.catalogs[name] = catalog
+
+    def invalidate(self, name=None):
+        """Drop a loaded catalog, or all of them, so the next access reloads it"""
+        for catalog_name in self.names():
+            if name is None or catalog_name == name:
+                with self.locks[catalog_name]:
+                    self.catalogs.pop(catalog_name, None)
+
+    def prefetch(self, names=None):
+        """Load catalogs that are not loaded yet on a background thread"""
+        pending = [name for name in (names or self.names()) if not self.is_loaded(name)]
+        if not pending:
+            return None
+
+        def load_pending():
+            for name in pending:
+                self.get(name)
+
+        self.prefetch_thread = threading.Thread(target=load_pending, name="catalog-prefetch", daemon=True)
+        self.prefetch_thread.start()
+        return self.prefetch_thread
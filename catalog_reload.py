@@ -0,0 +1,103 @@
+import os
+from catalog_snapshot import file_hash
+
+
+def item_key(item, key_fields):
+    """Return the stable identity of a catalog item"""
+    return tuple(item.get(field) for field in key_fields)
+
+
+class CatalogDiff:
+    """
+    Differences between a loaded catalog and a newly parsed version of it.
+
+    `changed` holds (index, old item, new item) for items whose stable key is
+    unchanged but whose fields differ, `removed` holds (index, old item) and
+    `added` the new items that did not exist before. Indices refer to the
+    loaded catalog before the diff is applied.
+    """
+
+    __slots__ = ('added', 'removed', 'changed')
+
+    def __init__(self, added=None, removed=None, changed=None):
+        self.added = list(added or [])
+        self.removed = list(removed or [])
+        self.changed = list(changed or [])
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"CatalogDiff(added={len(self.added)}, removed={len(self.removed)}, changed={len(self.changed)})"
+
+
+def diff_items(old_items, new_items, key_fields):
+    """Diff two item lists by stable key; repeated keys are paired up in file order"""
+    old_by_key = {}
+    for index, item in enumerate(old_items):
+        old_by_key.setdefault(item_key(item, key_fields), []).append(index)
+
+    diff = CatalogDiff()
+    for item in new_items:
+        old_indices = old_by_key.get(item_key(item, key_fields))
+        if not old_indices:
+            diff.added.append(item)
+            continue
+        index = old_indices.pop(0)
+        if old_items[index] != item:
+            diff.changed.append((index, old_items[index], item))
+
+    for old_indices in old_by_key.values():
+        diff.removed.extend((index, old_items[index]) for index in old_indices)
+    diff.removed.sort(key=lambda removed: removed[0])
+    return diff
+
+
+class CatalogWatcher:
+    """
+    Polling watcher for catalog source files.
+
+    Each watched file is recorded with its mtime, size and content hash.
+    A poll only stats the files; the hash is read again when the stat
+    changed, so saving a file without changing its contents is ignored.
+    """
+
+    def __init__(self):
+        self.watched = {}
+
+    def watch(self, name, paths):
+        """Start (or restart) watching a catalog's source files"""
+        self.watched[name] = {path: self._fingerprint(path) for path in paths}
+
+    def unwatch(self, name):
+        """Stop watching a catalog"""
+        self.watched.pop(name, None)
+
+    def poll(self):
+        """Return the names of catalogs whose source files changed since the last poll"""
+        changed = []
+        # Iterate over copies: catalogs start being watched from the prefetch thread
+        for name, sources in list(self.watched.items()):
+            for path, recorded in list(sources.items()):
+                stat = self._stat(path)
+                if stat == recorded[:2]:
+                    continue
+                fingerprint = self._fingerprint(path)
+                sources[path] = fingerprint
+                if fingerprint[2] != recorded[2]:
+                    changed.append(name)
+        return list(dict.fromkeys(changed))
+
+    @staticmethod
+    def _stat(path):
+        """Return (mtime_ns, size) of a file, or (None, None) if it is missing"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _fingerprint(self, path):
+        """Return (mtime_ns, size, sha1) of a file"""
+        mtime_ns, size = self._stat(path)
+        return mtime_ns, size, file_hash(path) if mtime_ns is not None else None
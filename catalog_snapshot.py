@@ -0,0 +1,113 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from config import SNAPSHOT_CACHE_DIR, SNAPSHOT_ENABLED, SNAPSHOT_FORMAT_VERSION, SNAPSHOT_ERROR_MESSAGE
+
+
+def file_hash(file_path):
+    """Return the SHA-1 hex digest of a file's contents"""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(file_path):
+    """Return the path, mtime, size and content hash identifying a source file"""
+    stat = os.stat(file_path)
+    return {
+        'path': file_path,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha1': file_hash(file_path)
+    }
+
+
+class CatalogSnapshot:
+    """
+    Binary on-disk snapshot of an already parsed and grouped catalog.
+
+    The snapshot is a pickle of the catalog objects together with the
+    fingerprints of the JSON files it was built from. A snapshot is reused
+    while every source file keeps its mtime and size; when those change, the
+    content hash decides, so touching a file does not force a rebuild.
+    """
+
+    def __init__(self, name, source_paths, cache_dir=SNAPSHOT_CACHE_DIR):
+        self.name = name
+        self.source_paths = list(source_paths)
+        self.snapshot_path = os.path.join(cache_dir, f"{name}.snapshot.pickle")
+
+    def load(self):
+        """Return the cached catalog, or None if it is missing or stale"""
+        if not SNAPSHOT_ENABLED or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, 'rb') as file:
+                snapshot = pickle.load(file)
+        except Exception as e:
+            print(SNAPSHOT_ERROR_MESSAGE.format(self.name, e))
+            return None
+
+        if snapshot.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            return None
+        touched = self._touched_sources(snapshot.get('sources', []))
+        if touched is None:
+            return None
+        if touched:
+            # Record the new stat of files touched without changing, so later launches skip hashing them
+            for source, stat in touched:
+                source['mtime_ns'] = stat.st_mtime_ns
+                source['size'] = stat.st_size
+            self._write(snapshot)
+        return snapshot['catalog']
+
+    def save(self, catalog):
+        """Atomically write the catalog and its source fingerprints to disk"""
+        if not SNAPSHOT_ENABLED:
+            return
+        self._write({
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'sources': [source_fingerprint(path) for path in self.source_paths],
+            'catalog': catalog
+        })
+
+    def _write(self, snapshot):
+        """Write a snapshot through a temporary file, removing it if the write fails"""
+        temp_path = None
+        try:
+            cache_dir = os.path.dirname(self.snapshot_path)
+            os.makedirs(cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile('wb', dir=cache_dir, delete=False) as file:
+                temp_path = file.name
+                pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.snapshot_path)
+        except Exception as e:
+            print(SNAPSHOT_ERROR_MESSAGE.format(self.name, e))
+            if temp_path is not None and os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def _touched_sources(self, sources):
+        """
+        Check the recorded fingerprints against the source files.
+
+        Returns None when a source changed, otherwise the (fingerprint, stat)
+        pairs of sources whose mtime or size moved while their content hash
+        still matches.
+        """
+        if [source['path'] for source in sources] != self.source_paths:
+            return None
+        touched = []
+        for source in sources:
+            try:
+                stat = os.stat(source['path'])
+            except OSError:
+                return None
+            if stat.st_mtime_ns == source['mtime_ns'] and stat.st_size == source['size']:
+                continue
+            if file_hash(source['path']) != source['sha1']:
+                return None
+            touched.append((source, stat))
+        return touched
@@ -0,0 +1,158 @@
+import bisect
+import math
+from array import array
+from config import ROD_CATEGORY_REEL_TYPES, ANY_REEL_TYPE
+
+
+def rod_reel_type(category):
+    """Return the reel type a rod category takes, or ANY_REEL_TYPE when unrestricted"""
+    for category_marker, reel_type in ROD_CATEGORY_REEL_TYPES.items():
+        if category_marker in category:
+            return reel_type
+    return ANY_REEL_TYPE
+
+
+def _sorted_by_column(indices, column):
+    """Return (sorted values, indices) for the given indices, skipping missing values"""
+    order = sorted((index for index in indices if not math.isnan(column[index])), key=column.__getitem__)
+    return array('d', (column[index] for index in order)), array('I', order)
+
+
+class CompatibilityIndex:
+    """
+    Precomputed rod / reel / line compatibility joins.
+
+    A reel fits a rod when its reel type is the one the rod category takes
+    (e.g. "SpinningReel&Bobber" -> Spinning) and its max drag reaches the
+    rod's minimum line weight. A line fits a rod when its carry weight lies
+    inside the rod's line weight range. Reels are kept sorted by max drag per
+    reel type and lines by carry weight, so every rod's compatible gear is a
+    contiguous slice whose bounds are found by bisect at build time. Reverse
+    lookups (rods for a reel or a line) are precomputed the same way, using a
+    sweep over sorted interval endpoints for the line weight ranges. Every
+    lookup afterwards is a constant-time slice.
+    """
+
+    def __init__(self, rod_store, reel_store, line_store):
+        self.rod_store = rod_store
+        self.reel_store = reel_store
+        self.line_store = line_store
+        self.rod_reel_slices = array('I')
+        self.rod_line_slices = []
+        self.reel_rod_slices = []
+        self.line_rods = []
+        self._build_reel_joins()
+        self._build_line_joins()
+
+    # ==================== BUILD ====================
+
+    def _build_reel_joins(self):
+        """Join rods and reels on reel type and drag versus minimum line weight"""
+        max_drag = self.reel_store.column('max_drag')
+        line_weight_min = self.rod_store.column('line_weight_min')
+        reel_types = self.reel_store.groups['reeltype']
+
+        # Reels sorted by max drag, per reel type and across all types
+        self.reels_by_drag = {
+            reel_type: _sorted_by_column(indices, max_drag) for reel_type, indices in reel_types.items()
+        }
+        self.reels_by_drag[ANY_REEL_TYPE] = _sorted_by_column(range(len(self.reel_store)), max_drag)
+
+        # Rods sorted by minimum line weight, per reel type they take
+        self.rod_reel_types = [rod_reel_type(rod.get('category', '')) for rod in self.rod_store.items]
+        rods_by_reel_type = {}
+        for rod_index, reel_type in enumerate(self.rod_reel_types):
+            rods_by_reel_type.setdefault(reel_type, []).append(rod_index)
+        self.rods_by_min_weight = {
+            reel_type: _sorted_by_column(indices, line_weight_min) for reel_type, indices in rods_by_reel_type.items()
+        }
+
+        # Rod -> first reel (by drag) strong enough; the slice runs to the end
+        for rod_index, reel_type in enumerate(self.rod_reel_types):
+            drags, _ = self.reels_by_drag.get(reel_type, (array('d'), array('I')))
+            minimum = line_weight_min[rod_index]
+            self.rod_reel_slices.append(len(drags) if math.isnan(minimum) else bisect.bisect_left(drags, minimum))
+
+        # Reel -> rods taking its type (or any type) whose minimum line weight it reaches
+        for reel in range(len(self.reel_store)):
+            slices = []
+            for reel_type in (self.reel_store.items[reel].get('reeltype'), ANY_REEL_TYPE):
+                weights, _ = self.rods_by_min_weight.get(reel_type, (array('d'), array('I')))
+                drag = max_drag[reel]
+                slices.append((reel_type, 0 if math.isnan(drag) else bisect.bisect_right(weights, drag)))
+            self.reel_rod_slices.append(slices)
+
+    def _build_line_joins(self):
+        """Join rods and lines on carry weight inside the rod's line weight range"""
+        carry_weight = self.line_store.column('carry_weight')
+        line_weight_min = self.rod_store.column('line_weight_min')
+        line_weight_max = self.rod_store.column('line_weight_max')
+        self.lines_by_weight = _sorted_by_column(range(len(self.line_store)), carry_weight)
+        weights, line_order = self.lines_by_weight
+
+        # Rod -> [start, end) slice of lines sorted by carry weight
+        for rod_index in range(len(self.rod_store)):
+            low, high = line_weight_min[rod_index], line_weight_max[rod_index]
+            if math.isnan(low) or math.isnan(high):
+                self.rod_line_slices.append((0, 0))
+                continue
+            self.rod_line_slices.append((bisect.bisect_left(weights, low), bisect.bisect_right(weights, high)))
+
+        # Line -> rods whose range covers it, by sweeping sorted interval endpoints
+        starts = _sorted_by_column(range(len(self.rod_store)), line_weight_min)
+        ends = _sorted_by_column(range(len(self.rod_store)), line_weight_max)
+        active = set()
+        start_position = end_position = 0
+        self.line_rods = [array('I') for _ in range(len(self.line_store))]
+        for weight, line_index in zip(weights, line_order):
+            while start_position < len(starts[0]) and starts[0][start_position] <= weight:
+                active.add(starts[1][start_position])
+                start_position += 1
+            while end_position < len(ends[0]) and ends[0][end_position] < weight:
+                active.discard(ends[1][end_position])
+                end_position += 1
+            self.line_rods[line_index] = array('I', sorted(active))
+
+    # ==================== LOOKUPS ====================
+
+    def reel_fits_rod(self, reel_index, rod_index):
+        """Check a single rod / reel pair against the join rule"""
+        reel_type = self.rod_reel_types[rod_index]
+        if reel_type != ANY_REEL_TYPE and self.reel_store.items[reel_index].get('reeltype') != reel_type:
+            return False
+        return self.reel_store.value('max_drag', reel_index) >= self.rod_store.value('line_weight_min', rod_index)
+
+    def reels_for_rod(self, rod_index):
+        """Return the reels that fit a rod, weakest drag first"""
+        _, order = self.reels_by_drag.get(self.rod_reel_types[rod_index], (array('d'), array('I')))
+        return self.reel_store.view(order[self.rod_reel_slices[rod_index]:])
+
+    def lines_for_rod(self, rod_index):
+        """Return the lines that fit a rod, lightest first"""
+        start, end = self.rod_line_slices[rod_index]
+        return self.line_store.view(self.lines_by_weight[1][start:end])
+
+    def rods_for_reel(self, reel_index):
+        """Return the rods a reel fits, as views per reel type the rods take"""
+        views = []
+        for reel_type, end in self.reel_rod_slices[reel_index]:
+            _, order = self.rods_by_min_weight.get(reel_type, (array('d'), array('I')))
+            views.append(self.rod_store.view(order[:end]))
+        return views
+
+    def rods_for_line(self, line_index):
+        """Return the rods whose line weight range covers a line"""
+        return self.rod_store.view(self.line_rods[line_index])
+
+    def compatible_gear(self, item, equipment_type):
+        """Return {gear kind: items} compatible with an item of the given catalog; {} for other catalogs"""
+        # Chosen by catalog rather than by the item's fields: leaders have a 'linetype' too
+        if equipment_type == 'rods':
+            rod_index = self.rod_store.index_of(item)
+            return {'reels': self.reels_for_rod(rod_index), 'lines': self.lines_for_rod(rod_index)}
+        if equipment_type == 'reels':
+            rods = [rod for view in self.rods_for_reel(self.reel_store.index_of(item)) for rod in view]
+            return {'rods': rods}
+        if equipment_type == 'lines':
+            return {'rods': self.rods_for_line(self.line_store.index_of(item))}
+        return {}
@@ -14,6 +14,8 @@ SEARCH_INPUT_WIDTH = 400
 SEARCH_INPUT_HEIGHT = 40
 SEARCH_BUTTON_WIDTH = 100
 SEARCH_BUTTON_HEIGHT = 20
+SORT_COMBO_WIDTH = 180
+VALUE_WEIGHT_SLIDER_WIDTH = 140
 
 CARD_WIDTH = 300
 CARD_HEIGHT = 200
@@ -31,17 +33,79 @@ UI_TAGS = {
     'reels_button': "Reels Button",
     'search_input': "search_input",
     'search_button': "Search Button",
+    'sort_combo': "sort_combo",
+    'value_weight_slider': "value_weight_slider",
     'nav_group': "nav_group",
+    'nav_left_spacer': "nav_left_spacer",
+    'nav_right_spacer': "nav_right_spacer",
+    'search_left_spacer': "search_left_spacer",
+    'search_right_spacer': "search_right_spacer",
     'fish_group': "fish_group",
     'lakes_group': "lakes_group",
     'rods_group': "rods_group",
-    'reels_group': "reels_group"
+    'reels_group': "reels_group",
+    'compatibility_window': "compatibility_window",
+    'comparison_window': "comparison_window",
+    'comparison_status': "comparison_status",
+    'comparison_table': "comparison_table",
+    'profiler_window': "profiler_window"
 }
 
 # Processed data paths
 PROCESSED_RODS_PATH = 'ProcessedData/processed_rods.json'
 PROCESSED_REELS_PATH = 'ProcessedData/processed_reels.json'
 
+# Shop catalog folders
+LINES_SHOP_DIR = 'ProcessedData/lines_shop_TBP'
+LEADERS_SHOP_DIR = 'ProcessedData/leaders_shop_TBP'
+HOOKS_SHOP_DIR = 'ProcessedData/hooks_shop_TBP'
+
+# Catalog files of one type are read and parsed on a thread pool
+CATALOG_LOAD_WORKERS = 4
+
+# Catalog snapshot cache
+SNAPSHOT_ENABLED = True
+SNAPSHOT_CACHE_DIR = '.cache'
+SNAPSHOT_FORMAT_VERSION = 9
+
+# Raw game dump ingest (BackupJsonDev -> processed_rods.json)
+RAW_RODS_DIR = 'BackupJsonDev'
+INGEST_MANIFEST_PATH = os.path.join(SNAPSHOT_CACHE_DIR, 'ingest_manifest.json')
+INGEST_FORMAT_VERSION = 1
+INGEST_WORKERS = None
+INGEST_ROD_TYPE_ORDER = ['match', 'casting', 'telescopic', 'spinning', 'carp', 'bottom', 'feeder', 'spot']
+RAW_PRICE_FIELDS = [('creditsCost', 'CC'), ('baitcoinsCost', 'BC'), ('clubTokensCost', 'CT')]
+RAW_REEL_FLAGS = [('canUseSpinningReel', 'SpinningReel'), ('canUseCastingReel', 'CastingReel')]
+RAW_RIG_FLAGS = [('canUseLure', 'Lure'), ('canUseBobber', 'Bobber')]
+DEFAULT_RIG = 'Sinker'
+OTHER_ROD_CATEGORY = 'Other'
+BRAND_ALIASES = {'UL-Chumber': 'UL-Chuber'}
+
+# Hot reload of catalog files edited while the app is running
+HOT_RELOAD_ENABLED = True
+HOT_RELOAD_POLL_SECONDS = 1.0
+HOT_RELOAD_TASK_KEY = 'hot_reload'
+
+# Stable identity of catalog items, used to diff a reloaded catalog
+CATALOG_KEY_FIELDS = {
+    'rods': ['name'],
+    'reels': ['name'],
+    'lines': ['brand', 'linetype', 'diameter', 'lenght'],
+    'leaders': ['brand', 'linetype', 'diameter', 'lenght'],
+    'hooks': ['brand', 'hooktype', 'category', 'size']
+}
+
+# Headless query server (python main.py --serve): catalogs stay loaded and answer JSON queries over localhost HTTP
+QUERY_SERVER_HOST = '127.0.0.1'
+QUERY_SERVER_PORT = 8765
+QUERY_SERVER_CACHE_SIZE = 4096
+QUERY_SERVER_DEFAULT_LIMIT = 100
+QUERY_SERVER_MAX_BATCH = 1000
+
+# Lazy catalog loading
+PREFETCH_CATALOGS = True
+PREFETCH_FRAME = 2
+
 # WIP data paths
 FISH_DATA_PATH = 'ProcessedData/fish............'
 LAKE_DATA_PATH = 'ProcessedData/lake............'
@@ -54,37 +118,309 @@ SECONDARY_ROD_FIELDS = ['rodtype', 'brand', 'length']
 PRIMARY_REEL_FIELDS = ['name', 'price', 'level', 'recovery', 'maxDrag']
 SECONDARY_REEL_FIELDS = ['reeltype', 'brand']
 
+# Equipment store definitions
+CURRENCIES = ['CC', 'BC', 'CT']
+ROD_GROUP_FIELDS = ['rodtype', 'category', 'brand']
+REEL_GROUP_FIELDS = ['reeltype', 'category', 'brand']
+LINE_GROUP_FIELDS = ['linetype', 'brand']
+LEADER_GROUP_FIELDS = ['linetype', 'brand']
+HOOK_GROUP_FIELDS = ['hooktype', 'category', 'brand']
+
+# Numeric field parsing: field -> (kind, column names)
+NUMERIC_FIELD_COLUMNS = {
+    'price': ('price', ['price']),
+    'level': ('number', ['level']),
+    'lineWeight': ('range', ['line_weight_min', 'line_weight_max']),
+    'lureWeight': ('range', ['lure_weight_min', 'lure_weight_max']),
+    'castingWeight': ('range', ['casting_weight_min', 'casting_weight_max']),
+    'length': ('number', ['length']),
+    'recovery': ('number', ['recovery']),
+    'maxDrag': ('number', ['max_drag']),
+    'carryweight': ('number', ['carry_weight']),
+    'diameter': ('number', ['diameter']),
+    'lenght': ('number', ['line_length']),
+    'quantity': ('number', ['quantity'])
+}
+
+# Line field definitions
+PRIMARY_LINE_FIELDS = ['brand', 'price', 'level', 'carryweight', 'diameter']
+SECONDARY_LINE_FIELDS = ['linetype', 'lenght']
+
+# Leader and hook field definitions
+PRIMARY_LEADER_FIELDS = ['brand', 'price', 'level', 'carryweight', 'diameter']
+SECONDARY_LEADER_FIELDS = ['linetype', 'lenght', 'quantity']
+PRIMARY_HOOK_FIELDS = ['brand', 'price', 'level', 'size']
+SECONDARY_HOOK_FIELDS = ['hooktype', 'category', 'quantity']
+
+# Equipment types: catalog name -> source file or shop folder, type and category fields, card fields
+# Every type gets the same store, search index, query engine and category grouping
+EQUIPMENT_TYPES = {
+    'rods': {
+        'source': PROCESSED_RODS_PATH,
+        'type_field': 'rodtype',
+        'category_field': 'category',
+        'group_fields': ROD_GROUP_FIELDS,
+        'primary_fields': PRIMARY_ROD_FIELDS,
+        'secondary_fields': SECONDARY_ROD_FIELDS
+    },
+    'reels': {
+        'source': PROCESSED_REELS_PATH,
+        'type_field': 'reeltype',
+        'category_field': 'category',
+        'group_fields': REEL_GROUP_FIELDS,
+        'primary_fields': PRIMARY_REEL_FIELDS,
+        'secondary_fields': SECONDARY_REEL_FIELDS
+    },
+    'lines': {
+        'source': LINES_SHOP_DIR,
+        'type_field': 'linetype',
+        'category_field': 'linetype',
+        'group_fields': LINE_GROUP_FIELDS,
+        'primary_fields': PRIMARY_LINE_FIELDS,
+        'secondary_fields': SECONDARY_LINE_FIELDS
+    },
+    'leaders': {
+        'source': LEADERS_SHOP_DIR,
+        'type_field': 'linetype',
+        'category_field': 'linetype',
+        'group_fields': LEADER_GROUP_FIELDS,
+        'primary_fields': PRIMARY_LEADER_FIELDS,
+        'secondary_fields': SECONDARY_LEADER_FIELDS
+    },
+    'hooks': {
+        'source': HOOKS_SHOP_DIR,
+        'type_field': 'hooktype',
+        'category_field': 'category',
+        'group_fields': HOOK_GROUP_FIELDS,
+        'primary_fields': PRIMARY_HOOK_FIELDS,
+        'secondary_fields': SECONDARY_HOOK_FIELDS
+    }
+}
+
+# Loadout optimizer scores: preset -> {slot: {column: weight}}
+# A '<name>_span' column scores the width of a min-max field, e.g. lure weight (also usable in value scores)
+SPAN_SUFFIX = '_span'
+LOADOUT_SLOTS = ['rod', 'reel', 'line', 'leader', 'hook']
+LOADOUT_SCORES = {
+    'max_drag': {'reel': {'max_drag': 1.0}},
+    'carry_weight': {'line': {'carry_weight': 1.0}},
+    'lure_range': {'rod': {'lure_weight_span': 1.0}},
+    'balanced': {
+        'reel': {'max_drag': 1.0},
+        'line': {'carry_weight': 1.0},
+        'leader': {'carry_weight': 1.0},
+        'rod': {'lure_weight_span': 0.1}
+    }
+}
+DEFAULT_LOADOUT_SCORE = 'max_drag'
+
+# Result sorting: combo label -> (column, descending); None keeps catalog file order
+# Sort orders of SORT_COLUMNS are precomputed when a catalog is parsed
+SORT_COLUMNS = ['price', 'level', 'line_weight_max', 'max_drag', 'carry_weight']
+SORT_OPTIONS = {
+    'Catalog order': None,
+    'Price: low to high': ('price', False),
+    'Price: high to low': ('price', True),
+    'Level: low to high': ('level', False),
+    'Level: high to low': ('level', True),
+    'Line weight: high to low': ('line_weight_max', True),
+    'Drag: high to low': ('max_drag', True),
+    'Best value': ('value', True)
+}
+DEFAULT_SORT_OPTION = 'Catalog order'
+
+# Value-for-money scoring (needs numpy): equipment type -> score expression, evaluated over the whole catalog
+# Expressions combine parsed columns (see NUMERIC_FIELD_COLUMNS) with + - * / **, '<range>_span' for max - min,
+# 'price_cc' / 'price_bc' / 'price_ct' for the price of items sold in that currency and the functions
+# norm (scale to the median), log, sqrt, abs, min and max. Items scoring NaN or infinity rank last.
+# 'weight' is the value weight slider: 0 ranks by the stat alone, 1 by the stat per unit of price
+VALUE_SORT_COLUMN = 'value'
+VALUE_SCORES = {
+    'rods': '(norm(line_weight_span) + norm(lure_weight_span)) / price_cc ** weight',
+    'reels': '(norm(max_drag) + norm(recovery)) / price_cc ** weight',
+    'lines': 'carry_weight / price_cc ** weight',
+    'leaders': 'carry_weight / price_cc ** weight',
+    'hooks': 'quantity / price_cc ** weight'
+}
+VALUE_WEIGHT_MIN = 0.0
+VALUE_WEIGHT_MAX = 1.0
+DEFAULT_VALUE_WEIGHT = 1.0
+VALUE_WEIGHT_DEBOUNCE_SECONDS = 0.1
+VALUE_WEIGHT_TASK_KEY = "value_weight_resort"
+
+# Compatibility rules: rod category marker -> reel type it takes
+ROD_CATEGORY_REEL_TYPES = {
+    'SpinningReel': 'Spinning',
+    'CastingReel': 'Casting'
+}
+ANY_REEL_TYPE = '*'
+
+# Structured query fields: search-box name -> column, min-max column prefix or facet field
+QUERY_NUMERIC_FIELDS = {
+    'level': 'level',
+    'price': 'price',
+    'length': 'length',
+    'recovery': 'recovery',
+    'maxdrag': 'max_drag',
+    'drag': 'max_drag'
+}
+QUERY_RANGE_FIELDS = {
+    'lineweight': 'line_weight',
+    'line': 'line_weight',
+    'lureweight': 'lure_weight',
+    'lure': 'lure_weight',
+    'castingweight': 'casting_weight'
+}
+QUERY_FACET_FIELDS = {
+    'brand': 'brand',
+    'category': 'category',
+    'type': 'type',
+    'rodtype': 'rodtype',
+    'reeltype': 'reeltype',
+    'currency': 'currency'
+}
+
 # Fallback field definitions (used when data_manager is not available)
 FALLBACK_PRIMARY_FIELDS = ['name', 'price', 'level']
 FALLBACK_SECONDARY_FIELDS = ['rodtype', 'brand']
 FALLBACK_PRIMARY_REEL_FIELDS = ['name', 'price', 'level']
 FALLBACK_SECONDARY_REEL_FIELDS = ['reeltype', 'brand']
+FALLBACK_CARD_FIELDS = {
+    'rodtype': (FALLBACK_PRIMARY_FIELDS, FALLBACK_SECONDARY_FIELDS),
+    'reeltype': (FALLBACK_PRIMARY_REEL_FIELDS, FALLBACK_SECONDARY_REEL_FIELDS)
+}
+
 
+# Search index constants
+SEARCH_NGRAM_SIZE = 3
+SEARCH_CACHE_SIZE = 32
+LIVE_SEARCH = True
+
+# Typo-tolerant search: trigram similarity over name and brand words, optionally re-ranked by edit distance
+FUZZY_SEARCH = True
+FUZZY_SEARCH_FIELDS = ['name', 'brand']
+FUZZY_MIN_SIMILARITY = 0.45
+FUZZY_MIN_TERM_LENGTH = 3
+FUZZY_EDIT_RERANK = True
+# Typo-tolerant matching only runs when exact search finds fewer results than this (1: only when it finds none)
+FUZZY_FALLBACK_RESULTS = 1
+
+# Background search settings
+ASYNC_SEARCH = True
+SEARCH_WORKER_THREADS = 1
+SEARCH_PUMP_TASK_KEY = "search_pump"
 
 # UI text constants
 MAIN_WINDOW_LABEL = "Main Window"
-SEARCH_HINT = "Search here..."
+SEARCH_HINT = "Search here... (e.g. magfin level<=12 lineweight:4 price<3000cc)"
 SEARCH_BUTTON_LABEL = "Search"
 ADDITIONAL_INFO_LABEL = "Additional Info"
+COMPATIBLE_GEAR_LABEL = "Compatible Gear"
+COMPATIBLE_GEAR_TITLE = "Compatible with {}"
+COMPATIBLE_GEAR_SECTION = "{} ({})"
+NO_COMPATIBLE_GEAR_MESSAGE = "No compatible gear found."
+COMPARE_LABEL = "Compare"
+COMPARISON_TITLE = "Comparison"
+COMPARISON_STATUS_FORMAT = "{} of {} items pinned"
+COMPARISON_FULL_MESSAGE = "The comparison is full ({} items); unpin one first."
+COMPARISON_FIELD_HEADER = "Field"
+COMPARISON_UNPIN_LABEL = "Unpin"
+COMPARISON_CLEAR_LABEL = "Clear"
+COMPARISON_CELL_FORMAT = "{} ({:+g})"
+COMPARISON_BEST_CELL_FORMAT = "{} (best)"
+COMPARISON_MISSING_VALUE = "-"
 NO_DATA_MESSAGE = "No data available."
+LOAD_MORE_LABEL = "Load more ({} remaining)"
+VALUE_WEIGHT_LABEL = "Price weight"
+PROFILER_OVERLAY_LABEL = "Profiler"
+PROFILER_DUMP_LABEL = "Dump profile"
+PROFILER_FRAME_FORMAT = "Frame {:.2f} ms ({:.0f} fps), {} items"
+PROFILER_ACTION_FORMAT = "{:>8.2f} ms  +{:<5d} -{:<5d} {}"
 NO_RODS_FOUND_MESSAGE = "No rods found matching your search."
 NO_REELS_FOUND_MESSAGE = "No reels found matching your search."
 CATEGORY_HEADER_FORMAT = "=== {} ==="
 
+# Compatibility panel settings
+COMPATIBILITY_WINDOW_WIDTH = 420
+COMPATIBILITY_WINDOW_HEIGHT = 420
+COMPATIBILITY_LIST_ROWS = 8
+
+# Comparison tray settings: pinned items side by side in one table, diffed against the best value per field
+COMPARISON_MAX_ITEMS = 20
+COMPARISON_WINDOW_WIDTH = 760
+COMPARISON_WINDOW_HEIGHT = 380
+COMPARISON_BEST_COLOR = (46, 110, 64, 255)
+COMPARISON_LOWER_IS_BETTER = [
+    'price', 'level', 'diameter', 'line_weight_min', 'lure_weight_min', 'casting_weight_min'
+]
+
 # UI spacing constants
 CARD_SPACING = 20
 CATEGORY_SPACING = 20
 WINDOW_PADDING = 40
 CARD_ROW_SPACING = 20
+ITEM_SPACING_Y = 4
+TEXT_LINE_HEIGHT = 13
 
-# UI index constants
-NAVIGATION_GROUP_INDEX = 0
-SEARCH_GROUP_INDEX = 1
-CHILDREN_INDEX = 1
+# Resize handling
+RESIZE_DEBOUNCE_SECONDS = 0.15
+RESIZE_TASK_KEY = "resize_relayout"
 
-# UI component type constants
-NAVIGATION_COMPONENT = 'navigation'
-SEARCH_COMPONENT = 'search'
+# Virtualized card grid settings
+VIRTUALIZED_CARD_GRID = True
+VIRTUAL_GRID_OVERSCAN_ROWS = 2
+VIRTUAL_CARD_ROW_HEIGHT = CARD_HEIGHT + ITEM_SPACING_Y
+VIRTUAL_HEADER_ROW_HEIGHT = CATEGORY_SPACING + TEXT_LINE_HEIGHT + 2 * ITEM_SPACING_Y
+CARD_SLOT_PRIMARY_LINES = 5
+CARD_SLOT_SECONDARY_LINES = 3
+
+# Card render cache: an LRU of formatted cards sized at a few pages of the largest grid
+CARD_RENDER_CACHE_PAGES = 4
+CARD_RENDER_CACHE_MIN_SIZE = 256
+
+# Progressive card rendering (used when the virtualized grid is off)
+# Cards are built a row at a time under a per-frame budget; categories page in CARD_PAGE_SIZE cards
+PROGRESSIVE_CARD_RENDERING = True
+CARD_RENDER_FRAME_BUDGET_MS = 8.0
+CARD_PAGE_SIZE = 60
+CARD_RENDER_TASK_KEY = "card_render:{}"
+
+# Profiling (timings of hot paths, DearPyGui item counters, frame-time overlay)
+PROFILING_ENABLED = False
+PROFILER_OVERLAY = True
+PROFILE_WITH_CPROFILE = False
+PROFILER_HISTORY_SIZE = 50
+PROFILER_OVERLAY_LINES = 10
+PROFILER_OVERLAY_REFRESH_FRAMES = 15
+PROFILER_OVERLAY_WIDTH = 460
+PROFILER_OVERLAY_HEIGHT = 260
+PROFILE_OUTPUT_DIR = os.path.join(SNAPSHOT_CACHE_DIR, 'profiles')
 
 # Error message constants
-ERROR_RECENTERING_MESSAGE = "Error recentering {} bar: {}" 
\ No newline at end of file
+SNAPSHOT_ERROR_MESSAGE = "Error using {} catalog snapshot: {}"
+CATALOG_FILE_ERROR_MESSAGE = "Skipping unreadable catalog file {}: {}"
+CATALOG_RELOAD_MESSAGE = "Reloaded {}: {} added, {} removed, {} changed"
+VALUE_SCORE_NAME_ERROR = "Unknown name {!r} in score expression"
+VALUE_SCORE_SYNTAX_ERROR = "Unsupported {} in score expression"
+QUERY_UNKNOWN_OP_ERROR = "Unknown op {!r}"
+QUERY_UNKNOWN_TYPE_ERROR = "Unknown equipment type {!r}"
+QUERY_UNKNOWN_ITEM_ERROR = "No {} item matches {!r}"
+QUERY_RANGE_ERROR = "Range of {!r} must be [low, high], with null for an open bound"
+QUERY_RANGE_COLUMN_ERROR = "Unknown range column {!r} for {}"
+QUERY_SORT_COLUMN_ERROR = "Unknown sort column {!r} for {}"
+QUERY_FIELD_TYPE_ERROR = "{!r} must be {}"
+QUERY_NEGATIVE_ERROR = "{!r} must not be negative"
+QUERY_FAILED_ERROR = "Query failed: {}: {}"
+QUERY_BATCH_SIZE_ERROR = "A batch holds at most {} queries"
+QUERY_BODY_ERROR = "Request body must be a JSON query, list of queries or {\"queries\": [...]}"
+INGEST_DUPLICATE_MESSAGE = "Skipping duplicate rod '{}' from {}"
+INGEST_SUMMARY_MESSAGE = "Ingested {} rods from {} files ({} re-parsed) in {:.1f} ms, output {}"
+
+PROFILE_DUMP_MESSAGE = "Profile written to {}"
+
+# Startup message constants
+STARTUP_TIME_MESSAGE = "Time to first frame {:.1f} ms ({})"
+QUERY_SERVER_START_MESSAGE = "Serving catalog queries on http://{}:{} ({} catalogs loaded in {:.1f} ms)"
+CATALOG_LOAD_MESSAGE = "{}: {} {:.1f} ms"
+CATALOG_FILES_MESSAGE = "Parsed {} from {} files in {:.1f} ms ({})"
+CATALOG_FILE_TIME_FORMAT = "{} {:.1f} ms" 
\ No newline at end of file
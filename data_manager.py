@@ -1,131 +1,332 @@
+import functools
+import io
 import json
+import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
 from config import *
+from catalog_registry import CatalogRegistry
+from catalog_reload import CatalogWatcher, diff_items
+from catalog_snapshot import CatalogSnapshot
+from compatibility import CompatibilityIndex
+from loadout_optimizer import LoadoutOptimizer
+from profiling import timed
+from equipment_query import EquipmentQueryEngine
+from equipment_types import equipment_types
+from equipment_store import EquipmentStore
+from search_index import SearchIndex
+from fuzzy_index import FuzzyIndex
+from value_scoring import ValueScorer, VALUE_SCORING_AVAILABLE
 
 def parse_json(file_path):
     with open(file_path, 'r') as file:
         return json.load(file)
 
+def parse_catalog_file(file_path):
+    # Parse one catalog file, returning its items (None if unreadable) and the seconds it took
+    load_start = time.perf_counter()
+    try:
+        data = parse_json(file_path)
+    except (OSError, ValueError) as e:
+        print(CATALOG_FILE_ERROR_MESSAGE.format(file_path, e))
+        data = None
+    return data, time.perf_counter() - load_start
+
+def parse_json_files(file_paths, file_load_times=None):
+    # Concatenate catalog files in path order, skipping any that are not valid JSON lists
+    # Several files are read and parsed concurrently, recording each file's load time
+    if len(file_paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(CATALOG_LOAD_WORKERS, len(file_paths))) as executor:
+            results = list(executor.map(parse_catalog_file, file_paths))
+    else:
+        results = [parse_catalog_file(file_path) for file_path in file_paths]
+    
+    items = []
+    for file_path, (data, load_time) in zip(file_paths, results):
+        if file_load_times is not None:
+            file_load_times[file_path] = load_time
+        if isinstance(data, list):
+            items.extend(data)
+    return items
+
+def copy_sharing_items(objects, items):
+    # Deep copy of a catalog's store and indexes that shares the item dicts instead of copying them
+    # Displayed cards, the card render cache and the stores all look items up by identity
+    shared = {id(item): item for item in items}
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = lambda obj: id(obj) if obj is not None and shared.get(id(obj)) is obj else None
+    pickler.dump(objects)
+    buffer.seek(0)
+    unpickler = pickle.Unpickler(buffer)
+    unpickler.persistent_load = shared.__getitem__
+    return unpickler.load()
+
 class DataManager:
     
-    def __init__(self):
-        self.rods_data = {}
-        self.rod_categories = {}
-        self.reels_data = {}
-        self.reel_categories = {}
-        self.load_rods_data()
-        self.load_reels_data()
-    
-    def load_rods_data(self):
-        self.rods_data = {}
-        self.rod_categories = {}
+    def __init__(self, rods_path=PROCESSED_RODS_PATH, reels_path=PROCESSED_REELS_PATH, snapshot_dir=SNAPSHOT_CACHE_DIR):
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_status = {}
+        self.catalog_paths = {}
+        self.file_load_times = {}
+        self.parse_times = {}
+        self.value_weight = DEFAULT_VALUE_WEIGHT
+        # Bumped whenever a reload changes a catalog, so cached query results can be keyed by it
+        self.data_version = 0
+        self.watcher = CatalogWatcher()
+        self.equipment_types = equipment_types({'rods': rods_path, 'reels': reels_path})
         
-        # Load processed rods data
-        processed_rods = parse_json(PROCESSED_RODS_PATH)
+        # Catalogs load the first time a view or search needs them
+        self.catalogs = CatalogRegistry()
+        for name in self.equipment_types:
+            self.catalogs.register(name, functools.partial(self.load_equipment_data, name))
+        self.catalogs.register('compatibility', self.load_compatibility_index)
+    
+    @property
+    def rod_store(self):
+        return self.store('rods')
+    
+    @property
+    def reel_store(self):
+        return self.store('reels')
+    
+    @property
+    def line_store(self):
+        return self.store('lines')
+    
+    @property
+    def leader_store(self):
+        return self.store('leaders')
+    
+    @property
+    def hook_store(self):
+        return self.store('hooks')
+    
+    @property
+    def compatibility_index(self):
+        return self.catalogs.get('compatibility')
+    
+    def store(self, name):
+        return self.catalogs.get(name)['store']
+    
+    def search_index(self, name):
+        return self.catalogs.get(name)['search_index']
+    
+    def query_engine(self, name):
+        return self.catalogs.get(name)['query_engine']
+    
+    def get_by_type(self, name):
+        return self.catalogs.get(name)['by_type']
+    
+    def get_by_category(self, name, sort=None):
+        if sort is None:
+            return self.catalogs.get(name)['by_category']
+        catalog = self.catalogs.get(name)
+        return self._group_by_category(name, catalog, range(len(catalog['store'])), sort)
+    
+    def _group_by_category(self, name, catalog, indices, sort=None):
+        # Sort once against the presorted order, so a single grouping pass keeps every category sorted
+        if sort is not None:
+            indices = self.sort_indices(name, indices, sort, catalog)
+        return catalog['store'].group_indices(indices, self.equipment_types[name].category_field, keep_empty=False)
+    
+    def sort_indices(self, name, indices, sort, catalog=None):
+        # Order item indices by a (column, descending) sort option, or by best value
+        # Pass the catalog the indices came from, so a reload swapping it in between cannot mix them up
+        catalog = catalog or self.catalogs.get(name)
+        column_name, descending = sort
+        if column_name == VALUE_SORT_COLUMN:
+            return self.value_order(name, indices, catalog)
+        return catalog['store'].sort_indices(indices, column_name, descending)
+    
+    def load_equipment_data(self, name):
+        # Load any registered equipment type, parsed and indexed, from a snapshot when possible
+        equipment_type = self.equipment_types[name]
+        store, search_index, fuzzy_index = self._load_catalog(
+            name, equipment_type.source_paths(), equipment_type.group_fields, equipment_type.search_fields)
+        return self._build_catalog(equipment_type, store, search_index, fuzzy_index)
+    
+    def _build_catalog(self, equipment_type, store, search_index, fuzzy_index):
+        # Query engine, groupings and value scorer over a loaded or reloaded store and its indexes
+        catalog = {
+            'store': store,
+            'search_index': search_index,
+            'fuzzy_index': fuzzy_index,
+            'query_engine': EquipmentQueryEngine(
+                store, search_index, equipment_type.type_field, fuzzy_index if FUZZY_SEARCH else None)
+        }
+        catalog.update(self._group_views(equipment_type, store))
+        catalog['value_scorer'] = ValueScorer(store) if VALUE_SCORING_AVAILABLE else None
+        return catalog
+    
+    def _group_views(self, equipment_type, store):
+        # Groupings are views over the store's group arrays, so building them is cheap
+        return {
+            'by_type': store.group_views(equipment_type.type_field),
+            'by_category': store.group_views(equipment_type.category_field)
+        }
+    
+    def load_compatibility_index(self):
+        # Join rods, reels and lines once so lookups are plain slices
+        return CompatibilityIndex(self.rod_store, self.reel_store, self.line_store)
+    
+    def prefetch_catalogs(self):
+        return self.catalogs.prefetch()
+    
+    def _load_catalog(self, name, paths, group_fields, search_fields):
+        # Fingerprint the sources first so edits made while parsing are still picked up
+        self.catalog_paths[name] = list(paths)
+        self.watcher.watch(name, paths)
+        snapshot = CatalogSnapshot(name, paths, self.snapshot_dir)
+        catalog = snapshot.load()
+        self.snapshot_status[name] = catalog is not None
         
-        # Organize data in categories
-        for rod in processed_rods:
-            rod_type = rod['rodtype']
-            category = rod['category']
-            
-            if rod_type not in self.rods_data:
-                self.rods_data[rod_type] = []
-            self.rods_data[rod_type].append(rod)
-            
-            if category not in self.rod_categories:
-                self.rod_categories[category] = []
-            self.rod_categories[category].append(rod)
-    
-    def load_reels_data(self):
-        self.reels_data = {}
-        self.reel_categories = {}
+        if catalog is None:
+            # Parse numeric fields once and index displayed field values once
+            parse_start = time.perf_counter()
+            items = parse_json_files(paths, self.file_load_times)
+            self.parse_times[name] = time.perf_counter() - parse_start
+            store = EquipmentStore(items, group_fields)
+            store.presort(SORT_COLUMNS)
+            catalog = (
+                store,
+                SearchIndex(store.items, search_fields, self.format_field_value),
+                FuzzyIndex(store.items, FUZZY_SEARCH_FIELDS)
+            )
+            snapshot.save(catalog)
         
-        # Load processed reels data
-        processed_reels = parse_json(PROCESSED_REELS_PATH)
+        store, search_index, fuzzy_index = catalog
+        search_index.format_value = self.format_field_value
+        return store, search_index, fuzzy_index
+    
+    def poll_catalog_changes(self):
+        # Names of loaded catalogs whose source files changed on disk
+        return self.watcher.poll()
+    
+    @timed
+    def reload_catalog(self, name):
+        # Re-read a loaded catalog and apply only the differences to its store and index
+        if not self.catalogs.is_loaded(name) or name not in CATALOG_KEY_FIELDS:
+            return None
+        catalog = self.catalogs.get(name)
+        store = catalog['store']
         
-        # Organize data in categories
-        for reel in processed_reels:
-            reel_type = reel.get('reeltype', 'Unknown')
-            category = reel.get('category', 'Unknown')
-            
-            if reel_type not in self.reels_data:
-                self.reels_data[reel_type] = []
-            self.reels_data[reel_type].append(reel)
-            
-            if category not in self.reel_categories:
-                self.reel_categories[category] = []
-            self.reel_categories[category].append(reel)
-    
-    def get_rods_by_category(self):
-        return self.rod_categories
-    
-    def get_reels_by_category(self):
-        return self.reel_categories
-      
-    def search_rods(self, search_term):
-        filtered_rods = {}
-        search_term = search_term.lower()
+        diff = diff_items(store.items, parse_json_files(self.catalog_paths[name], self.file_load_times), CATALOG_KEY_FIELDS[name])
+        if not diff:
+            return diff
+        # Patch copies and swap the finished catalog in, so a search running on the worker thread never sees a half-applied diff
+        store, search_index, fuzzy_index = copy_sharing_items((store, catalog['search_index'], catalog['fuzzy_index']), store.items)
+        search_index.format_value = self.format_field_value
+        remap = store.apply_diff(diff)
+        search_index.apply_diff(diff, remap)
+        fuzzy_index.apply_diff(diff, remap)
         
-        for rod_type, rods in self.rods_data.items():
-            filtered_rods[rod_type] = [
-                rod for rod in rods 
-                if search_term in str(rod).lower()
-            ]
-        return filtered_rods
-    
-    def search_reels(self, search_term):
-        filtered_reels = {}
-        search_term = search_term.lower()
+        self.catalogs.replace(name, self._build_catalog(self.equipment_types[name], store, search_index, fuzzy_index))
+        self.catalogs.invalidate('compatibility')
+        CatalogSnapshot(name, self.catalog_paths[name], self.snapshot_dir).save((store, search_index, fuzzy_index))
+        self.data_version += 1
+        print(CATALOG_RELOAD_MESSAGE.format(name, len(diff.added), len(diff.removed), len(diff.changed)))
+        return diff
+    
+    @timed
+    def search(self, name, search_term, sort=None):
+        # Filter, sort and group by category, keeping only categories with matches
+        catalog = self.catalogs.get(name)
+        matched = catalog['query_engine'].search(search_term)
+        return self._group_by_category(name, catalog, matched, sort)
+    
+    def query(self, name, query, sort=None):
+        # Matching items in one flat list: by relevance for free text, otherwise in catalog or sort order
+        catalog = self.catalogs.get(name)
+        matched = catalog['query_engine'].search(query)
+        if sort is not None:
+            matched = self.sort_indices(name, matched, sort, catalog)
+        return catalog['store'].view(matched)
+    
+    def iter_search_batches(self, name, search_term, is_cancelled=None, sort=None):
+        # Yield (category, matching items) one category at a time so results can stream
+        if not search_term.split():
+            yield from self.get_by_category(name, sort).items()
+            return
         
-        for reel_type, reels in self.reels_data.items():
-            filtered_reels[reel_type] = [
-                reel for reel in reels 
-                if search_term in str(reel).lower()
-            ]
-        return filtered_reels
-    
-    def process_search_results(self, search_results):
-        if not isinstance(search_results, dict):
-            return search_results
-            
-        processed_results = {}
-        for rods in search_results.values():
-            for rod in rods:
-                category = rod.get('category', 'Unknown')
-                if category not in processed_results:
-                    processed_results[category] = []
-                processed_results[category].append(rod)
-        return processed_results
-    
-    def process_reel_search_results(self, search_results):
-        if not isinstance(search_results, dict):
-            return search_results
-            
-        processed_results = {}
-        for reels in search_results.values():
-            for reel in reels:
-                category = reel.get('category', 'Unknown')
-                if category not in processed_results:
-                    processed_results[category] = []
-                processed_results[category].append(reel)
-        return processed_results
-    
-    def get_primary_rod_fields(self):
-        return PRIMARY_ROD_FIELDS
-    
-    def get_secondary_rod_fields(self):
-        return SECONDARY_ROD_FIELDS
-    
-    def get_primary_reel_fields(self):
-        return PRIMARY_REEL_FIELDS
-    
-    def get_secondary_reel_fields(self):
-        return SECONDARY_REEL_FIELDS
+        for category, items in self.search(name, search_term, sort).items():
+            if is_cancelled and is_cancelled():
+                return
+            yield category, items
+    
+    def value_order(self, name, indices, catalog=None):
+        # Best value first under the current slider weight; catalog order without numpy or a score
+        scorer = (catalog or self.catalogs.get(name))['value_scorer']
+        if scorer is None or name not in VALUE_SCORES:
+            return indices
+        return scorer.order(indices, VALUE_SCORES[name], self.value_weight)
+    
+    def best_value(self, name, count, expression=None, weight=None):
+        # Top `count` items for a score expression (the type's default when omitted), best first
+        catalog = self.catalogs.get(name)
+        scorer = catalog['value_scorer']
+        expression = expression or VALUE_SCORES.get(name)
+        if scorer is None or expression is None:
+            return catalog['store'].view([])
+        weight = self.value_weight if weight is None else weight
+        return catalog['store'].view(scorer.top(count, expression, weight))
+    
+    def locate_item(self, item):
+        # Store holding a displayed item and the item's index in it
+        _, store, index = self._locate(item)
+        return store, index
+    
+    def _locate(self, item):
+        # Catalog name, store and index of a displayed item (lines and leaders share a type field)
+        for equipment_type in self.equipment_types.values():
+            if equipment_type.type_field not in item:
+                continue
+            store = self.store(equipment_type.name)
+            try:
+                return equipment_type.name, store, store.index_of(item)
+            except KeyError:
+                continue
+        raise KeyError(self.format_item_label(item))
+    
+    def get_compatible_gear(self, item, name=None):
+        # Compatible gear by the item's catalog, looked up from the item when not given
+        if name is None:
+            name, _, _ = self._locate(item)
+        return self.compatibility_index.compatible_gear(item, name)
+    
+    def optimize_loadout(self, level, budgets, score=DEFAULT_LOADOUT_SCORE):
+        stores = {
+            'rod': self.rod_store,
+            'reel': self.reel_store,
+            'line': self.line_store,
+            'leader': self.leader_store,
+            'hook': self.hook_store
+        }
+        return LoadoutOptimizer(stores, self.compatibility_index).optimize(level, budgets, score)
+    
+    def get_primary_fields(self, name):
+        return self.equipment_types[name].primary_fields
+    
+    def get_secondary_fields(self, name):
+        return self.equipment_types[name].secondary_fields
+    
+    def equipment_type_of(self, item):
+        # First registered type whose type field the item has (lines and leaders share 'linetype')
+        for equipment_type in self.equipment_types.values():
+            if equipment_type.type_field in item:
+                return equipment_type
+        return None
     
     def format_field_display_name(self, field_name):
         if field_name == 'lineWeight':
             return 'Line Weight'
         elif field_name == 'lureWeight':
             return 'Lure Weight'
+        elif field_name == 'carryweight':
+            return 'Carry Weight'
+        elif field_name == 'lenght':
+            return 'Length'
         else:
             return field_name.replace('rod', '').replace('reel', '').capitalize()
     
@@ -133,4 +334,10 @@ class DataManager:
         if isinstance(value, list):
             return ', '.join(value)
         else:
-            return str(value) 
\ No newline at end of file
+            return str(value)
+    
+    def format_item_label(self, item):
+        # Lines have no name, so describe them by brand, type and size
+        if 'name' in item:
+            return item['name']
+        return f"{item.get('brand', '')} {item.get('linetype', '')} {item.get('diameter', '')} ({item.get('carryweight', '')})".strip()
\ No newline at end of file
@@ -0,0 +1,132 @@
+import math
+from config import NUMERIC_FIELD_COLUMNS, COMPARISON_LOWER_IS_BETTER, COMPARISON_CELL_FORMAT, COMPARISON_BEST_CELL_FORMAT, COMPARISON_MISSING_VALUE
+
+PRICE_COLUMN = 'price'
+COMPARISON_COLUMNS = [column_name for _, column_names in NUMERIC_FIELD_COLUMNS.values() for column_name in column_names]
+
+
+def column_label(column_name):
+    """Row label of a parsed column, e.g. 'line_weight_max' -> 'Line weight max'"""
+    return column_name.replace('_', ' ').capitalize()
+
+
+class ComparisonRow:
+    """One parsed numeric column across the pinned items, with its best value and formatted cells"""
+
+    __slots__ = ('column', 'label', 'values', 'units', 'cells', 'best_positions')
+
+    def __init__(self, column):
+        self.column = column
+        self.label = column_label(column)
+        self.values = []
+        self.units = []
+        self.cells = []
+        self.best_positions = []
+
+    def refresh(self):
+        """Recompute the best value and every cell of the row in one pass"""
+        # Values are only comparable within a unit (the currency, for prices)
+        lower_is_better = self.column in COMPARISON_LOWER_IS_BETTER
+        best = {}
+        for value, unit in zip(self.values, self.units):
+            if math.isnan(value):
+                continue
+            current = best.get(unit)
+            if current is None or (value < current if lower_is_better else value > current):
+                best[unit] = value
+
+        self.cells = []
+        self.best_positions = []
+        for position, (value, unit) in enumerate(zip(self.values, self.units)):
+            if math.isnan(value):
+                self.cells.append(COMPARISON_MISSING_VALUE)
+                continue
+            text = f"{value:g} {unit}" if unit else f"{value:g}"
+            difference = value - best[unit]
+            if difference == 0:
+                self.cells.append(COMPARISON_BEST_CELL_FORMAT.format(text))
+                self.best_positions.append(position)
+            else:
+                self.cells.append(COMPARISON_CELL_FORMAT.format(text, difference))
+
+
+class ComparisonSet:
+    """
+    Items pinned for a side-by-side comparison.
+
+    Every parsed numeric column of the pinned items is a row holding one
+    value per item, read from the stores' typed columns rather than the raw
+    JSON. Pinning or unpinning an item updates every row in one batch: its
+    values are appended to (or dropped from) each row, then each row finds
+    its best value (lowest for prices, levels and range minimums, highest
+    otherwise; prices only within their currency) and formats all of its
+    cells as the difference to that best value. Rendering only reads the
+    finished cells.
+    """
+
+    def __init__(self, locate_item, max_items):
+        self.locate_item = locate_item
+        self.max_items = max_items
+        self.items = []
+        self.rows = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return any(pinned is item for pinned in self.items)
+
+    def is_full(self):
+        """Check whether no more items can be pinned"""
+        return len(self.items) >= self.max_items
+
+    def pin(self, item):
+        """Add an item to the comparison, returning False when it is full or the item is already pinned"""
+        if item in self or self.is_full():
+            return False
+        store, index = self.locate_item(item)
+        currency = store.currency(index) or ''
+        for column_name in COMPARISON_COLUMNS:
+            value = store.value(column_name, index)
+            row = self.rows.get(column_name)
+            if row is None:
+                if math.isnan(value):
+                    continue
+                row = self.rows[column_name] = ComparisonRow(column_name)
+                row.values = [math.nan] * len(self.items)
+                row.units = [''] * len(self.items)
+            row.values.append(value)
+            row.units.append(currency if column_name == PRICE_COLUMN else '')
+        self.items.append(item)
+        self._refresh_rows()
+        return True
+
+    def unpin(self, item):
+        """Remove an item from the comparison, returning False when it was not pinned"""
+        for position, pinned in enumerate(self.items):
+            if pinned is item:
+                break
+        else:
+            return False
+        del self.items[position]
+        for column_name, row in list(self.rows.items()):
+            del row.values[position]
+            del row.units[position]
+            if all(math.isnan(value) for value in row.values):
+                del self.rows[column_name]
+        self._refresh_rows()
+        return True
+
+    def clear(self):
+        """Unpin every item"""
+        self.items = []
+        self.rows = {}
+
+    def _refresh_rows(self):
+        """Recompute every row after the pinned items changed"""
+        for row in self.rows.values():
+            row.refresh()
+
+    def ordered_rows(self):
+        """Return the rows in catalog field order"""
+        return [self.rows[column_name] for column_name in COMPARISON_COLUMNS if column_name in self.rows]
@@ -0,0 +1,261 @@
+import re
+from collections import Counter
+from config import QUERY_NUMERIC_FIELDS, QUERY_RANGE_FIELDS, QUERY_FACET_FIELDS, CURRENCIES, FUZZY_FALLBACK_RESULTS
+
+FILTER_PATTERN = re.compile(r'^([a-z_]+)(<=|>=|<|>|=|:)(.+)$')
+VALUE_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)([a-z]*)$')
+BETWEEN_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)(?:\.\.|-)(\d+(?:\.\d+)?)$')
+EXACT_MATCH_SCORE = 1.0
+
+
+class RangeFilter:
+    """Numeric filter on one parsed column: low <= value <= high (either bound optional)"""
+
+    __slots__ = ('column', 'low', 'high', 'include_low', 'include_high')
+
+    def __init__(self, column, low=None, high=None, include_low=True, include_high=True):
+        self.column = column
+        self.low = low
+        self.high = high
+        self.include_low = include_low
+        self.include_high = include_high
+
+    def __repr__(self):
+        return f"RangeFilter({self.column!r}, low={self.low}, high={self.high})"
+
+
+class EquipmentQuery:
+    """
+    Structured equipment query: free text plus numeric ranges and facet filters.
+
+    Search-box syntax (terms are whitespace separated, everything else is
+    free text matched by the search index):
+
+    - `level<=12`, `maxdrag>=8`, `length:2.1..2.4` - numeric comparisons and ranges
+    - `price<3000cc` - a price bound, with an optional currency suffix
+    - `lineweight:4` - a min-max field that covers the value; `lineweight>=4`
+      compares against the maximum and `lineweight<=4` against the minimum
+    - `brand:magfin`, `category:lure`, `type:spinning`, `currency:bc` - facets,
+      matched as case-insensitive substrings of the field value
+    """
+
+    def __init__(self, text='', ranges=None, facets=None, currency=None):
+        self.text = text
+        self.ranges = list(ranges or [])
+        self.facets = dict(facets or {})
+        self.currency = currency
+
+    @classmethod
+    def parse(cls, query_text):
+        """Parse search-box text into a structured query"""
+        query = cls()
+        text_terms = []
+        for term in query_text.lower().split():
+            if not query._add_filter_term(term):
+                text_terms.append(term)
+        query.text = ' '.join(text_terms)
+        return query
+
+    def is_text_only(self):
+        """Check whether the query has no structured filters"""
+        return not self.ranges and not self.facets and self.currency is None
+
+    def covering(self, range_field, value):
+        """Require a min-max field (e.g. 'line_weight') to cover the value"""
+        self.ranges.append(RangeFilter(f"{range_field}_min", high=value))
+        self.ranges.append(RangeFilter(f"{range_field}_max", low=value))
+        return self
+
+    def _add_filter_term(self, term):
+        """Add a `field<op>value` term as a filter, returning False for free text"""
+        match = FILTER_PATTERN.match(term)
+        if not match:
+            return False
+        field, operator, value = match.groups()
+
+        if field in QUERY_FACET_FIELDS:
+            if operator not in (':', '='):
+                return False
+            if QUERY_FACET_FIELDS[field] == 'currency':
+                self.currency = value.upper()
+            else:
+                self.facets[QUERY_FACET_FIELDS[field]] = value
+            return True
+
+        if field in QUERY_NUMERIC_FIELDS:
+            return self._add_numeric_filter(QUERY_NUMERIC_FIELDS[field], operator, value)
+        if field in QUERY_RANGE_FIELDS:
+            return self._add_range_field_filter(QUERY_RANGE_FIELDS[field], operator, value)
+        return False
+
+    def _add_numeric_filter(self, column, operator, value):
+        """Add a comparison or between filter on a single-valued column"""
+        between = BETWEEN_PATTERN.match(value)
+        if between and operator in (':', '='):
+            self.ranges.append(RangeFilter(column, low=float(between.group(1)), high=float(between.group(2))))
+            return True
+
+        number = self._parse_value(value)
+        if number is None:
+            return False
+        self.ranges.append(self._comparison(column, operator, number))
+        return True
+
+    def _add_range_field_filter(self, range_field, operator, value):
+        """Add a filter on a min-max field such as line or lure weight"""
+        between = BETWEEN_PATTERN.match(value)
+        if between and operator in (':', '='):
+            self.ranges.append(RangeFilter(f"{range_field}_min", high=float(between.group(1))))
+            self.ranges.append(RangeFilter(f"{range_field}_max", low=float(between.group(2))))
+            return True
+
+        number = self._parse_value(value)
+        if number is None:
+            return False
+        if operator in (':', '='):
+            self.covering(range_field, number)
+        elif operator in ('>', '>='):
+            self.ranges.append(self._comparison(f"{range_field}_max", operator, number))
+        else:
+            self.ranges.append(self._comparison(f"{range_field}_min", operator, number))
+        return True
+
+    def _parse_value(self, value):
+        """Parse a number with an optional unit or currency suffix"""
+        match = VALUE_PATTERN.match(value)
+        if not match:
+            return None
+        suffix = match.group(2).upper()
+        if suffix in CURRENCIES:
+            self.currency = suffix
+        return float(match.group(1))
+
+    @staticmethod
+    def _comparison(column, operator, number):
+        """Build the range filter for a comparison operator"""
+        if operator in ('>', '>='):
+            return RangeFilter(column, low=number, include_low=(operator == '>='))
+        if operator in ('<', '<='):
+            return RangeFilter(column, high=number, include_high=(operator == '<='))
+        return RangeFilter(column, low=number, high=number)
+
+
+class EquipmentQueryEngine:
+    """
+    Answers equipment queries for one store.
+
+    Numeric filters are answered with bisect over the store's sorted per-column
+    indexes, facets with its grouping index arrays and free text with the
+    search index; the partial results are intersected smallest first. With a
+    fuzzy index, text queries come back ranked by relevance: items where a
+    term is a whole name or brand word come before other substring matches.
+    Only when exact search finds fewer than FUZZY_FALLBACK_RESULTS items are
+    the terms that match nothing exactly looked up in names and brands with
+    typos, ranked by word similarity.
+    """
+
+    def __init__(self, store, search_index, type_field, fuzzy_index=None):
+        self.store = store
+        self.search_index = search_index
+        self.type_field = type_field
+        self.fuzzy_index = fuzzy_index
+
+    def search(self, query):
+        """Return the ids of items matching a query string or EquipmentQuery, most relevant first"""
+        if not isinstance(query, EquipmentQuery):
+            query = EquipmentQuery.parse(query)
+        text_matches = self.match_text(query.text) if query.text else None
+        if query.is_text_only():
+            return text_matches if text_matches is not None else self.search_index.search(query.text)
+
+        candidate_sets = []
+        for range_filter in query.ranges:
+            candidate_sets.append(self.store.range_indices(
+                range_filter.column, range_filter.low, range_filter.high,
+                range_filter.include_low, range_filter.include_high))
+        for field, value in query.facets.items():
+            candidate_sets.append(self._facet_indices(field, value))
+        if query.currency is not None:
+            candidate_sets.append(self.store.currency_indices(query.currency))
+        if text_matches is not None:
+            candidate_sets.append(text_matches)
+
+        candidate_sets.sort(key=len)
+        result = set(candidate_sets[0])
+        for candidates in candidate_sets[1:]:
+            if not result:
+                break
+            result.intersection_update(candidates)
+        if text_matches is not None and self.fuzzy_index is not None:
+            # Keep the relevance order of the text matches
+            return [item_id for item_id in text_matches if item_id in result]
+        return sorted(result)
+
+    def match_text(self, text):
+        """Return the ids of the items matching free text, most relevant first when there is a fuzzy index"""
+        # The full text goes through the search index, so typing further refines its cached result
+        exact = self.search_index.search(text)
+        if self.fuzzy_index is None:
+            return exact
+        if len(exact) >= FUZZY_FALLBACK_RESULTS:
+            return self._rank_exact(exact, text.split())
+        scores = self.rank_text(text)
+        return self._by_relevance(scores, scores)
+
+    def _rank_exact(self, exact, terms):
+        """Move the items where terms are whole name or brand words to the front, most such terms first"""
+        term_postings = [postings for postings in map(self.fuzzy_index.word_postings, terms) if postings]
+        if not term_postings:
+            return exact
+        if len(term_postings) == 1:
+            # A stable partition, skipped when every match has the word (e.g. a brand name)
+            if term_postings[0] == exact:
+                return exact
+            whole_word = set(term_postings[0])
+            return [item_id for item_id in exact if item_id in whole_word] + [
+                item_id for item_id in exact if item_id not in whole_word]
+
+        word_counts = Counter()
+        for postings in term_postings:
+            word_counts.update(postings)
+        whole_word = [item_id for item_id in exact if item_id in word_counts]
+        whole_word.sort(key=word_counts.__getitem__, reverse=True)
+        return whole_word + [item_id for item_id in exact if item_id not in word_counts]
+
+    def rank_text(self, text):
+        """Return {item id: relevance} for the items matching every free-text term, exactly or with typos"""
+        scores = None
+        for term in text.split():
+            # Exact substring matches score EXACT_MATCH_SCORE; only a term matching nothing is looked up with typos
+            term_scores = dict.fromkeys(self.search_index.search(term), EXACT_MATCH_SCORE)
+            if not term_scores:
+                term_scores = self.fuzzy_index.match_term(term)
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {item_id: score + term_scores[item_id] for item_id, score in scores.items() if item_id in term_scores}
+            if not scores:
+                break
+        return scores or {}
+
+    @staticmethod
+    def _by_relevance(item_ids, scores):
+        """Order item ids by descending relevance, then catalog order"""
+        # The sort is stable, so ids already in catalog order stay that way within equal scores
+        ordered = sorted(item_ids)
+        ordered.sort(key=scores.__getitem__, reverse=True)
+        return ordered
+
+    def _facet_indices(self, field, value):
+        """Return the indices of items whose facet field contains the value"""
+        if field == 'type':
+            field = self.type_field
+        groups = self.store.groups.get(field)
+        if groups is None:
+            return []
+        indices = []
+        for group_name, group_indices in groups.items():
+            if value in str(group_name).lower():
+                indices.extend(group_indices)
+        return indices
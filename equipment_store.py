@@ -0,0 +1,431 @@
+import bisect
+import math
+import re
+from array import array
+from collections.abc import Sequence
+from config import CURRENCIES, NUMERIC_FIELD_COLUMNS
+
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+MISSING_VALUE = math.nan
+MISSING_CURRENCY = -1
+PRICE_COLUMN = 'price'
+REMOVED_INDEX = -1
+SORT_WALK_RATIO = 8
+
+
+def parse_number(text):
+    """Parse the first number in a value like '3.5m' or '50 cm'"""
+    if isinstance(text, (int, float)):
+        return float(text)
+    match = NUMBER_PATTERN.search(str(text))
+    return float(match.group()) if match else MISSING_VALUE
+
+
+def parse_range(text):
+    """Parse a 'min-max unit' value like '1.5-3.0 kg' into an ordered pair"""
+    numbers = [float(number) for number in NUMBER_PATTERN.findall(str(text))]
+    if not numbers:
+        return MISSING_VALUE, MISSING_VALUE
+    return min(numbers), max(numbers)
+
+
+def parse_price(text):
+    """Parse a price like '1900 CC' into its amount and currency label"""
+    parts = str(text).split()
+    amount = parse_number(parts[0]) if parts else MISSING_VALUE
+    currency = parts[-1].upper() if len(parts) > 1 else None
+    return amount, currency
+
+
+class ItemView(Sequence):
+    """Lightweight read-only view of store items selected by an index array"""
+
+    __slots__ = ('items', 'indices')
+
+    def __init__(self, items, indices):
+        self.items = items
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return ItemView(self.items, self.indices[position])
+        return self.items[self.indices[position]]
+
+    def __iter__(self):
+        items = self.items
+        for index in self.indices:
+            yield items[index]
+
+    def __repr__(self):
+        return f"ItemView({len(self.indices)} items)"
+
+
+class EquipmentStore:
+    """
+    Compact, typed store for one kind of equipment.
+
+    The raw JSON items are kept once in `items`. Numeric fields are parsed a
+    single time into float64 `array` columns (NaN marks a missing value),
+    prices are split into an amount column and a currency code column, and
+    every grouping (rodtype, category, ...) is an index array into `items`
+    instead of a duplicated list of dicts.
+    """
+
+    def __init__(self, items, group_fields=()):
+        self.items = list(items)
+        self.currencies = list(CURRENCIES)
+        self.columns = {}
+        self.currency_codes = array('b')
+        self.group_fields = tuple(group_fields)
+        self.groups = {}
+        self.group_codes = {}
+        self.sorted_indexes = {}
+        self.sort_orders = {}
+        self.sort_ranks = {}
+        self.currency_groups = None
+        self.item_positions = None
+        self._parse_columns()
+        self._build_groups()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getstate__(self):
+        # Positions are keyed by object identity, which does not survive pickling
+        state = self.__dict__.copy()
+        state['item_positions'] = None
+        return state
+
+    def _parse_columns(self):
+        """Parse every known numeric field into typed columns"""
+        present_fields = {field for item in self.items for field in item}
+        for field, (kind, column_names) in NUMERIC_FIELD_COLUMNS.items():
+            if field not in present_fields:
+                continue
+            for column_name in column_names:
+                self.columns[column_name] = array('d')
+            for item in self.items:
+                self._append_field(field, kind, column_names, item.get(field))
+
+    def _append_field(self, field, kind, column_names, value):
+        """Append the parsed value of one field to its columns"""
+        values, currency_code = self._parse_field(kind, value)
+        for column_name, parsed in zip(column_names, values):
+            self.columns[column_name].append(parsed)
+        if kind == 'price':
+            self.currency_codes.append(currency_code)
+
+    def _parse_field(self, kind, value):
+        """Return the parsed column values of one field, plus the currency code for prices"""
+        if kind == 'range':
+            return (parse_range(value) if value is not None else (MISSING_VALUE, MISSING_VALUE)), None
+        if kind == 'price':
+            amount, currency = parse_price(value) if value is not None else (MISSING_VALUE, None)
+            return (amount,), self.currency_code(currency)
+        return (parse_number(value) if value is not None else MISSING_VALUE,), None
+
+    def _build_groups(self):
+        """Build index arrays for every grouping field"""
+        for field in self.group_fields:
+            groups = {}
+            codes = array('H')
+            group_names = {}
+            for index, item in enumerate(self.items):
+                group_name = item.get(field, 'Unknown')
+                if group_name not in groups:
+                    groups[group_name] = array('I')
+                    group_names[group_name] = len(group_names)
+                groups[group_name].append(index)
+                codes.append(group_names[group_name])
+            self.groups[field] = groups
+            self.group_codes[field] = codes
+
+    def currency_code(self, currency):
+        """Return the numeric code of a currency label, registering new labels"""
+        if currency is None:
+            return MISSING_CURRENCY
+        if currency not in self.currencies:
+            self.currencies.append(currency)
+        return self.currencies.index(currency)
+
+    def currency(self, index):
+        """Return the currency label of the item at the given index"""
+        code = self.currency_codes[index] if self.currency_codes else MISSING_CURRENCY
+        return self.currencies[code] if code != MISSING_CURRENCY else None
+
+    def column(self, column_name):
+        """Return a parsed numeric column, or None if no item has the field"""
+        return self.columns.get(column_name)
+
+    def value(self, column_name, index):
+        """Return the parsed value of a column for a single item"""
+        column = self.columns.get(column_name)
+        return column[index] if column is not None else MISSING_VALUE
+
+    def sorted_index(self, column_name):
+        """Return (sorted values, item indices in that order) for a column, skipping missing values"""
+        sorted_index = self.sorted_indexes.get(column_name)
+        if sorted_index is None:
+            column = self.columns[column_name]
+            order = sorted((index for index in range(len(column)) if not math.isnan(column[index])),
+                           key=column.__getitem__)
+            sorted_index = (array('d', (column[index] for index in order)), array('I', order))
+            self.sorted_indexes[column_name] = sorted_index
+        return sorted_index
+
+    def presort(self, column_names):
+        """Precompute the sorted order and sort ranks of the given columns"""
+        for column_name in column_names:
+            if column_name in self.columns:
+                self._build_sort_ranks(column_name)
+
+    def _build_sort_ranks(self, column_name):
+        """Rank every item by its position in a column's sort order; missing values rank last"""
+        order = self._sort_order(column_name)
+        ranks = array('I', [len(order)]) * len(self.items)
+        for rank, index in enumerate(order):
+            ranks[index] = rank
+        self.sort_orders[column_name] = order
+        self.sort_ranks[column_name] = ranks
+        return ranks
+
+    def _sort_order(self, column_name):
+        """Return the item indices a column sorts into; prices by (currency, amount)"""
+        _, order = self.sorted_index(column_name)
+        if column_name != PRICE_COLUMN or not self.currency_codes:
+            return order
+        # Amounts only compare within a currency: a stable sort by currency code keeps each currency's amounts in order
+        missing_rank = len(self.currencies)
+        codes = self.currency_codes
+        return array('I', sorted(order, key=lambda index: codes[index] if codes[index] != MISSING_CURRENCY else missing_rank))
+
+    def sort_indices(self, indices, column_name, descending=False):
+        """
+        Return the given item indices ordered by a column, missing values last.
+
+        No values are compared: a large selection is intersected with the
+        column's presorted order in one pass over it, and a small one is
+        ordered by its precomputed integer ranks. Prices are grouped by
+        currency in CURRENCIES order (reversed when descending), and only
+        compared within a currency.
+        """
+        if column_name not in self.columns:
+            return array('I', indices)
+        ranks = self.sort_ranks.get(column_name)
+        if ranks is None:
+            ranks = self._build_sort_ranks(column_name)
+        order = self.sort_orders[column_name]
+        present_count = len(order)
+
+        if len(indices) * SORT_WALK_RATIO >= len(self.items):
+            selected = bytearray(len(self.items))
+            for index in indices:
+                selected[index] = 1
+            ordered = array('I', (index for index in order if selected[index]))
+            if descending:
+                ordered.reverse()
+        else:
+            present = (index for index in indices if ranks[index] < present_count)
+            ordered = array('I', sorted(present, key=ranks.__getitem__, reverse=descending))
+        ordered.extend(index for index in indices if ranks[index] >= present_count)
+        return ordered
+
+    def range_indices(self, column_name, low=None, high=None, include_low=True, include_high=True):
+        """Return the indices of items whose column value lies in the given range, using bisect"""
+        if column_name not in self.columns:
+            return array('I')
+        values, order = self.sorted_index(column_name)
+        start = 0
+        if low is not None:
+            start = bisect.bisect_left(values, low) if include_low else bisect.bisect_right(values, low)
+        end = len(values)
+        if high is not None:
+            end = bisect.bisect_right(values, high) if include_high else bisect.bisect_left(values, high)
+        return order[start:end] if start < end else array('I')
+
+    def currency_indices(self, currency):
+        """Return the indices of items priced in the given currency"""
+        if self.currency_groups is None:
+            groups = {}
+            for index, code in enumerate(self.currency_codes):
+                groups.setdefault(code, array('I')).append(index)
+            self.currency_groups = groups
+        code = self.currencies.index(currency) if currency in self.currencies else MISSING_CURRENCY
+        return self.currency_groups.get(code, array('I'))
+
+    def index_of(self, item):
+        """Return the index of an item dict held by this store"""
+        if self.item_positions is None:
+            self.item_positions = {id(stored): index for index, stored in enumerate(self.items)}
+        return self.item_positions[id(item)]
+
+    def view(self, indices):
+        """Return a view over the items at the given indices"""
+        return ItemView(self.items, indices)
+
+    def group_views(self, field):
+        """Return {group name: view} for a grouping field"""
+        return {name: ItemView(self.items, indices) for name, indices in self.groups[field].items()}
+
+    def group_indices(self, indices, field, keep_empty=True):
+        """Split the given item indices into {group name: view} in a single pass over them"""
+        buckets = [array('I') for _ in self.groups[field]]
+        codes = self.group_codes[field]
+        for index in indices:
+            buckets[codes[index]].append(index)
+        return {
+            name: ItemView(self.items, bucket)
+            for name, bucket in zip(self.groups[field], buckets)
+            if keep_empty or bucket
+        }
+
+    # ==================== INCREMENTAL UPDATES ====================
+
+    def apply_diff(self, diff):
+        """
+        Apply a CatalogDiff in place without re-parsing unchanged items.
+
+        Changed items keep their index, removed items are compacted away and
+        added items are appended. Columns, groups and any sorted indexes
+        already built are patched rather than rebuilt; sort ranks are
+        re-derived from the patched sorted indexes. Returns the old -> new
+        index map (REMOVED_INDEX for removed items), or None when no item was
+        removed and every old index is still valid.
+        """
+        touched = set()
+        for index, _, item in diff.changed:
+            self._replace_item(index, item)
+            touched.add(index)
+
+        remap = None
+        if diff.removed:
+            remap = self._remove_items({index for index, _ in diff.removed})
+            touched = {remap[index] for index in touched}
+
+        for item in diff.added:
+            touched.add(self._append_item(item))
+
+        self._patch_sorted_indexes(remap, touched)
+        for column_name in list(self.sort_ranks):
+            self._build_sort_ranks(column_name)
+        self.currency_groups = None
+        self.item_positions = None
+        return remap
+
+    def _ensure_columns(self, field, kind, column_names, item_count):
+        """Create the columns of a field first seen in an update, backfilled as missing"""
+        if column_names[0] in self.columns:
+            return
+        for column_name in column_names:
+            self.columns[column_name] = array('d', [MISSING_VALUE] * item_count)
+        if kind == 'price' and not self.currency_codes:
+            self.currency_codes = array('b', [MISSING_CURRENCY] * item_count)
+
+    def _replace_item(self, index, item):
+        """Replace the item at index, re-parsing only its own fields"""
+        old_item = self.items[index]
+        self.items[index] = item
+        for field, (kind, column_names) in NUMERIC_FIELD_COLUMNS.items():
+            if field not in item and column_names[0] not in self.columns:
+                continue
+            self._ensure_columns(field, kind, column_names, len(self.items))
+            values, currency_code = self._parse_field(kind, item.get(field))
+            for column_name, parsed in zip(column_names, values):
+                self.columns[column_name][index] = parsed
+            if kind == 'price':
+                self.currency_codes[index] = currency_code
+
+        for field in self.group_fields:
+            old_name, new_name = old_item.get(field, 'Unknown'), item.get(field, 'Unknown')
+            if old_name == new_name:
+                continue
+            old_group = self.groups[field][old_name]
+            old_group.remove(index)
+            self._add_to_group(field, new_name, index)
+            if not old_group:
+                del self.groups[field][old_name]
+                self._rebuild_group_codes(field)
+
+    def _append_item(self, item):
+        """Append a new item, parsing its fields and adding it to its groups"""
+        index = len(self.items)
+        self.items.append(item)
+        for field, (kind, column_names) in NUMERIC_FIELD_COLUMNS.items():
+            if field not in item and column_names[0] not in self.columns:
+                continue
+            self._ensure_columns(field, kind, column_names, index)
+            self._append_field(field, kind, column_names, item.get(field))
+        for field in self.group_fields:
+            self.group_codes[field].append(0)
+            self._add_to_group(field, item.get(field, 'Unknown'), index)
+        return index
+
+    def _add_to_group(self, field, group_name, index):
+        """Insert an index into a group, creating the group when it is new"""
+        groups = self.groups[field]
+        if group_name not in groups:
+            groups[group_name] = array('I')
+        bisect.insort(groups[group_name], index)
+        self.group_codes[field][index] = list(groups).index(group_name)
+
+    def _rebuild_group_codes(self, field):
+        """Recompute the group code of every item after a group was dropped"""
+        codes = self.group_codes[field]
+        for code, indices in enumerate(self.groups[field].values()):
+            for index in indices:
+                codes[index] = code
+
+    def _remove_items(self, removed):
+        """Compact removed items out of every column and group, returning the index map"""
+        remap = array('i')
+        kept = []
+        for index in range(len(self.items)):
+            if index in removed:
+                remap.append(REMOVED_INDEX)
+            else:
+                remap.append(len(kept))
+                kept.append(index)
+
+        self.items[:] = [self.items[index] for index in kept]
+        for column_name, column in self.columns.items():
+            self.columns[column_name] = array('d', (column[index] for index in kept))
+        if self.currency_codes:
+            self.currency_codes = array('b', (self.currency_codes[index] for index in kept))
+
+        for field in self.group_fields:
+            groups = {}
+            for group_name, indices in self.groups[field].items():
+                remaining = array('I', (remap[index] for index in indices if remap[index] != REMOVED_INDEX))
+                if remaining:
+                    groups[group_name] = remaining
+            self.groups[field] = groups
+            self.group_codes[field] = array('H', bytes(2 * len(kept)))
+            self._rebuild_group_codes(field)
+
+        for column_name, (values, order) in self.sorted_indexes.items():
+            kept_positions = [position for position, index in enumerate(order) if remap[index] != REMOVED_INDEX]
+            self.sorted_indexes[column_name] = (
+                array('d', (values[position] for position in kept_positions)),
+                array('I', (remap[order[position]] for position in kept_positions))
+            )
+        return remap
+
+    def _patch_sorted_indexes(self, remap, touched):
+        """Move touched items to their new sorted positions in the sorted indexes built so far"""
+        if not touched:
+            return
+        for column_name, (values, order) in list(self.sorted_indexes.items()):
+            positions = [position for position, index in enumerate(order) if index not in touched]
+            values = array('d', (values[position] for position in positions))
+            order = array('I', (order[position] for position in positions))
+            column = self.columns[column_name]
+            for index in sorted(touched):
+                if math.isnan(column[index]):
+                    continue
+                position = bisect.bisect_right(values, column[index])
+                values.insert(position, column[index])
+                order.insert(position, index)
+            self.sorted_indexes[column_name] = (values, order)
@@ -0,0 +1,46 @@
+import glob
+import os
+from config import EQUIPMENT_TYPES
+
+
+class EquipmentType:
+    """
+    Definition of one kind of equipment catalog.
+
+    A type names its source (a processed JSON file, or a shop folder with one
+    file per gear type), the field holding its gear type, the field its views
+    and search results are grouped by, the fields grouped by the store, and
+    the fields shown on its cards and indexed for search.
+    """
+
+    def __init__(self, name, source, type_field, category_field, group_fields, primary_fields, secondary_fields):
+        self.name = name
+        self.source = source
+        self.type_field = type_field
+        self.category_field = category_field
+        self.group_fields = list(dict.fromkeys([type_field, category_field, *group_fields]))
+        self.primary_fields = list(primary_fields)
+        self.secondary_fields = list(secondary_fields)
+
+    def __repr__(self):
+        return f"EquipmentType({self.name!r}, {self.source!r})"
+
+    @property
+    def search_fields(self):
+        """Fields whose displayed values are indexed for free-text search"""
+        return self.primary_fields + self.secondary_fields
+
+    def source_paths(self):
+        """Return the catalog files of this type (every JSON file under a shop folder), in a stable order"""
+        if os.path.isdir(self.source):
+            return sorted(glob.glob(os.path.join(self.source, '**', '*.json'), recursive=True))
+        return [self.source]
+
+
+def equipment_types(sources=None):
+    """Build {name: EquipmentType} from EQUIPMENT_TYPES, optionally overriding sources by name"""
+    sources = sources or {}
+    return {
+        name: EquipmentType(name, **{**definition, 'source': sources.get(name, definition['source'])})
+        for name, definition in EQUIPMENT_TYPES.items()
+    }
@@ -0,0 +1,279 @@
+import bisect
+import re
+import threading
+from collections import Counter, OrderedDict
+from config import FUZZY_MIN_SIMILARITY, FUZZY_MIN_TERM_LENGTH, FUZZY_EDIT_RERANK, SEARCH_CACHE_SIZE
+
+WORD_PATTERN = re.compile(r'[a-z][a-z0-9]*')
+GRAM_PADDING = '$'
+
+
+def trigrams(text):
+    """Return the trigrams of a word padded with a boundary marker on both ends"""
+    padded = f"{GRAM_PADDING}{text}{GRAM_PADDING}"
+    return {padded[start:start + 3] for start in range(len(padded) - 2)}
+
+
+def edit_distance(first, second):
+    """Return the Levenshtein distance between two strings (bit-parallel, Myers / Hyyrö)"""
+    if not first or not second:
+        return len(first) + len(second)
+    match_masks = {}
+    for position, char in enumerate(first):
+        match_masks[char] = match_masks.get(char, 0) | (1 << position)
+
+    all_bits = (1 << len(first)) - 1
+    last_bit = 1 << (len(first) - 1)
+    positive, negative, distance = all_bits, 0, len(first)
+    for char in second:
+        match = match_masks.get(char, 0)
+        vertical = match | negative
+        horizontal = (((match & positive) + positive) ^ positive) | match
+        horizontal_positive = negative | ~(horizontal | positive)
+        horizontal_negative = positive & horizontal
+        if horizontal_positive & last_bit:
+            distance += 1
+        elif horizontal_negative & last_bit:
+            distance -= 1
+        horizontal_positive = (horizontal_positive << 1) | 1
+        horizontal_negative <<= 1
+        positive = (horizontal_negative | ~(vertical | horizontal_positive)) & all_bits
+        negative = horizontal_positive & vertical & all_bits
+    return distance
+
+
+def max_edit_distance(term):
+    """Number of typos tolerated in a query term of this length"""
+    return 1 if len(term) <= 5 else 2
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over a word vocabulary under edit distance.
+
+    Each node's children are keyed by their distance to it, so by the
+    triangle inequality a search within distance k only descends into the
+    children whose key lies within k of the query's distance to the node.
+    Removing a word empties its node's value instead of unlinking it, since
+    the node still routes searches to its children; adding the word again
+    fills it back in.
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, word, value):
+        """Insert a word with an attached value (e.g. its token id)"""
+        if self.root is None:
+            self.root = [word, value, {}]
+            return
+        node = self.root
+        while True:
+            distance = edit_distance(word, node[0])
+            if distance == 0:
+                if node[1] is None:
+                    node[1] = value
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [word, value, {}]
+                return
+            node = child
+
+    def remove(self, word):
+        """Remove a word, leaving its node in place to route searches"""
+        node = self.root
+        while node is not None:
+            distance = edit_distance(word, node[0])
+            if distance == 0:
+                node[1] = None
+                return
+            node = node[2].get(distance)
+
+    def search(self, word, max_distance):
+        """Return (value, distance) for every stored word within max_distance of word"""
+        matches = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node_word, value, children = stack.pop()
+            distance = edit_distance(word, node_word)
+            if distance <= max_distance and value is not None:
+                matches.append((value, distance))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return matches
+
+
+class FuzzyIndex:
+    """
+    Typo-tolerant word index over item names and brands.
+
+    Every word of the indexed fields (and, for multi-word values, the words
+    run together, so "magmablst" can match "Magma Blast") becomes a
+    vocabulary token with a postings list of item ids. Tokens are indexed by
+    padded trigrams: a query term only scores the tokens that share one of
+    its trigrams, using the Dice coefficient of the two trigram sets. With
+    edit-distance re-ranking enabled, the vocabulary is also kept in a
+    BK-tree, which finds the tokens within a typo or two of the term and
+    scores them by their edit distance, without measuring it against every
+    item. Recent term matches are kept in a small LRU, so retyping a live
+    query does not repeat the edit-distance search for its earlier terms.
+    A catalog reload re-indexes changed items in place, keeping postings in
+    item order, and prunes the words no item has any more.
+    """
+
+    def __init__(self, items, fields, edit_rerank=FUZZY_EDIT_RERANK):
+        self.fields = list(fields)
+        self.edit_rerank = edit_rerank
+        self.tokens = []
+        self.token_ids = {}
+        self.token_postings = []
+        self.token_gram_counts = []
+        self.gram_tokens = {}
+        self.bk_tree = BKTree() if edit_rerank else None
+        self.item_count = 0
+        self.term_cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        for item in items:
+            self._add_item(self.item_count, item)
+            self.item_count += 1
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['term_cache'] = None
+        state['cache_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.term_cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+
+    def item_words(self, item):
+        """Return the lowercase words of an item's indexed fields, plus each multi-word value run together"""
+        words = []
+        for field in self.fields:
+            if field not in item:
+                continue
+            value_words = WORD_PATTERN.findall(str(item[field]).lower())
+            words.extend(value_words)
+            if len(value_words) > 1:
+                words.append(''.join(value_words))
+        return words
+
+    def _add_item(self, item_id, item):
+        """Add an item id to the postings of its words"""
+        for word in dict.fromkeys(self.item_words(item)):
+            token_id = self.token_ids.get(word)
+            if token_id is None:
+                token_id = self._add_token(word)
+            self.token_postings[token_id].append(item_id)
+
+    def _add_token(self, word):
+        """Register a vocabulary token in the trigram index and the BK-tree"""
+        token_id = len(self.tokens)
+        self.tokens.append(word)
+        self.token_ids[word] = token_id
+        self.token_postings.append([])
+        grams = trigrams(word)
+        self.token_gram_counts.append(len(grams))
+        for gram in grams:
+            self.gram_tokens.setdefault(gram, []).append(token_id)
+        if self.bk_tree is not None:
+            self.bk_tree.add(word, token_id)
+        return token_id
+
+    def _insert_item(self, item_id, item):
+        """Re-index an existing item id, keeping postings sorted"""
+        for word in dict.fromkeys(self.item_words(item)):
+            token_id = self.token_ids.get(word)
+            if token_id is None:
+                token_id = self._add_token(word)
+            bisect.insort(self.token_postings[token_id], item_id)
+
+    def _remove_token(self, token_id):
+        """Drop a token no item has any more from the vocabulary, the trigram index and the BK-tree"""
+        # Its slot in the token lists stays, empty, so the other token ids keep their meaning
+        word = self.tokens[token_id]
+        self.tokens[token_id] = None
+        del self.token_ids[word]
+        for gram in trigrams(word):
+            gram_tokens = self.gram_tokens[gram]
+            gram_tokens.remove(token_id)
+            if not gram_tokens:
+                del self.gram_tokens[gram]
+        if self.bk_tree is not None:
+            self.bk_tree.remove(word)
+
+    def apply_diff(self, diff, remap=None):
+        """Update the postings for a CatalogDiff already applied to the indexed store"""
+        for item_id, old_item, item in diff.changed:
+            for word in set(self.item_words(old_item)):
+                self.token_postings[self.token_ids[word]].remove(item_id)
+            self._insert_item(item_id, item)
+
+        if remap is not None:
+            self.token_postings = [
+                [remap[item_id] for item_id in postings if remap[item_id] >= 0] for postings in self.token_postings
+            ]
+            self.item_count = sum(1 for new_id in remap if new_id >= 0)
+
+        for item in diff.added:
+            self._add_item(self.item_count, item)
+            self.item_count += 1
+
+        for token_id, postings in enumerate(self.token_postings):
+            if not postings and self.tokens[token_id] is not None:
+                self._remove_token(token_id)
+
+        with self.cache_lock:
+            self.term_cache.clear()
+
+    def word_postings(self, word):
+        """Return the ids of the items having exactly this word"""
+        token_id = self.token_ids.get(word)
+        return self.token_postings[token_id] if token_id is not None else ()
+
+    def match_term(self, term):
+        """Return {item id: similarity in (0, 1]} for the items with a word close to the term"""
+        if len(term) < FUZZY_MIN_TERM_LENGTH:
+            return {}
+        with self.cache_lock:
+            cached = self.term_cache.get(term)
+            if cached is not None:
+                self.term_cache.move_to_end(term)
+                return cached
+
+        item_scores = self._score_term(term)
+        with self.cache_lock:
+            self.term_cache[term] = item_scores
+            while len(self.term_cache) > SEARCH_CACHE_SIZE:
+                self.term_cache.popitem(last=False)
+        return item_scores
+
+    def _score_term(self, term):
+        """Score the items whose words share trigrams with the term or lie within a few edits of it"""
+
+        # Only tokens sharing a trigram with the term are scored
+        grams = trigrams(term)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.gram_tokens.get(gram, ()))
+        token_scores = {}
+        for token_id, shared_count in shared.items():
+            similarity = 2 * shared_count / (len(grams) + self.token_gram_counts[token_id])
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                token_scores[token_id] = similarity
+
+        if self.bk_tree is not None:
+            for token_id, distance in self.bk_tree.search(term, max_edit_distance(term)):
+                similarity = 1 - distance / max(len(term), len(self.tokens[token_id]))
+                token_scores[token_id] = max(token_scores.get(token_id, 0), similarity)
+
+        item_scores = {}
+        for token_id, similarity in token_scores.items():
+            for item_id in self.token_postings[token_id]:
+                if similarity > item_scores.get(item_id, 0):
+                    item_scores[item_id] = similarity
+        return item_scores
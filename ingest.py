@@ -0,0 +1,179 @@
+"""
+Ingest raw game rod dumps into ProcessedData.
+
+Every `BackupJsonDev/<rodtype>.json` file holds a `gameRods` list in the raw
+game schema plus `canUse*` flags for the whole file. Changed files are parsed
+and normalised into the processed schema across a process pool; unchanged
+files (by content hash) reuse the rods recorded in the ingest manifest. The
+merged catalog is deduplicated by rod name and written atomically, only when
+its contents actually changed.
+
+Usage:
+    python ingest.py [--source DIR] [--output PATH] [--workers N] [--force]
+"""
+import argparse
+import glob
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config import *
+from catalog_snapshot import file_hash
+
+
+def rod_price(raw_rod):
+    """Return the price label from the first non-zero raw cost field"""
+    for field, currency in RAW_PRICE_FIELDS:
+        amount = raw_rod.get(field) or 0
+        if amount:
+            return f"{amount} {currency}"
+    return f"0 {RAW_PRICE_FIELDS[0][1]}"
+
+
+def rod_category(flags):
+    """Return the processed category (e.g. 'SpinningReel&Lure') for a file's canUse* flags"""
+    reel = next((label for flag, label in RAW_REEL_FLAGS if flags.get(flag)), None)
+    if reel is None:
+        return OTHER_ROD_CATEGORY
+    rig = next((label for flag, label in RAW_RIG_FLAGS if flags.get(flag)), DEFAULT_RIG)
+    return f"{reel}&{rig}"
+
+
+def normalize_rod(raw_rod, rodtype, category):
+    """Convert one raw gameRods entry into the processed rod schema"""
+    brand = raw_rod.get('rodBrand', '')
+    rod = {
+        'name': raw_rod.get('rodName', ''),
+        'brand': BRAND_ALIASES.get(brand, brand),
+        'length': f"{raw_rod.get('rodLength', 0)}m",
+        'level': raw_rod.get('rodLevel', 0),
+        'price': rod_price(raw_rod),
+        'category': category,
+        'rodtype': rodtype,
+        # Line weight keeps the raw min/max order; EquipmentStore orders the parsed pair
+        'lineWeight': (f"{raw_rod.get('rodLineWeightMinimum')}-"
+                       f"{raw_rod.get('rodLineWeightMaximum')} kg")
+    }
+    if 'rodLureWeightMinimum' in raw_rod:
+        rod['lureWeight'] = (f"{raw_rod['rodLureWeightMinimum']}-"
+                             f"{raw_rod.get('rodLureWeightMaximum')} g")
+    if 'castingWeightMin' in raw_rod:
+        rod['castingWeight'] = (f"{raw_rod['castingWeightMin']}-"
+                                f"{raw_rod.get('castingWeightMax')} g")
+    rod['type'] = 'rod'
+    return rod
+
+
+def normalize_rod_file(path):
+    """Worker: parse one raw dump file and normalise its rods"""
+    with open(path, 'r') as file:
+        dump = json.load(file)
+    rodtype = os.path.splitext(os.path.basename(path))[0]
+    category = rod_category(dump)
+    return [normalize_rod(raw_rod, rodtype, category) for raw_rod in dump.get('gameRods', [])]
+
+
+def source_order(path):
+    """Sort key placing known rod types in processed-file order, unknown ones after"""
+    rodtype = os.path.splitext(os.path.basename(path))[0]
+    if rodtype in INGEST_ROD_TYPE_ORDER:
+        return (0, INGEST_ROD_TYPE_ORDER.index(rodtype), rodtype)
+    return (1, 0, rodtype)
+
+
+def load_manifest(manifest_path):
+    """Return the recorded {path: {'sha1', 'rods'}} entries, or {} when missing or outdated"""
+    try:
+        with open(manifest_path, 'r') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('format_version') != INGEST_FORMAT_VERSION:
+        return {}
+    return manifest.get('sources', {})
+
+
+def write_atomic(path, text):
+    """Write text to path through a temporary file in the same directory"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', dir=directory, delete=False) as file:
+        file.write(text)
+    os.replace(file.name, path)
+
+
+def dedupe_rods(rods_by_source):
+    """Merge per-source rod lists, keeping the first rod seen for every name"""
+    seen = set()
+    rods = []
+    for path, source_rods in rods_by_source:
+        for rod in source_rods:
+            if rod['name'] in seen:
+                print(INGEST_DUPLICATE_MESSAGE.format(rod['name'], path))
+                continue
+            seen.add(rod['name'])
+            rods.append(rod)
+    return rods
+
+
+def ingest_rods(source_dir=RAW_RODS_DIR, output_path=PROCESSED_RODS_PATH,
+                manifest_path=INGEST_MANIFEST_PATH, workers=INGEST_WORKERS, force=False):
+    """
+    Rebuild the processed rods file from raw dumps, re-parsing only changed files.
+
+    Returns a summary dict with the rod count, the files re-parsed and whether
+    the output file was rewritten.
+    """
+    start = time.perf_counter()
+    paths = sorted(glob.glob(os.path.join(source_dir, '*.json')), key=source_order)
+    manifest = {} if force else load_manifest(manifest_path)
+
+    hashes = {path: file_hash(path) for path in paths}
+    changed = [path for path in paths if manifest.get(path, {}).get('sha1') != hashes[path]]
+
+    # Parse changed dumps in parallel; a single file is not worth a pool
+    if len(changed) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = dict(zip(changed, pool.map(normalize_rod_file, changed)))
+    else:
+        parsed = {path: normalize_rod_file(path) for path in changed}
+
+    sources = {
+        path: {'sha1': hashes[path], 'rods': parsed[path] if path in parsed else manifest[path]['rods']}
+        for path in paths
+    }
+    rods = dedupe_rods((path, sources[path]['rods']) for path in paths)
+
+    output_text = json.dumps(rods, indent=2)
+    written = False
+    try:
+        with open(output_path, 'r') as file:
+            unchanged = file.read() == output_text
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        write_atomic(output_path, output_text)
+        written = True
+    if changed or set(manifest) != set(sources):
+        write_atomic(manifest_path, json.dumps({'format_version': INGEST_FORMAT_VERSION, 'sources': sources}))
+
+    elapsed = time.perf_counter() - start
+    print(INGEST_SUMMARY_MESSAGE.format(
+        len(rods), len(paths), len(changed), elapsed * 1000, 'written' if written else 'unchanged'))
+    return {'rods': len(rods), 'changed': changed, 'written': written}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest raw game rod dumps into the processed rods file")
+    parser.add_argument('--source', default=RAW_RODS_DIR, help="folder with the raw <rodtype>.json dumps")
+    parser.add_argument('--output', default=PROCESSED_RODS_PATH, help="processed rods file to write")
+    parser.add_argument('--manifest', default=INGEST_MANIFEST_PATH, help="hash manifest for incremental runs")
+    parser.add_argument('--workers', type=int, default=INGEST_WORKERS, help="process pool size")
+    parser.add_argument('--force', action='store_true', help="re-parse every dump")
+    args = parser.parse_args()
+    ingest_rods(args.source, args.output, args.manifest, args.workers, args.force)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+import math
+from config import LOADOUT_SCORES, LOADOUT_SLOTS, DEFAULT_LOADOUT_SCORE, SPAN_SUFFIX
+
+
+def score_column(store, column_name):
+    """Return a score column, deriving '<name>_span' columns as max - min"""
+    if column_name.endswith(SPAN_SUFFIX):
+        base = column_name[:-len(SPAN_SUFFIX)]
+        low, high = store.column(f"{base}_min"), store.column(f"{base}_max")
+        if low is None or high is None:
+            return None
+        return [high_value - low_value for low_value, high_value in zip(low, high)]
+    return store.column(column_name)
+
+
+def pareto_frontier(candidates, extra_columns=(), group_codes=None):
+    """
+    Drop dominated (score, amount, currency, index) candidates.
+
+    A candidate is dominated when another one in the same currency (and the
+    same group, when group codes are given) costs no more, scores at least as
+    much and is at least as large in every extra column. The frontier comes
+    back best score first, cheapest first on ties.
+    """
+    by_currency = {}
+    for candidate in candidates:
+        group = group_codes[candidate[3]] if group_codes is not None else None
+        by_currency.setdefault((candidate[2], group), []).append(candidate)
+
+    frontier = []
+    for currency_candidates in by_currency.values():
+        currency_candidates.sort(key=lambda candidate: (candidate[1], -candidate[0]))
+        kept = []
+        for candidate in currency_candidates:
+            score, _, _, index = candidate
+            extras = [column[index] for column in extra_columns]
+            if any(kept_score >= score and all(kept_extra >= extra for kept_extra, extra in zip(kept_extras, extras))
+                   for kept_score, kept_extras, _ in kept):
+                continue
+            kept.append((score, extras, candidate))
+        frontier.extend(candidate for _, _, candidate in kept)
+
+    frontier.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+    return frontier
+
+
+class LoadoutOptimizer:
+    """
+    Picks the best rod + reel + line + leader + hook under a level cap and budget.
+
+    The score is additive over slots (e.g. reel max drag plus line carry
+    weight), so each slot is first reduced to its Pareto frontier: items that
+    cost more and score less than another item in the same currency can never
+    be part of the best loadout. Reels are only compared within their reel
+    type and also have to keep their max drag, since more drag fits more rods;
+    lines are reduced per rod line weight range.
+    The remaining combinations are searched depth first, best scores first,
+    with a branch-and-bound cut on the best score the open slots could add.
+    Leaders and hooks only have to fit the level cap and the budget.
+    """
+
+    def __init__(self, stores, compatibility_index):
+        self.stores = stores
+        self.compatibility = compatibility_index
+
+    def optimize(self, level, budgets, score=DEFAULT_LOADOUT_SCORE):
+        """
+        Return the best loadout as {slot: item, 'score': float, 'cost': {currency: amount}},
+        or None when nothing fits. `budgets` maps a currency (CC, BC, CT) to the
+        amount available; currencies that are not listed cannot be spent.
+        """
+        weights = LOADOUT_SCORES[score] if isinstance(score, str) else score
+        budgets = {currency.upper(): amount for currency, amount in budgets.items()}
+        candidates = {slot: self._candidates(slot, level, budgets, weights.get(slot, {})) for slot in LOADOUT_SLOTS}
+        if not all(candidates.values()):
+            return None
+
+        reel_store = self.stores['reel']
+        reel_frontier = pareto_frontier(
+            candidates['reel'], [reel_store.column('max_drag')], reel_store.group_codes['reeltype'])
+        leader_frontier = pareto_frontier(candidates['leader'])
+        hook_frontier = pareto_frontier(candidates['hook'])
+        line_candidates = {candidate[3]: candidate for candidate in candidates['line']}
+        line_frontiers = {}
+
+        best_rest = (reel_frontier[0][0] + max(candidate[0] for candidate in candidates['line'])
+                     + leader_frontier[0][0] + hook_frontier[0][0])
+        best = [-math.inf, None]
+
+        for rod in sorted(candidates['rod'], key=lambda candidate: (-candidate[0], candidate[1])):
+            if rod[0] + best_rest <= best[0]:
+                break
+            rod_index = rod[3]
+            reels = [reel for reel in reel_frontier if self.compatibility.reel_fits_rod(reel[3], rod_index)]
+            lines = self._line_frontier(rod_index, line_candidates, line_frontiers)
+            if not reels or not lines:
+                continue
+            remaining = dict(budgets)
+            remaining[rod[2]] -= rod[1]
+            self._search([reels, lines, leader_frontier, hook_frontier], 0, rod[0], remaining, [rod], best)
+
+        best_score, best_choice = best
+        if best_choice is None:
+            return None
+        loadout = {'score': best_score, 'cost': {}}
+        for slot, (_, amount, currency, index) in zip(LOADOUT_SLOTS, best_choice):
+            loadout[slot] = self.stores[slot].items[index]
+            loadout['cost'][currency] = loadout['cost'].get(currency, 0) + amount
+        return loadout
+
+    def _candidates(self, slot, level, budgets, weights):
+        """Return (score, amount, currency, index) for every affordable item of a slot within the level cap"""
+        store = self.stores[slot]
+        levels = store.column('level')
+        prices = store.column('price')
+        columns = [(score_column(store, column_name), weight) for column_name, weight in weights.items()]
+
+        candidates = []
+        for index in range(len(store)):
+            currency = store.currency(index)
+            amount = prices[index] if prices is not None else math.nan
+            if currency not in budgets or math.isnan(amount) or amount > budgets[currency]:
+                continue
+            if levels is not None and not levels[index] <= level:
+                continue
+            score = 0.0
+            for column, weight in columns:
+                if column is not None and not math.isnan(column[index]):
+                    score += weight * column[index]
+            candidates.append((score, amount, currency, index))
+        return candidates
+
+    def _line_frontier(self, rod_index, line_candidates, line_frontiers):
+        """Return the Pareto frontier of the candidate lines fitting a rod, cached per line weight range"""
+        key = self.compatibility.rod_line_slices[rod_index]
+        frontier = line_frontiers.get(key)
+        if frontier is None:
+            fitting = self.compatibility.lines_for_rod(rod_index).indices
+            frontier = pareto_frontier([line_candidates[index] for index in fitting if index in line_candidates])
+            line_frontiers[key] = frontier
+        return frontier
+
+    def _search(self, slots, depth, score, remaining, chosen, best):
+        """Depth-first branch and bound over the remaining slots, keeping [best score, choice] in best"""
+        if depth == len(slots):
+            if score > best[0]:
+                best[0] = score
+                best[1] = list(chosen)
+            return
+
+        bound = sum(slot[0][0] for slot in slots[depth + 1:])
+        for candidate in slots[depth]:
+            if score + candidate[0] + bound <= best[0]:
+                break
+            candidate_score, amount, currency, _ = candidate
+            if amount > remaining[currency]:
+                continue
+            remaining[currency] -= amount
+            chosen.append(candidate)
+            self._search(slots, depth + 1, score + candidate_score, remaining, chosen, best)
+            chosen.pop()
+            remaining[currency] += amount
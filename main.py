@@ -1,10 +1,40 @@
+import argparse
+import os
+import time
 import dearpygui.dearpygui as dpg
-from config import WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE
+from config import *
 from data_manager import DataManager
+from profiling import profiler
+from UI.frame_scheduler import FrameScheduler
+from UI.hot_reload import HotReloader
+from UI.profiler_overlay import ProfilerOverlay
 from UI.display_manager import DisplayManager
 from UI.view_manager import ViewManager
 from UI.main_ui_orchestrator import MainUIOrchestrator
 
+def report_startup_time(data_manager, elapsed_seconds):
+    """Print the time to first frame and which catalogs were loaded for it"""
+    catalogs = ', '.join(
+        CATALOG_LOAD_MESSAGE.format(
+            name,
+            'snapshot' if data_manager.snapshot_status.get(name) else 'json',
+            load_time * 1000
+        )
+        for name, load_time in data_manager.catalogs.load_times.items()
+    )
+    print(STARTUP_TIME_MESSAGE.format(elapsed_seconds * 1000, catalogs))
+    
+    # Per-file parse times of the catalogs that had no usable snapshot
+    for name in data_manager.catalogs.load_times:
+        if name not in data_manager.parse_times:
+            continue
+        paths = data_manager.catalog_paths[name]
+        file_times = ', '.join(
+            CATALOG_FILE_TIME_FORMAT.format(os.path.basename(path), data_manager.file_load_times[path] * 1000)
+            for path in paths
+        )
+        print(CATALOG_FILES_MESSAGE.format(name, len(paths), data_manager.parse_times[name] * 1000, file_times))
+
 def main():
     dpg.create_context()
     dpg.create_viewport(width=WINDOW_WIDTH, height=WINDOW_HEIGHT, title=WINDOW_TITLE)
@@ -12,8 +42,13 @@ def main():
     
 
     
+    if PROFILING_ENABLED:
+        profiler.enable(item_source=dpg.get_all_items, use_cprofile=PROFILE_WITH_CPROFILE)
+    
+    startup_start = time.perf_counter()
+    frame_scheduler = FrameScheduler()
     data_manager = DataManager()
-    display_manager = DisplayManager(data_manager)
+    display_manager = DisplayManager(data_manager, frame_scheduler)
     view_manager = ViewManager(display_manager)
     
     # Setup the UI components
@@ -21,10 +56,41 @@ def main():
         
     # Skip fish and lake data - only show rods
     view_manager.show_rods()
+    report_startup_time(data_manager, time.perf_counter() - startup_start)
+    
+    # Load the remaining catalogs in the background once the first frames are up
+    if PREFETCH_CATALOGS:
+        dpg.set_frame_callback(PREFETCH_FRAME, data_manager.prefetch_catalogs)
+    
+    # Pick up catalog files regenerated while the app is running
+    if HOT_RELOAD_ENABLED:
+        HotReloader(data_manager, view_manager, frame_scheduler).start()
 
+    if PROFILING_ENABLED and PROFILER_OVERLAY:
+        ProfilerOverlay(profiler, frame_scheduler).show()
+    
     dpg.show_viewport()
-    dpg.start_dearpygui()
+    
+    # Drive the render loop manually so per-frame UI tasks run before each frame
+    while dpg.is_dearpygui_running():
+        frame_scheduler.run_frame()
+        dpg.render_dearpygui_frame()
+    if PROFILING_ENABLED:
+        profiler.dump(PROFILE_OUTPUT_DIR)
     dpg.destroy_context()
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+    parser.add_argument('--serve', action='store_true', help="run headless and answer catalog queries over localhost HTTP")
+    parser.add_argument('--host', default=QUERY_SERVER_HOST, help="address the query server binds to")
+    parser.add_argument('--port', type=int, default=QUERY_SERVER_PORT, help="port the query server listens on")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    args = parse_args()
+    if args.serve:
+        # The GUI never needs the HTTP server, so it is only imported for --serve
+        from query_server import serve
+        serve(DataManager(), args.host, args.port)
+    else:
+        main() 
\ No newline at end of file
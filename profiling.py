@@ -0,0 +1,155 @@
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from config import PROFILER_HISTORY_SIZE, PROFILE_DUMP_MESSAGE
+
+
+class Profiler:
+    """
+    Lightweight timings for the application's hot paths.
+
+    Entry points are wrapped with `timed` or `section`; while the profiler is
+    disabled those wrappers only check a flag. When enabled, every call is
+    recorded with its wall time and, for the outermost section on the UI
+    thread, the number of DearPyGui items it created and deleted (taken from
+    the item source, e.g. `dpg.get_all_items`). Nested sections report no
+    items, so the item list is walked once per top-level action rather than
+    once per timed call. Per-name totals and the last few actions are kept,
+    and can be written out as JSON, together with cProfile stats when the
+    session is also run under cProfile.
+    """
+
+    def __init__(self, history_size=PROFILER_HISTORY_SIZE):
+        self.enabled = False
+        self.item_source = None
+        self.ui_depth = 0
+        self.history = deque(maxlen=history_size)
+        self.totals = {}
+        self.lock = threading.Lock()
+        self.cprofile = None
+
+    def enable(self, item_source=None, use_cprofile=False):
+        """Start recording, optionally counting items and running cProfile"""
+        self.item_source = item_source
+        self.enabled = True
+        if use_cprofile and self.cprofile is None:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def disable(self):
+        """Stop recording"""
+        self.enabled = False
+        if self.cprofile is not None:
+            self.cprofile.disable()
+
+    def timed(self, name=None):
+        """Decorator recording every call of a function; usable bare or with a name"""
+        if callable(name):
+            return self.timed()(name)
+
+        def decorator(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.section(label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def section(self, name):
+        """Context manager recording the enclosed block under a name"""
+        if not self.enabled:
+            yield
+            return
+        on_ui_thread = self.item_source is not None and threading.current_thread() is threading.main_thread()
+        items_before = set(self.item_source()) if on_ui_thread and self.ui_depth == 0 else None
+        if on_ui_thread:
+            self.ui_depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if on_ui_thread:
+                self.ui_depth -= 1
+            created = deleted = 0
+            if items_before is not None:
+                items_after = set(self.item_source())
+                created = len(items_after - items_before)
+                deleted = len(items_before - items_after)
+            self.record(name, elapsed, created, deleted)
+
+    def record(self, name, elapsed, created=0, deleted=0):
+        """Record one timed action"""
+        with self.lock:
+            self.history.append((name, elapsed, created, deleted))
+            totals = self.totals.get(name)
+            if totals is None:
+                totals = self.totals[name] = {'count': 0, 'total': 0.0, 'max': 0.0, 'created': 0, 'deleted': 0}
+            totals['count'] += 1
+            totals['total'] += elapsed
+            totals['max'] = max(totals['max'], elapsed)
+            totals['created'] += created
+            totals['deleted'] += deleted
+
+    def recent(self, count):
+        """Return the last `count` actions as (name, seconds, items created, items deleted), newest first"""
+        with self.lock:
+            return list(self.history)[-count:][::-1]
+
+    def summary(self):
+        """Return per-name totals in milliseconds"""
+        with self.lock:
+            return {
+                name: {
+                    'count': totals['count'],
+                    'total_ms': totals['total'] * 1000,
+                    'mean_ms': totals['total'] * 1000 / totals['count'],
+                    'max_ms': totals['max'] * 1000,
+                    'items_created': totals['created'],
+                    'items_deleted': totals['deleted']
+                }
+                for name, totals in self.totals.items()
+            }
+
+    def dump(self, output_dir):
+        """Write the summary and recent actions as JSON, plus cProfile stats if collected; returns the paths"""
+        os.makedirs(output_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        json_path = os.path.join(output_dir, f"profile-{stamp}.json")
+        report = {
+            'summary': self.summary(),
+            'recent': [
+                {'name': name, 'ms': elapsed * 1000, 'items_created': created, 'items_deleted': deleted}
+                for name, elapsed, created, deleted in self.recent(len(self.history))
+            ]
+        }
+        with open(json_path, 'w') as file:
+            json.dump(report, file, indent=2)
+        paths = [json_path]
+
+        if self.cprofile is not None:
+            stats_path = os.path.join(output_dir, f"profile-{stamp}.prof")
+            self.cprofile.dump_stats(stats_path)
+            if self.enabled:
+                # Dumping stops the collector; keep profiling the rest of the session
+                self.cprofile.enable()
+            paths.append(stats_path)
+        for path in paths:
+            print(PROFILE_DUMP_MESSAGE.format(path))
+        return paths
+
+
+# Shared profiler used by the decorated entry points
+profiler = Profiler()
+timed = profiler.timed
+profile_section = profiler.section
@@ -0,0 +1,388 @@
+"""
+Headless catalog query server.
+
+Keeps a DataManager with every catalog and index loaded and answers JSON
+queries over localhost HTTP, so scripts pay for one catalog load instead of
+one per run. Start it with `python main.py --serve`.
+
+POST /query takes one query object, a list of them or {"queries": [...]},
+and answers {"version": data version, "result": ...} or {..., "results": [...]}
+in the same order. A query that fails gets {"error": message} in its place
+without failing the rest of the batch. GET /status lists the catalogs.
+
+Queries (every op takes "type", e.g. "rods"; lists take "sort", "offset" and "limit"):
+
+- {"op": "search", "query": "magfin level<=12 price<3000cc"} - search-box syntax
+- {"op": "filter", "ranges": {"max_drag": [8, null]}, "facets": {"brand": "magfin"},
+  "currency": "CC", "text": "spin"} - structured filters on parsed columns
+- {"op": "compatible", "name": "..."} or {"op": "compatible", "index": 12} -
+  compatible reels, lines or rods of an item ({} for types without compatibility data)
+- {"op": "best_value", "count": 10, "expression": "max_drag / price_cc", "weight": 1}
+
+"sort" is a parsed column name, "-column" for descending, or "value" for the best
+value ordering. List results are {"count": total matches, "indices": [...],
+"items": [...]} for the requested page.
+"""
+import http.client
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import *
+from equipment_query import EquipmentQuery, RangeFilter
+
+DESCENDING_PREFIX = '-'
+
+
+class QueryError(ValueError):
+    """A query that cannot be answered; reported back to the client"""
+
+
+class QueryService:
+    """
+    Answers catalog queries against a resident DataManager.
+
+    Answers are JSON text. They are cached, already encoded, in an LRU keyed
+    by the data manager's data version and the query itself, so a repeated
+    lookup is a dictionary hit with nothing left to serialize, and a catalog
+    reload makes every older entry unreachable. Changed catalog
+    files are picked up between requests, at most once per hot reload
+    interval. Queries run one at a time under a lock, so a reload never
+    interleaves with a lookup.
+    """
+
+    def __init__(self, data_manager, cache_size=QUERY_SERVER_CACHE_SIZE):
+        self.data_manager = data_manager
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.last_poll = time.monotonic()
+        self.name_indexes = {}
+        self.name_index_version = None
+        self.ops = {
+            'search': self._search,
+            'filter': self._filter,
+            'compatible': self._compatible,
+            'best_value': self._best_value
+        }
+
+    def load_all(self):
+        """Load every catalog and the compatibility index up front"""
+        for name in self.data_manager.catalogs.names():
+            self.data_manager.catalogs.get(name)
+
+    def execute(self, query):
+        """Answer one query, returning the JSON text of its result or of {"error": message}"""
+        return self.execute_versioned(query)[0]
+
+    def execute_versioned(self, query):
+        """Answer one query, returning (JSON text, data version it was answered at)"""
+        with self.lock:
+            self._poll_catalog_changes()
+            return self._execute(query), self.data_manager.data_version
+
+    def execute_batch(self, queries):
+        """Answer a list of queries in order, under a single catalog poll, as (JSON texts, data version)"""
+        if len(queries) > QUERY_SERVER_MAX_BATCH:
+            raise QueryError(QUERY_BATCH_SIZE_ERROR.format(QUERY_SERVER_MAX_BATCH))
+        with self.lock:
+            self._poll_catalog_changes()
+            return [self._execute(query) for query in queries], self.data_manager.data_version
+
+    def status(self):
+        """Return the data version and the item count of every loaded catalog"""
+        with self.lock:
+            return {
+                'version': self.data_manager.data_version,
+                'catalogs': {name: len(self.data_manager.store(name)) for name in self.data_manager.equipment_types
+                             if self.data_manager.catalogs.is_loaded(name)}
+            }
+
+    def _poll_catalog_changes(self):
+        """Reload catalogs whose files changed, at most once per poll interval"""
+        now = time.monotonic()
+        if not HOT_RELOAD_ENABLED or now - self.last_poll < HOT_RELOAD_POLL_SECONDS:
+            return
+        self.last_poll = now
+        for name in self.data_manager.poll_catalog_changes():
+            self.data_manager.reload_catalog(name)
+
+    def _execute(self, query):
+        """Answer a query from the cache or by running its op"""
+        try:
+            key = (self.data_manager.data_version, json.dumps(query, sort_keys=True))
+        except (TypeError, ValueError) as e:
+            return json.dumps({'error': str(e)})
+        answer = self.cache.get(key)
+        if answer is not None:
+            self.cache.move_to_end(key)
+            return answer
+
+        try:
+            if not isinstance(query, dict):
+                raise QueryError(QUERY_BODY_ERROR)
+            op = self.ops.get(query.get('op'))
+            if op is None:
+                raise QueryError(QUERY_UNKNOWN_OP_ERROR.format(query.get('op')))
+            result = op(query, self._equipment_type(query))
+        except (QueryError, ValueError, TypeError, KeyError, SyntaxError) as e:
+            # Errors are not cached: they are cheap and often fixed by the next request
+            return json.dumps({'error': str(e)})
+        except Exception as e:
+            # Anything else (e.g. a score expression that overflows) still only fails this query
+            return json.dumps({'error': QUERY_FAILED_ERROR.format(type(e).__name__, e)})
+
+        answer = self.cache[key] = json.dumps(result)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return answer
+
+    def _equipment_type(self, query):
+        """Return the validated equipment type name of a query"""
+        name = query.get('type')
+        if not isinstance(name, str) or name not in self.data_manager.equipment_types:
+            raise QueryError(QUERY_UNKNOWN_TYPE_ERROR.format(name))
+        return name
+
+    # ==================== OPS ====================
+
+    def _search(self, query, name):
+        """Search-box query: free text plus `field<op>value` filters"""
+        return self._page(query, name, EquipmentQuery.parse(str(query.get('query', ''))))
+
+    def _filter(self, query, name):
+        """Structured query: {column: [low, high]} ranges, facets, currency and free text"""
+        columns = self.data_manager.store(name).columns
+        ranges = []
+        for column, bounds in self._field(query, 'ranges', dict, 'an object', {}).items():
+            if column not in columns:
+                raise QueryError(QUERY_RANGE_COLUMN_ERROR.format(column, name))
+            if not isinstance(bounds, list) or len(bounds) != 2 or not all(map(self._is_bound, bounds)):
+                raise QueryError(QUERY_RANGE_ERROR.format(column))
+            ranges.append(RangeFilter(column, *bounds))
+        facets = {field: str(value).lower()
+                  for field, value in self._field(query, 'facets', dict, 'an object', {}).items()}
+        currency = self._field(query, 'currency', str, 'a string')
+        equipment_query = EquipmentQuery(
+            str(query.get('text', '')).lower(), ranges, facets, currency.upper() if currency else None)
+        return self._page(query, name, equipment_query)
+
+    def _compatible(self, query, name):
+        """Compatible gear of one item, found by catalog index or name"""
+        store = self.data_manager.store(name)
+        item = store.items[self._item_index(query, name)]
+        limit = self._count(query, 'limit', QUERY_SERVER_DEFAULT_LIMIT)
+        return {
+            kind: self._item_list(self.data_manager.store(kind), list(items), 0, limit)
+            for kind, items in self.data_manager.get_compatible_gear(item, name).items()
+        }
+
+    def _best_value(self, query, name):
+        """Top items by a value score expression"""
+        expression = self._field(query, 'expression', str, 'a string')
+        weight = query.get('weight')
+        if not self._is_bound(weight):
+            raise QueryError(QUERY_FIELD_TYPE_ERROR.format('weight', 'a number'))
+        items = self.data_manager.best_value(
+            name, self._count(query, 'count', QUERY_SERVER_DEFAULT_LIMIT) or 0, expression, weight)
+        return self._item_list(self.data_manager.store(name), list(items), 0, None)
+
+    # ==================== HELPERS ====================
+
+    def _page(self, query, name, equipment_query):
+        """Run a structured query and return the requested page of its results"""
+        sort = self._sort(self._field(query, 'sort', str, 'a string'), name)
+        offset = self._count(query, 'offset', 0) or 0
+        limit = self._count(query, 'limit', QUERY_SERVER_DEFAULT_LIMIT)
+        view = self.data_manager.query(name, equipment_query, sort)
+        end = len(view) if limit is None else offset + limit
+        return {
+            'count': len(view),
+            'indices': [int(index) for index in view.indices[offset:end]],
+            'items': list(view[offset:end])
+        }
+
+    @staticmethod
+    def _field(query, field, field_type, type_name, default=None):
+        """Return an optional query field, rejecting values of the wrong JSON type"""
+        value = query.get(field)
+        if value is None:
+            return default
+        if not isinstance(value, field_type):
+            raise QueryError(QUERY_FIELD_TYPE_ERROR.format(field, type_name))
+        return value
+
+    @staticmethod
+    def _is_bound(value):
+        """Check whether a JSON value is a number (or null) usable as a range bound or weight"""
+        return value is None or isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    @staticmethod
+    def _count(query, field, default):
+        """Return a non-negative integer field such as an offset or limit; null stays None"""
+        value = query.get(field, default)
+        if value is None:
+            return None
+        value = int(value)
+        if value < 0:
+            raise QueryError(QUERY_NEGATIVE_ERROR.format(field))
+        return value
+
+    def _sort(self, sort, name):
+        """Turn "column" / "-column" / "value" into a (column, descending) sort option"""
+        if not sort:
+            return None
+        if sort == VALUE_SORT_COLUMN:
+            return VALUE_SORT_COLUMN, True
+        column, descending = sort, False
+        if sort.startswith(DESCENDING_PREFIX):
+            column, descending = sort[len(DESCENDING_PREFIX):], True
+        if column not in self.data_manager.store(name).columns:
+            raise QueryError(QUERY_SORT_COLUMN_ERROR.format(column, name))
+        return column, descending
+
+    def _item_index(self, query, name):
+        """Return the catalog index of the item a query names"""
+        if 'index' in query:
+            index = int(query['index'])
+            if not 0 <= index < len(self.data_manager.store(name)):
+                raise QueryError(QUERY_UNKNOWN_ITEM_ERROR.format(name, index))
+            return index
+
+        # Item labels are indexed once per catalog and data version
+        if self.name_index_version != self.data_manager.data_version:
+            self.name_indexes = {}
+            self.name_index_version = self.data_manager.data_version
+        name_index = self.name_indexes.get(name)
+        if name_index is None:
+            name_index = self.name_indexes[name] = {}
+            for index, item in enumerate(self.data_manager.store(name).items):
+                name_index.setdefault(self.data_manager.format_item_label(item), index)
+        item_name = query.get('name')
+        if item_name not in name_index:
+            raise QueryError(QUERY_UNKNOWN_ITEM_ERROR.format(name, item_name))
+        return name_index[item_name]
+
+    @staticmethod
+    def _item_list(store, items, offset, limit):
+        """Return {"count", "indices", "items"} for a page of store items"""
+        page = items[offset:] if limit is None else items[offset:offset + int(limit)]
+        return {
+            'count': len(items),
+            'indices': [store.index_of(item) for item in page],
+            'items': page
+        }
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of the query service; connections are kept alive between requests"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this each small response waits for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/status':
+            self._send_json(200, self.server.service.status())
+        else:
+            self._send_json(404, {'error': self.path})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/query':
+            self._send_json(404, {'error': self.path})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'null')
+        except ValueError:
+            self._send_json(400, {'error': QUERY_BODY_ERROR})
+            return
+
+        service = self.server.service
+        try:
+            if isinstance(body, dict) and 'queries' in body:
+                body = body['queries']
+            if isinstance(body, list):
+                # Cached answers are already JSON, so the response is joined rather than re-encoded
+                answers, version = service.execute_batch(body)
+                response = '{"results": [' + ', '.join(answers) + ']'
+            elif isinstance(body, dict):
+                answer, version = service.execute_versioned(body)
+                response = '{"result": ' + answer
+            else:
+                raise QueryError(QUERY_BODY_ERROR)
+        except QueryError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        self._send_body(200, f'{response}, "version": {version}}}')
+
+    def _send_json(self, status, payload):
+        """Send a JSON payload"""
+        self._send_body(status, json.dumps(payload))
+
+    def _send_body(self, status, text):
+        """Send JSON text with an explicit length so the connection can be reused"""
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scripts send thousands of lookups; per-request logging would dominate the output
+        pass
+
+
+class QueryServer(ThreadingHTTPServer):
+    """Threaded localhost HTTP server bound to a query service"""
+
+    daemon_threads = True
+
+    def __init__(self, service, host=QUERY_SERVER_HOST, port=QUERY_SERVER_PORT):
+        super().__init__((host, port), QueryRequestHandler)
+        self.service = service
+
+
+class QueryClient:
+    """
+    Minimal client for scripts: one kept-alive connection, JSON in and out.
+
+        client = QueryClient()
+        results = client.batch([{'op': 'search', 'type': 'rods', 'query': 'magfin'}, ...])
+    """
+
+    def __init__(self, host=QUERY_SERVER_HOST, port=QUERY_SERVER_PORT):
+        self.connection = http.client.HTTPConnection(host, port)
+
+    def _post(self, payload):
+        body = json.dumps(payload)
+        self.connection.request('POST', '/query', body, {'Content-Type': 'application/json'})
+        return json.loads(self.connection.getresponse().read())
+
+    def query(self, query):
+        """Run one query and return its result"""
+        return self._post(query)['result']
+
+    def batch(self, queries):
+        """Run a list of queries in one request and return their results in order"""
+        return self._post({'queries': list(queries)})['results']
+
+    def close(self):
+        self.connection.close()
+
+
+def serve(data_manager, host=QUERY_SERVER_HOST, port=QUERY_SERVER_PORT):
+    """Load every catalog, then answer queries until interrupted"""
+    load_start = time.perf_counter()
+    service = QueryService(data_manager)
+    service.load_all()
+    server = QueryServer(service, host, port)
+    print(QUERY_SERVER_START_MESSAGE.format(
+        host, server.server_address[1], len(data_manager.catalogs.names()), (time.perf_counter() - load_start) * 1000))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,221 @@
+import bisect
+import threading
+from collections import OrderedDict
+from config import SEARCH_NGRAM_SIZE, SEARCH_CACHE_SIZE
+
+
+class SearchIndex:
+    """
+    Inverted search index over the displayed field values of an equipment list.
+
+    Every displayed value is lowercased and split into whitespace separated
+    tokens. Each token gets a postings list of the item ids it occurs in, and
+    the token vocabulary itself is indexed by its character n-grams of the
+    configured size only (a shorter token by itself). A query term matches an
+    item when it is a substring of one of the item's tokens, so searches are
+    answered by intersecting n-gram postings over the (small) vocabulary and
+    merging the token postings of the surviving tokens; a term shorter than
+    an n-gram collects the tokens of every n-gram containing it. Multiple
+    whitespace separated query terms must all match.
+
+    Recent query results are kept in a small LRU. A query that extends a
+    cached one (typing further) is answered by re-checking only the cached
+    result against each item's token text, so every refinement costs time
+    proportional to the previous result size rather than the catalog size.
+    """
+
+    def __init__(self, items, fields, format_value=None, ngram_size=SEARCH_NGRAM_SIZE):
+        self.fields = list(fields)
+        self.ngram_size = ngram_size
+        self.format_value = format_value or (lambda field, value: str(value))
+        self.item_count = 0
+        self.tokens = []
+        self.token_ids = {}
+        self.token_postings = []
+        self.gram_postings = {}
+        self.item_texts = []
+        self.result_cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.build(items)
+
+    def __getstate__(self):
+        # The value formatter is usually a bound method; it is re-attached after unpickling
+        state = self.__dict__.copy()
+        state['format_value'] = None
+        state['result_cache'] = None
+        state['cache_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.format_value = self.format_value or (lambda field, value: str(value))
+        self.result_cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+
+    def build(self, items):
+        """Build the token and n-gram postings for the given items"""
+        self.item_count = 0
+        self.tokens = []
+        self.token_ids = {}
+        self.token_postings = []
+        self.gram_postings = {}
+        self.item_texts = []
+        self.result_cache = OrderedDict()
+        for item in items:
+            self._add_item(self.item_count, item)
+            self.item_count += 1
+
+    def _add_item(self, item_id, item):
+        """Add postings for the displayed field values of a single item"""
+        tokens = self.item_tokens(item)
+        self.item_texts.append(' '.join(tokens))
+        for token in tokens:
+            token_id = self.token_ids.get(token)
+            if token_id is None:
+                token_id = self._add_token(token)
+            postings = self.token_postings[token_id]
+            if not postings or postings[-1] != item_id:
+                postings.append(item_id)
+
+    def apply_diff(self, diff, remap=None):
+        """
+        Update the postings for a CatalogDiff already applied to the indexed
+        store (see EquipmentStore.apply_diff, which returns `remap`). Only the
+        changed and added items are tokenized again.
+        """
+        for item_id, old_item, item in diff.changed:
+            for token in set(self.item_tokens(old_item)):
+                self.token_postings[self.token_ids[token]].remove(item_id)
+            self._insert_item(item_id, item)
+
+        if remap is not None:
+            self.token_postings = [
+                [remap[item_id] for item_id in postings if remap[item_id] >= 0] for postings in self.token_postings
+            ]
+            self.item_texts = [text for item_id, text in enumerate(self.item_texts) if remap[item_id] >= 0]
+            self.item_count = len(self.item_texts)
+
+        for item in diff.added:
+            self._add_item(self.item_count, item)
+            self.item_count += 1
+
+        with self.cache_lock:
+            self.result_cache.clear()
+
+    def _insert_item(self, item_id, item):
+        """Re-index an existing item id, keeping postings sorted"""
+        tokens = self.item_tokens(item)
+        self.item_texts[item_id] = ' '.join(tokens)
+        for token in set(tokens):
+            token_id = self.token_ids.get(token)
+            if token_id is None:
+                token_id = self._add_token(token)
+            bisect.insort(self.token_postings[token_id], item_id)
+
+    def _add_token(self, token):
+        """Register a new vocabulary token and index its n-grams"""
+        token_id = len(self.tokens)
+        self.tokens.append(token)
+        self.token_ids[token] = token_id
+        self.token_postings.append([])
+        for gram in self._token_grams(token):
+            self.gram_postings.setdefault(gram, []).append(token_id)
+        return token_id
+
+    def _token_grams(self, token):
+        """Return the n-grams of a token, or the token itself when it is no longer than one n-gram"""
+        size = self.ngram_size
+        if len(token) <= size:
+            return (token,)
+        return {token[start:start + size] for start in range(len(token) - size + 1)}
+
+    def item_tokens(self, item):
+        """Return the lowercase tokens of an item's displayed field values"""
+        tokens = []
+        for field in self.fields:
+            if field in item:
+                tokens.extend(self.format_value(field, item[field]).lower().split())
+        return tokens
+
+    def search(self, query):
+        """Return the sorted ids of items matching every term of the query"""
+        terms = query.lower().split()
+        if not terms:
+            return list(range(self.item_count))
+
+        query_key = ' '.join(terms)
+        with self.cache_lock:
+            cached = self.result_cache.get(query_key)
+            if cached is not None:
+                self.result_cache.move_to_end(query_key)
+                return cached
+            prefix_key = self._cached_prefix_key(query_key)
+            prefix_result = self.result_cache[prefix_key] if prefix_key is not None else None
+
+        if prefix_result is not None:
+            # The cached result already satisfies the prefix query's terms
+            prefix_terms = set(prefix_key.split())
+            result = self._refine(prefix_result, [term for term in terms if term not in prefix_terms])
+        else:
+            result = self._search_postings(terms)
+
+        with self.cache_lock:
+            self.result_cache[query_key] = result
+            while len(self.result_cache) > SEARCH_CACHE_SIZE:
+                self.result_cache.popitem(last=False)
+        return result
+
+    def _cached_prefix_key(self, query_key):
+        """Return the longest cached query that the new query extends"""
+        best_key = None
+        for cached_key in self.result_cache:
+            if query_key.startswith(cached_key) and (best_key is None or len(cached_key) > len(best_key)):
+                best_key = cached_key
+        return best_key
+
+    def _refine(self, previous_result, terms):
+        """Filter a previous result down to the items matching every term"""
+        item_texts = self.item_texts
+        result = previous_result
+        for term in terms:
+            result = [item_id for item_id in result if term in item_texts[item_id]]
+        return result
+
+    def _search_postings(self, terms):
+        """Answer a query from the postings lists"""
+        result = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            matches = self._match_term(term)
+            result = matches if result is None else result & matches
+            if not result:
+                return []
+        return sorted(result)
+
+    def _match_term(self, term):
+        """Return the set of item ids with a token containing the term"""
+        item_ids = set()
+        for token_id in self._matching_tokens(term):
+            item_ids.update(self.token_postings[token_id])
+        return item_ids
+
+    def _matching_tokens(self, term):
+        """Return ids of vocabulary tokens that contain the term as a substring"""
+        if len(term) < self.ngram_size:
+            # Only full-size n-grams are indexed: a shorter term matches the tokens of every n-gram containing it
+            token_ids = set()
+            for gram, postings in self.gram_postings.items():
+                if term in gram:
+                    token_ids.update(postings)
+            return token_ids
+        if len(term) == self.ngram_size:
+            return self.gram_postings.get(term, ())
+
+        gram_sets = []
+        for start in range(len(term) - self.ngram_size + 1):
+            postings = self.gram_postings.get(term[start:start + self.ngram_size])
+            if not postings:
+                return ()
+            gram_sets.append(postings)
+        gram_sets.sort(key=len)
+        candidates = set(gram_sets[0]).intersection(*gram_sets[1:])
+        return [token_id for token_id in candidates if term in self.tokens[token_id]]
@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import *
+from UI.card_render_cache import CardRenderCache, CardRenderModel
+
+
+def build_model(item):
+    return CardRenderModel(item, [item['name']], [])
+
+
+class CardRenderCacheTest(unittest.TestCase):
+    """The render cache keeps only the most recently shown cards"""
+
+    def setUp(self):
+        self.items = [{'name': f'Rod {number}'} for number in range(10)]
+
+    def test_least_recently_shown_model_is_evicted(self):
+        cache = CardRenderCache(capacity=3)
+        for item in self.items[:3]:
+            cache.get(item, build_model)
+        cache.get(self.items[0], build_model)
+        cache.get(self.items[3], build_model)
+
+        self.assertEqual(len(cache), 3)
+        self.assertIn(id(self.items[0]), cache.models)
+        self.assertNotIn(id(self.items[1]), cache.models)
+
+    def test_cached_model_is_reused(self):
+        cache = CardRenderCache(capacity=3)
+        model = cache.get(self.items[0], build_model)
+        self.assertIs(cache.get(self.items[0], build_model), model)
+
+    def test_reserve_grows_to_a_few_grid_pages(self):
+        cache = CardRenderCache(capacity=2)
+        cache.reserve(2)
+        self.assertEqual(cache.capacity, 2 * CARD_RENDER_CACHE_PAGES)
+        cache.reserve(1)
+        self.assertEqual(cache.capacity, 2 * CARD_RENDER_CACHE_PAGES)
+        for item in self.items:
+            cache.get(item, build_model)
+        self.assertEqual(len(cache), min(len(self.items), 2 * CARD_RENDER_CACHE_PAGES))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dearpygui.dearpygui as dpg
+from config import *
+from data_manager import DataManager
+from UI.ui_card_layout import UICardLayout
+
+
+class CatalogReloadTest(unittest.TestCase):
+    """Reloading a changed catalog keeps displayed items usable and shows the new values"""
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.rods_path = os.path.join(self.work_dir.name, 'rods.json')
+        shutil.copy(PROCESSED_RODS_PATH, self.rods_path)
+        self.data_manager = DataManager(rods_path=self.rods_path, snapshot_dir=self.work_dir.name)
+        dpg.create_context()
+        dpg.create_viewport(width=WINDOW_WIDTH, height=WINDOW_HEIGHT)
+        dpg.setup_dearpygui()
+        with dpg.window(tag=UI_TAGS['main_window'], width=WINDOW_WIDTH, height=WINDOW_HEIGHT):
+            self.group = dpg.add_group()
+
+    def tearDown(self):
+        dpg.destroy_context()
+        self.work_dir.cleanup()
+
+    def reload_with_price(self, position, price):
+        """Rewrite one rod's price on disk and hot-reload the rods catalog"""
+        with open(self.rods_path) as file:
+            rods = json.load(file)
+        rods[position]['price'] = price
+        with open(self.rods_path, 'w') as file:
+            json.dump(rods, file)
+        return self.data_manager.reload_catalog('rods')
+
+    def shown_texts(self):
+        return {dpg.get_value(item) for item in dpg.get_all_items()
+                if dpg.get_item_type(item) == 'mvAppItemType::mvText' and dpg.is_item_shown(item)}
+
+    def test_unchanged_items_are_still_located(self):
+        unchanged = self.data_manager.rod_store.items[1]
+        self.reload_with_price(0, '9999 CC')
+        store, index = self.data_manager.locate_item(unchanged)
+        self.assertIs(store.items[index], unchanged)
+        self.assertIs(store, self.data_manager.rod_store)
+
+    def test_grid_shows_reloaded_values(self):
+        layout = UICardLayout(self.data_manager)
+        layout.display_virtual_grid(self.data_manager.get_by_category('rods'), self.group)
+        first_category, first_items = next(iter(self.data_manager.get_by_category('rods').items()))
+        position = self.data_manager.rod_store.index_of(first_items[0])
+        self.assertNotIn('Price: 9999 CC', self.shown_texts())
+
+        diff = self.reload_with_price(position, '9999 CC')
+        self.assertTrue(layout.patch_cards(self.group, diff, self.data_manager.get_by_category('rods')))
+        self.assertIn('Price: 9999 CC', self.shown_texts())
+
+
+if __name__ == '__main__':
+    unittest.main()
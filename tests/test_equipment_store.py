@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from equipment_store import EquipmentStore
+
+
+class PriceSortTest(unittest.TestCase):
+    """Prices sort by currency first and by amount within a currency"""
+
+    def setUp(self):
+        # Unpriced padding makes small selections take the rank path instead of walking the whole order
+        prices = ['500 CC', '32 BC', '1900 CC', None, '10 BC', '700'] + [None] * 14
+        self.store = EquipmentStore([{'name': str(i), 'price': price} for i, price in enumerate(prices)])
+        self.store.presort(['price'])
+
+    def sorted_prices(self, indices, descending=False):
+        return [self.store.items[index]['price'] for index in self.store.sort_indices(indices, 'price', descending)]
+
+    def test_ascending_groups_currencies(self):
+        expected = ['500 CC', '1900 CC', '10 BC', '32 BC', '700', None]
+        self.assertEqual(self.sorted_prices(range(6)), expected)
+        self.assertEqual(self.sorted_prices([4, 0]), ['500 CC', '10 BC'])
+
+    def test_descending_reverses_within_and_across_currencies(self):
+        self.assertEqual(self.sorted_prices(range(6), descending=True), ['700', '32 BC', '10 BC', '1900 CC', '500 CC', None])
+
+    def test_reload_keeps_currency_order(self):
+        from catalog_reload import diff_items
+        items = [dict(item) for item in self.store.items]
+        items[2]['price'] = '5 BC'
+        self.store.apply_diff(diff_items(self.store.items, items, ['name']))
+        self.assertEqual(self.sorted_prices(range(6)), ['500 CC', '5 BC', '10 BC', '32 BC', '700', None])
+
+
+if __name__ == '__main__':
+    unittest.main()
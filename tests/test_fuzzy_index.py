@@ -0,0 +1,43 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog_reload import CatalogDiff
+from fuzzy_index import FuzzyIndex
+
+
+class FuzzyIndexDiffTest(unittest.TestCase):
+    """Applying a reload diff keeps postings sorted and drops words no item has"""
+
+    def setUp(self):
+        self.items = [{'name': 'Magfin Spin'}, {'name': 'Spin Master'}, {'name': 'Feeder Pro'}]
+        self.index = FuzzyIndex(self.items, ['name'])
+
+    def test_changed_item_keeps_postings_sorted(self):
+        self.index.apply_diff(CatalogDiff(changed=[(0, self.items[0], {'name': 'Magfin Feeder'})]))
+        self.assertEqual(self.index.word_postings('feeder'), [0, 2])
+        self.assertEqual(self.index.word_postings('spin'), [1])
+
+    def test_word_no_item_has_is_pruned(self):
+        self.index.apply_diff(CatalogDiff(changed=[(0, self.items[0], {'name': 'Carp Spin'})]))
+        self.assertNotIn('magfin', self.index.token_ids)
+        self.assertNotIn('magfinspin', self.index.token_ids)
+        self.assertEqual(self.index.match_term('magfin'), {})
+        self.assertEqual(self.index.match_term('magfim'), {})
+
+    def test_removed_item_words_are_pruned(self):
+        self.index.apply_diff(CatalogDiff(removed=[(2, self.items[2])]), remap=[0, 1, -1])
+        self.assertNotIn('feeder', self.index.token_ids)
+        self.assertEqual(self.index.match_term('feedr'), {})
+
+    def test_pruned_word_can_come_back(self):
+        self.index.apply_diff(CatalogDiff(changed=[(0, self.items[0], {'name': 'Carp Spin'})]))
+        self.index.apply_diff(CatalogDiff(added=[{'name': 'Magfin Rod'}]))
+        self.assertEqual(self.index.word_postings('magfin'), [3])
+        self.assertEqual(set(self.index.match_term('magfim')), {3})
+
+
+if __name__ == '__main__':
+    unittest.main()
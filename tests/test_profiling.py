@@ -0,0 +1,46 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profiling import Profiler
+
+
+class ProfilerItemCountTest(unittest.TestCase):
+    """UI items are counted around the outermost section only"""
+
+    def setUp(self):
+        self.items = set()
+        self.snapshots = 0
+        self.profiler = Profiler()
+        self.profiler.enable(item_source=self.item_source)
+
+    def item_source(self):
+        self.snapshots += 1
+        return list(self.items)
+
+    def test_nested_sections_do_not_snapshot_items(self):
+        with self.profiler.section('outer'):
+            self.items.add(1)
+            for item in (2, 3):
+                with self.profiler.section('inner'):
+                    self.items.add(item)
+
+        summary = self.profiler.summary()
+        self.assertEqual(self.snapshots, 2)
+        self.assertEqual(summary['outer']['items_created'], 3)
+        self.assertEqual(summary['inner']['count'], 2)
+        self.assertEqual(summary['inner']['items_created'], 0)
+
+    def test_sections_after_a_nested_one_are_counted_again(self):
+        with self.profiler.section('outer'):
+            with self.profiler.section('inner'):
+                pass
+        with self.profiler.section('next'):
+            self.items.add(1)
+        self.assertEqual(self.profiler.summary()['next']['items_created'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager
+from query_server import QueryService, QueryServer, QueryClient
+from value_scoring import VALUE_SCORING_AVAILABLE
+
+
+class QueryServiceTest(unittest.TestCase):
+    """Malformed queries come back as per-query errors instead of failing the request"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.snapshot_dir = tempfile.TemporaryDirectory()
+        cls.service = QueryService(DataManager(snapshot_dir=cls.snapshot_dir.name))
+        cls.service.load_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.snapshot_dir.cleanup()
+
+    def execute(self, query):
+        return json.loads(self.service.execute(query))
+
+    def assert_error(self, query, fragment):
+        answer = self.execute(query)
+        self.assertIn('error', answer)
+        self.assertIn(fragment, answer['error'])
+
+    def test_filter_rejects_non_object_ranges(self):
+        self.assert_error({'op': 'filter', 'type': 'rods', 'ranges': [['max_drag', 1, 2]]}, "'ranges'")
+
+    def test_filter_rejects_non_object_facets(self):
+        self.assert_error({'op': 'filter', 'type': 'rods', 'facets': 'magfin'}, "'facets'")
+
+    def test_filter_rejects_unknown_range_column(self):
+        self.assert_error({'op': 'filter', 'type': 'rods', 'ranges': {'max_dragg': [1, None]}}, "'max_dragg'")
+
+    def test_filter_rejects_non_numeric_bounds(self):
+        self.assert_error({'op': 'filter', 'type': 'rods', 'ranges': {'level': ['1', None]}}, "'level'")
+
+    def test_filter_accepts_known_range_column(self):
+        answer = self.execute({'op': 'filter', 'type': 'rods', 'ranges': {'level': [None, 10]}})
+        self.assertGreater(answer['count'], 0)
+
+    def test_search_rejects_non_string_sort(self):
+        self.assert_error({'op': 'search', 'type': 'rods', 'query': 'magfin', 'sort': ['price']}, "'sort'")
+
+    def test_search_rejects_unknown_sort_column(self):
+        self.assert_error({'op': 'search', 'type': 'rods', 'query': 'magfin', 'sort': '-max_dragg'}, "'max_dragg'")
+
+    def test_search_accepts_known_sort_column(self):
+        answer = self.execute({'op': 'search', 'type': 'rods', 'query': 'magfin', 'sort': '-level'})
+        self.assertGreater(answer['count'], 0)
+
+    def test_negative_offset_is_rejected(self):
+        self.assert_error({'op': 'filter', 'type': 'rods', 'offset': -5}, "'offset'")
+
+    def test_negative_limit_is_rejected(self):
+        self.assert_error({'op': 'filter', 'type': 'rods', 'limit': -1}, "'limit'")
+
+    def test_unknown_type_is_rejected(self):
+        self.assert_error({'op': 'search', 'type': ['rods'], 'query': 'magfin'}, 'Unknown equipment type')
+
+    @unittest.skipUnless(VALUE_SCORING_AVAILABLE, "value scoring needs numpy")
+    def test_overflowing_expression_is_an_error(self):
+        expression = 'max_drag * 1' + '0' * 400
+        self.assert_error({'op': 'best_value', 'type': 'reels', 'expression': expression}, 'OverflowError')
+
+    def test_best_value_rejects_non_numeric_weight(self):
+        self.assert_error({'op': 'best_value', 'type': 'reels', 'weight': 'heavy'}, "'weight'")
+
+    def test_compatible_leader_has_no_gear(self):
+        self.assertEqual(self.execute({'op': 'compatible', 'type': 'leaders', 'index': 0}), {})
+
+    def test_compatible_line_lists_rods(self):
+        answer = self.execute({'op': 'compatible', 'type': 'lines', 'index': 0})
+        self.assertEqual(list(answer), ['rods'])
+
+    def test_compatible_gear_of_leader_item(self):
+        data_manager = self.service.data_manager
+        self.assertEqual(data_manager.get_compatible_gear(data_manager.leader_store.items[0]), {})
+
+
+class QueryServerTest(unittest.TestCase):
+    """A failing query does not take down the kept-alive connection"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.snapshot_dir = tempfile.TemporaryDirectory()
+        cls.server = QueryServer(QueryService(DataManager(snapshot_dir=cls.snapshot_dir.name)), port=0)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.snapshot_dir.cleanup()
+
+    def test_batch_with_bad_queries_keeps_connection(self):
+        client = QueryClient(port=self.server.server_address[1])
+        try:
+            results = client.batch([
+                {'op': 'filter', 'type': 'rods', 'ranges': 'level'},
+                {'op': 'search', 'type': 'rods', 'query': 'magfin', 'sort': 3},
+                {'op': 'compatible', 'type': 'leaders', 'index': 0},
+                {'op': 'search', 'type': 'rods', 'query': 'magfin', 'limit': 1}
+            ])
+            self.assertIn('error', results[0])
+            self.assertIn('error', results[1])
+            self.assertEqual(results[2], {})
+            self.assertEqual(len(results[3]['items']), 1)
+            self.assertGreater(client.query({'op': 'search', 'type': 'rods', 'query': 'magfin'})['count'], 0)
+        finally:
+            client.close()
+
+    def test_response_carries_data_version(self):
+        client = QueryClient(port=self.server.server_address[1])
+        try:
+            response = client._post({'op': 'search', 'type': 'rods', 'query': 'magfin', 'limit': 1})
+            self.assertEqual(response['version'], self.server.service.status()['version'])
+        finally:
+            client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+import ast
+import operator
+from config import NUMERIC_FIELD_COLUMNS, CURRENCIES, SPAN_SUFFIX, VALUE_SCORE_NAME_ERROR, VALUE_SCORE_SYNTAX_ERROR
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+VALUE_SCORING_AVAILABLE = np is not None
+PRICE_COLUMN_PREFIX = 'price_'
+WEIGHT_PARAMETER = 'weight'
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow
+}
+UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos
+}
+
+
+def _norm(values):
+    """Scale values by their median, so one outlier does not flatten every other score"""
+    present = values[~np.isnan(values)] if np.ndim(values) else values
+    if not np.size(present):
+        return values
+    return values / np.median(present)
+
+
+if VALUE_SCORING_AVAILABLE:
+    SCORE_FUNCTIONS = {
+        'norm': _norm,
+        'log': np.log1p,
+        'sqrt': np.sqrt,
+        'abs': np.abs,
+        'min': np.fmin,
+        'max': np.fmax
+    }
+else:
+    SCORE_FUNCTIONS = {}
+
+
+def score_column_names():
+    """Return every column name a score expression may use"""
+    names = set()
+    for kind, column_names in NUMERIC_FIELD_COLUMNS.values():
+        names.update(column_names)
+        if kind == 'range':
+            names.add(column_names[0][:-len('_min')] + SPAN_SUFFIX)
+    names.update(PRICE_COLUMN_PREFIX + currency.lower() for currency in CURRENCIES)
+    return names
+
+
+def compile_score(expression):
+    """Parse a score expression, rejecting anything but arithmetic over names, numbers and score functions"""
+    tree = ast.parse(expression, mode='eval')
+    known_names = score_column_names() | {WEIGHT_PARAMETER}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in SCORE_FUNCTIONS or node.keywords:
+                raise ValueError(VALUE_SCORE_SYNTAX_ERROR.format('function call'))
+        elif isinstance(node, ast.Name):
+            if node.id not in known_names and node.id not in SCORE_FUNCTIONS:
+                raise ValueError(VALUE_SCORE_NAME_ERROR.format(node.id))
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+                raise ValueError(VALUE_SCORE_SYNTAX_ERROR.format('constant'))
+        elif isinstance(node, ast.BinOp):
+            if type(node.op) not in BINARY_OPERATORS:
+                raise ValueError(VALUE_SCORE_SYNTAX_ERROR.format(type(node.op).__name__))
+        elif isinstance(node, ast.UnaryOp):
+            if type(node.op) not in UNARY_OPERATORS:
+                raise ValueError(VALUE_SCORE_SYNTAX_ERROR.format(type(node.op).__name__))
+        elif not isinstance(node, (ast.Expression, ast.Load, ast.operator, ast.unaryop)):
+            raise ValueError(VALUE_SCORE_SYNTAX_ERROR.format(type(node).__name__))
+    return tree.body
+
+
+class ValueScorer:
+    """
+    Vectorized value-for-money scores over one store.
+
+    The store's parsed columns are copied into NumPy arrays once per load,
+    together with one price column per currency (NaN for items sold in
+    another currency), so a score expression such as
+    `max_drag / price_cc ** weight` is evaluated over the whole catalog in a
+    single vectorized pass. Only the latest score vector is kept: moving the
+    weight slider re-evaluates the expression, everything else reuses it.
+    Items scoring NaN or infinity have no score and always rank last.
+    """
+
+    def __init__(self, store):
+        self.size = len(store)
+        self.arrays = {name: np.array(column, dtype=np.float64) for name, column in store.columns.items()}
+        price = self.arrays.get('price')
+        if price is not None:
+            codes = np.array(store.currency_codes, dtype=np.int16)
+            for code, currency in enumerate(store.currencies):
+                self.arrays[PRICE_COLUMN_PREFIX + currency.lower()] = np.where(codes == code, price, np.nan)
+        self.compiled = {}
+        self.latest = None
+
+    def column(self, name):
+        """Return a score column, deriving '<range>_span' columns; all NaN when the store lacks it"""
+        values = self.arrays.get(name)
+        if values is None:
+            if name.endswith(SPAN_SUFFIX):
+                base = name[:-len(SPAN_SUFFIX)]
+                values = self.column(f"{base}_max") - self.column(f"{base}_min")
+            else:
+                values = np.full(self.size, np.nan)
+            self.arrays[name] = values
+        return values
+
+    def scores(self, expression, weight):
+        """Return the score of every item for an expression and slider weight, NaN when unscored"""
+        key = (expression, weight)
+        latest = self.latest
+        if latest is not None and latest[0] == key:
+            return latest[1]
+
+        tree = self.compiled.get(expression)
+        if tree is None:
+            tree = self.compiled[expression] = compile_score(expression)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            values = np.broadcast_to(self._evaluate(tree, {WEIGHT_PARAMETER: weight}), (self.size,)).astype(np.float64)
+        values[~np.isfinite(values)] = np.nan
+        self.latest = (key, values)
+        return values
+
+    def _evaluate(self, node, parameters):
+        """Evaluate a compiled expression node over whole columns"""
+        if isinstance(node, ast.BinOp):
+            return BINARY_OPERATORS[type(node.op)](self._evaluate(node.left, parameters), self._evaluate(node.right, parameters))
+        if isinstance(node, ast.UnaryOp):
+            return UNARY_OPERATORS[type(node.op)](self._evaluate(node.operand, parameters))
+        if isinstance(node, ast.Call):
+            return SCORE_FUNCTIONS[node.func.id](*(self._evaluate(argument, parameters) for argument in node.args))
+        if isinstance(node, ast.Name):
+            if node.id in parameters:
+                return parameters[node.id]
+            return self.column(node.id)
+        return float(node.value)
+
+    def _selection(self, indices):
+        """Return item indices as an index array"""
+        if indices is None:
+            return np.arange(self.size)
+        if isinstance(indices, range):
+            return np.arange(indices.start, indices.stop, indices.step)
+        return np.asarray(indices, dtype=np.intp)
+
+    def order(self, indices, expression, weight):
+        """Return the given item indices best score first; ties and unscored items keep their order"""
+        selection = self._selection(indices)
+        values = self.scores(expression, weight)[selection]
+        # Negated NaN is still NaN, which argsort places last
+        return selection[np.argsort(-values, kind='stable')].tolist()
+
+    def top(self, count, expression, weight, indices=None):
+        """Return the indices of the `count` best scoring items, best first, without sorting the rest"""
+        selection = self._selection(indices)
+        values = self.scores(expression, weight)[selection]
+        scored = ~np.isnan(values)
+        selection, values = selection[scored], values[scored]
+        if count <= 0:
+            return []
+        if count < len(values):
+            best = np.argpartition(-values, count - 1)[:count]
+            selection, values = selection[best], values[best]
+        # Best score first, catalog order on ties
+        return selection[np.lexsort((selection, -values))].tolist()